@@ -0,0 +1,307 @@
+"""
+Load test of the cluster: an in-process cluster server, a fleet of simulated workers and synthetic clients
+
+Phases, each reported in the JSON output:
+- check_in_storm: the workers check in through ClusterBridge at once
+- rpcs: clients call each training RPC for a fixed duration, with throughput and p50/p99 latencies
+- memory: memory used per worker by the cluster, measured with tracemalloc on direct check ins
+
+Pass the output of a previous run with --baseline to add a comparison and flag regressions.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent import futures
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import grpc
+from google.protobuf import empty_pb2
+
+from mlops.bench.simulated_fleet import (
+    SimulatedFleet, SimulatedWorkerBridgeFactory, AsyncSimulatedWorkerBridgeFactory, SIMULATED_TASK_TYPE
+)
+from mlops.bench.stats import CallStats, compare
+from mlops.cluster.aio.server import create_server
+from mlops.cluster.aio.storages.worker_storage_adapter import AsyncWorkerStorageAdapter
+from mlops.cluster.aio.worker_cluster import AsyncWorkerCluster
+from mlops.cluster.storages.indexed_memory_worker_storage import IndexedMemoryWorkerStorage
+from mlops.cluster.training_servicer import WorkerClusterTrainingServicer
+from mlops.cluster.worker_cluster import WorkerCluster
+from mlops.cluster.worker_servicer import WorkerClusterWorkerServicer
+from mlops.common.model import TrainingTask, WorkerData
+from mlops.common.repos.cached_training_task_repository import CachedTrainingTaskRepository
+from mlops.common.repos.sqlalchemy_training_task_repository import (
+    SQLAlchemyTrainingTaskRepository, create_pooled_engine
+)
+from mlops.protos import worker_cluster_pb2_grpc, worker_cluster_pb2
+from mlops.worker.cluster_bridge import ClusterBridge
+
+
+def main(argv: list[str] | None = None):
+    args = Args(**vars(get_arg_parser().parse_args(argv)))
+    results = run(args)
+    if args.baseline is not None:
+        results['comparison'] = compare(results, json.loads(Path(args.baseline).read_text()))
+
+    output = json.dumps(results, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        Path(args.output).write_text(output)
+    if any(metric['regressed'] for metric in results.get('comparison', {}).values()):
+        sys.exit(1)
+
+
+def run(args: 'Args') -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp_dir, BenchCluster(args, Path(tmp_dir)) as bench:
+        results: dict[str, Any] = {
+            'started_at': datetime.now().isoformat(),
+            'params': args._asdict(),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'grpc': grpc.__version__,
+            },
+        }
+        results['check_in_storm'] = bench.check_in_storm()
+        results['rpcs'] = {
+            'AssignTrainingTask': bench.load(bench.assign_training_task),
+            'GetWorkersStatus': bench.load(bench.get_workers_status),
+        }
+        results['memory'] = bench.measure_memory()
+        return results
+
+
+class BenchCluster:
+    """
+    A cluster server on a local port with its simulated fleet and client stubs
+    """
+
+    def __init__(self, args: 'Args', tmp_dir: Path):
+        self.args = args
+        port = _get_free_port()
+        self.bind = f'127.0.0.1:{port}'
+        self.task_ids = self._create_tasks(tmp_dir)
+
+        self._worker_channel = grpc.insecure_channel(self.bind)
+        self.fleet = SimulatedFleet(
+            ClusterBridge(worker_cluster_pb2_grpc.WorkerClusterWorkerStub(self._worker_channel)),
+            slots=args.slots,
+            task_duration_sec=args.task_duration
+        )
+        self._client_channel = grpc.insecure_channel(self.bind)
+        self.stub = worker_cluster_pb2_grpc.WorkerClusterTrainingStub(self._client_channel)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        if args.server == 'aio':
+            self._start_aio_server()
+        else:
+            self._start_sync_server()
+
+    def check_in_storm(self) -> dict[str, Any]:
+        stats = CallStats()
+        ports = range(1, self.args.workers + 1)
+
+        def check_in(port: int) -> None:
+            started = time.perf_counter()
+            try:
+                self.fleet.check_in(port)
+            except grpc.RpcError as e:
+                stats.record(time.perf_counter() - started, e.code().name)
+            else:
+                stats.record(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with futures.ThreadPoolExecutor(max_workers=self.args.concurrency) as executor:
+            list(executor.map(check_in, ports))
+        elapsed = time.perf_counter() - started
+        summary = stats.summary(elapsed)
+        return {'workers': self.args.workers, 'rate_per_sec': summary.pop('throughput_per_sec'), **summary}
+
+    def load(self, call: Callable[[], None]) -> dict[str, Any]:
+        """
+        Make calls from many client threads for the configured duration
+
+        :param call: makes one call, raising grpc.RpcError if it fails
+        :return: summary of the calls
+        """
+        stats = CallStats()
+        deadline = time.monotonic() + self.args.duration
+
+        def client() -> None:
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    call()
+                except grpc.RpcError as e:
+                    stats.record(time.perf_counter() - started, e.code().name)
+                else:
+                    stats.record(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client) for _ in range(self.args.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats.summary(time.perf_counter() - started)
+
+    def assign_training_task(self) -> None:
+        self.stub.AssignTrainingTask(worker_cluster_pb2.TaskRequest(task_id=next(self.task_ids)))
+
+    def get_workers_status(self) -> None:
+        self.stub.GetWorkersStatus(empty_pb2.Empty())
+
+    def measure_memory(self) -> dict[str, Any]:
+        """
+        Check in workers directly into the cluster and measure the memory allocated meanwhile
+        """
+        count = self.args.memory_workers
+        data = [
+            WorkerData(host='memory', port=port, task_type=f'{SIMULATED_TASK_TYPE}-memory', version='0.0.0', options={})
+            for port in range(count)
+        ]
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            for worker_data in data:
+                self._call_cluster(self.cluster.check_in, worker_data)
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {'workers': count, 'bytes_per_worker': (after - before) / count if count else 0.}
+
+    def close(self) -> None:
+        self.fleet.close()  # No report in flight while the server stops
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._stop_aio_server(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+        else:
+            self.server.stop(grace=None).wait()
+            self.cluster.close()
+        self._client_channel.close()
+        self._worker_channel.close()
+
+    def _create_tasks(self, tmp_dir: Path) -> itertools.cycle:
+        repo = SQLAlchemyTrainingTaskRepository(create_pooled_engine(f'sqlite:///{tmp_dir / "bench.db"}'))
+        repo.create_tables()
+        now = datetime.now()
+        task_ids = [
+            repo.create(TrainingTask(
+                id=None,
+                name=f'bench-{i}',
+                input_dir=tmp_dir,
+                output_dir=tmp_dir,
+                task_type=SIMULATED_TASK_TYPE,
+                version='0.0.0',
+                config={},
+                created_at=now,
+                updated_at=None
+            )).id
+            for i in range(self.args.tasks)
+        ]
+        self.task_repo = CachedTrainingTaskRepository(repo)
+        return itertools.cycle(task_ids)
+
+    def _start_sync_server(self) -> None:
+        self.cluster = WorkerCluster(
+            storage=IndexedMemoryWorkerStorage(),
+            worker_bridge_factory=SimulatedWorkerBridgeFactory(self.fleet),
+            task_repo=self.task_repo,
+        )
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=self.args.server_threads))
+        worker_cluster_pb2_grpc.add_WorkerClusterTrainingServicer_to_server(
+            WorkerClusterTrainingServicer(self.cluster), self.server
+        )
+        worker_cluster_pb2_grpc.add_WorkerClusterWorkerServicer_to_server(
+            WorkerClusterWorkerServicer(self.cluster), self.server
+        )
+        self.server.add_insecure_port(self.bind)
+        self.server.start()
+
+    def _start_aio_server(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._loop_thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_aio_server_async(), self._loop).result()
+
+    async def _start_aio_server_async(self) -> None:
+        self.cluster = AsyncWorkerCluster(
+            storage=AsyncWorkerStorageAdapter(IndexedMemoryWorkerStorage()),
+            worker_bridge_factory=AsyncSimulatedWorkerBridgeFactory(self.fleet),
+            task_repo=self.task_repo,
+        )
+        self.server = create_server(self.cluster, self.bind)
+        await self.server.start()
+
+    async def _stop_aio_server(self) -> None:
+        await self.server.stop(grace=None)
+        await self.cluster.close()
+
+    def _call_cluster(self, method: Callable, *args: Any) -> Any:
+        if self._loop is None:
+            return method(*args)
+        return asyncio.run_coroutine_threadsafe(method(*args), self._loop).result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Args(NamedTuple):
+    server: str
+    workers: int
+    slots: int
+    concurrency: int
+    clients: int
+    duration: float
+    tasks: int
+    task_duration: float
+    server_threads: int
+    memory_workers: int
+    output: str | None
+    baseline: str | None
+
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Load test an in-process cluster with simulated workers')
+    parser.add_argument('--server', type=str, choices=['aio', 'sync'], default='aio',
+                        help='Serve an AsyncWorkerCluster or a WorkerCluster')
+    parser.add_argument('--workers', type=int, default=2000, help='Number of simulated workers')
+    parser.add_argument('--slots', type=int, default=1, help='Slots of each simulated worker')
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent check ins of the check in storm')
+    parser.add_argument('--clients', type=int, default=16, help='Number of client threads calling the RPCs')
+    parser.add_argument('--duration', type=float, default=5., help='Seconds each RPC is called for')
+    parser.add_argument('--tasks', type=int, default=100, help='Number of training tasks assigned in turn')
+    parser.add_argument('--task-duration', type=float, default=.05,
+                        help='Seconds before a simulated worker reports a task complete')
+    parser.add_argument('--server-threads', type=int, default=32, help='Threads of the sync server')
+    parser.add_argument('--memory-workers', type=int, default=1000,
+                        help='Number of workers checked in to measure the memory per worker')
+    parser.add_argument('--output', type=str, default=None, help='Write the JSON results to this file, not stdout')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='JSON results of a previous run to compare with, exits with 1 on a regression')
+
+    return parser
+
+
+if __name__ == '__main__':
+    main()
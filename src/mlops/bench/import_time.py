@@ -0,0 +1,107 @@
+"""
+Import time budget of an entry point, e.g. python -m mlops.bench.import_time --budget-ms 50
+
+Each run imports the module in a fresh interpreter with -X importtime. The best run is compared with the budget,
+and the modules that must stay lazy are checked not to be imported. Exits with 1 if a check fails.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# Modules the worker entry point must not import before a worker runs
+DEFAULT_LAZY_MODULES = ('grpc', 'google.protobuf', 'mlops.protos', 'mlops.worker.testing_worker')
+
+
+def main(argv: list[str] | None = None):
+    args = Args(**vars(get_arg_parser().parse_args(argv)))
+    result = check_import_time(args.module, args.budget_ms, args.lazy, args.runs)
+    output = json.dumps(result, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        Path(args.output).write_text(output)
+    if not result['ok']:
+        sys.exit(1)
+
+
+def check_import_time(module: str, budget_ms: float, lazy_modules: list[str], runs: int = 5) -> dict[str, Any]:
+    """
+    Measure the import time of a module and check it against a budget
+
+    :param module: the module to import
+    :param budget_ms: the maximum import time in milliseconds of the best run
+    :param lazy_modules: modules, with their submodules, that must not be imported
+    :param runs: number of fresh interpreters to import the module in
+    :return: import times, the lazy modules imported anyway and if the check passed
+    """
+    times_ms = []
+    imported = set()
+    for _ in range(runs):
+        total_ms, modules = measure_import(module)
+        times_ms.append(total_ms)
+        imported.update(modules)
+    eager = sorted(
+        name for name in imported
+        if any(name == lazy or name.startswith(f'{lazy}.') for lazy in lazy_modules)
+    )
+    best_ms = min(times_ms)
+    return {
+        'module': module,
+        'budget_ms': budget_ms,
+        'best_ms': best_ms,
+        'times_ms': times_ms,
+        'eager_lazy_modules': eager,
+        'ok': best_ms <= budget_ms and not eager,
+    }
+
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """
+    Import a module in a fresh interpreter
+
+    :param module: the module to import
+    :return: the cumulative import time in milliseconds, and the modules imported meanwhile
+    """
+    code = (
+        'import json, sys; loaded = set(sys.modules); '
+        f'import {module}; '
+        'print(json.dumps(sorted(set(sys.modules) - loaded)))'
+    )
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}, check=True
+    )
+    # Lines are "import time: <self us> | <cumulative us> | <indented name>"
+    total_us = 0
+    for line in process.stderr.splitlines():
+        if line.startswith('import time:') and line.rsplit('|', 1)[-1].strip() == module:
+            total_us = int(line.split('|')[1])
+    return total_us / 1e3, json.loads(process.stdout)
+
+
+class Args(NamedTuple):
+    module: str
+    budget_ms: float
+    lazy: list[str]
+    runs: int
+    output: str | None
+
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Check the import time of an entry point against a budget')
+    parser.add_argument('--module', type=str, default='mlops.worker.__main__', help='The module to import')
+    parser.add_argument('--budget-ms', type=float, default=50., help='Maximum import time of the best run')
+    parser.add_argument('--lazy', type=str, nargs='*', default=list(DEFAULT_LAZY_MODULES),
+                        help='Modules that must not be imported by the module')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters to import the module in')
+    parser.add_argument('--output', type=str, default=None, help='Write the JSON result to this file, not stdout')
+
+    return parser
+
+
+if __name__ == '__main__':
+    main()
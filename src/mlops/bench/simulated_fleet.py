@@ -0,0 +1,172 @@
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from mlops.cluster.aio.worker_bridge import AsyncWorkerBridgeBase, AsyncWorkerBridgeFactoryBase
+from mlops.cluster.model import WorkerConnectionInfo
+from mlops.cluster.worker_bridge import WorkerBridgeBase, WorkerBridgeFactoryBase
+from mlops.common.model import WorkerStatus, WorkerData, TrainingStatus
+from mlops.worker.cluster_bridge import ClusterBridge
+from mlops.worker.interfaces import WorkerStartOptions
+
+__ALL__ = ['SimulatedFleet', 'SimulatedWorkerBridgeFactory', 'AsyncSimulatedWorkerBridgeFactory']
+
+SIMULATED_TASK_TYPE = 'simulated'
+
+
+class SimulatedFleet:
+    """
+    Workers simulated in-process, talking to the cluster through a ClusterBridge like real workers do
+
+    The cluster reaches the workers through SimulatedWorkerBridgeFactory, each worker is known by its port.
+    A started task is reported complete after task_duration_sec, which frees its slot on the cluster.
+    The reports are sent by report_concurrency threads.
+    """
+
+    _worker_ids: dict[int, str]  # port -> worker id
+    _due: list[tuple[float, int, int]]  # heap of (deadline, port, task id) of the running tasks
+    _cond: threading.Condition
+    _closed: bool
+    _report_executor: ThreadPoolExecutor
+    _timer_thread: threading.Thread
+
+    def __init__(
+            self,
+            cluster: ClusterBridge,
+            slots: int = 1,
+            task_duration_sec: float = 0.,
+            report_concurrency: int = 8
+    ):
+        self.cluster = cluster
+        self.slots = slots
+        self.task_duration_sec = task_duration_sec
+        self._worker_ids = {}
+        self._due = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._report_executor = ThreadPoolExecutor(max_workers=report_concurrency, thread_name_prefix='fleet-report')
+        self._timer_thread = threading.Thread(target=self._run_timer, daemon=True)
+        self._timer_thread.start()
+
+    def check_in(self, port: int) -> str:
+        """
+        Check in the worker of a port
+
+        :param port: the port identifying the worker
+        :return: the worker id
+        """
+        worker_id = self.cluster.check_in(WorkerData(
+            host='simulated',
+            port=port,
+            task_type=SIMULATED_TASK_TYPE,
+            version='0.0.0',
+            options={'slots': self.slots}
+        ))
+        self._worker_ids[port] = worker_id
+        return worker_id
+
+    def get_status(self, port: int) -> WorkerStatus:
+        now = datetime.now()
+        return WorkerStatus(
+            id=self._worker_ids.get(port, ''),
+            task_type=SIMULATED_TASK_TYPE,
+            version='0.0.0',
+            healthy=True,
+            has_task=False,
+            joined_at=now,
+            created_at=now,
+            slots=self.slots
+        )
+
+    def start_task(self, port: int, task_id: int | None) -> None:
+        if task_id is None:
+            return
+        with self._cond:
+            heapq.heappush(self._due, (time.monotonic() + self.task_duration_sec, port, task_id))
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._timer_thread.join()
+        self._report_executor.shutdown()
+
+    def _run_timer(self) -> None:
+        with self._cond:
+            while not self._closed:
+                if not self._due:
+                    self._cond.wait()
+                    continue
+                timeout = self._due[0][0] - time.monotonic()
+                if timeout > 0:
+                    self._cond.wait(timeout)
+                    continue
+                _, port, task_id = heapq.heappop(self._due)
+                self._report_executor.submit(self._report_complete, port, task_id)
+
+    def _report_complete(self, port: int, task_id: int) -> None:
+        worker_id = self._worker_ids.get(port)
+        if worker_id is None:
+            return
+        self.cluster.report_training_status(worker_id, TrainingStatus(
+            name=str(task_id),
+            phase='succeeded',
+            progress=1.,
+            description='',
+            is_complete=True
+        ), task_id)
+
+
+class SimulatedWorkerBridge(WorkerBridgeBase):
+    def __init__(self, fleet: SimulatedFleet, port: int):
+        self.fleet = fleet
+        self.port = port
+
+    def get_status(self, timeout: float | None = None) -> WorkerStatus:
+        return self.fleet.get_status(self.port)
+
+    def start(self, options: WorkerStartOptions) -> None:
+        self.fleet.start_task(self.port, options.task_id)
+
+    def stop(self, task_id: int | None = None) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SimulatedWorkerBridgeFactory(WorkerBridgeFactoryBase):
+    def __init__(self, fleet: SimulatedFleet):
+        self.fleet = fleet
+
+    def get_worker_bridge(self, worker_connection_info: WorkerConnectionInfo) -> SimulatedWorkerBridge:
+        return SimulatedWorkerBridge(self.fleet, worker_connection_info.port)
+
+
+class AsyncSimulatedWorkerBridge(AsyncWorkerBridgeBase):
+    def __init__(self, fleet: SimulatedFleet, port: int):
+        self.fleet = fleet
+        self.port = port
+
+    async def get_status(self, timeout: float | None = None) -> WorkerStatus:
+        return self.fleet.get_status(self.port)
+
+    async def start(self, options: WorkerStartOptions) -> None:
+        self.fleet.start_task(self.port, options.task_id)
+
+    async def stop(self, task_id: int | None = None) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class AsyncSimulatedWorkerBridgeFactory(AsyncWorkerBridgeFactoryBase):
+    def __init__(self, fleet: SimulatedFleet):
+        self.fleet = fleet
+
+    async def get_worker_bridge(self, worker_connection_info: WorkerConnectionInfo) -> AsyncSimulatedWorkerBridge:
+        return AsyncSimulatedWorkerBridge(self.fleet, worker_connection_info.port)
@@ -0,0 +1,104 @@
+import math
+import threading
+from collections import Counter
+from typing import Any
+
+
+class CallStats:
+    """
+    Latencies and outcomes of the calls of an RPC, recorded by many client threads
+    """
+
+    _latencies: list[float]
+    _outcomes: Counter[str]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._latencies = []
+        self._outcomes = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, latency_sec: float, outcome: str = 'ok') -> None:
+        """
+        :param latency_sec: duration of the call
+        :param outcome: 'ok' or the name of the status code the call failed with
+        """
+        with self._lock:
+            self._latencies.append(latency_sec)
+            self._outcomes[outcome] += 1
+
+    def summary(self, elapsed_sec: float) -> dict[str, Any]:
+        """
+        :param elapsed_sec: wall time the calls were made in
+        :return: number of calls, outcomes, throughput in calls per second and latencies in milliseconds
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            outcomes = dict(self._outcomes)
+        return {
+            'calls': len(latencies),
+            'outcomes': outcomes,
+            'elapsed_sec': elapsed_sec,
+            'throughput_per_sec': len(latencies) / elapsed_sec if elapsed_sec > 0 else 0.,
+            'mean_ms': sum(latencies) / len(latencies) * 1e3 if latencies else 0.,
+            'p50_ms': percentile(latencies, .5) * 1e3,
+            'p99_ms': percentile(latencies, .99) * 1e3,
+            'max_ms': latencies[-1] * 1e3 if latencies else 0.,
+        }
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile
+
+    :param sorted_values: values in ascending order
+    :param q: the percentile between 0 and 1
+    :return: the percentile, 0 if there is no value
+    """
+    if not sorted_values:
+        return 0.
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))]
+
+
+# Metrics compared between runs, higher is better if True
+COMPARED_METRICS = {
+    'throughput_per_sec': True,
+    'p50_ms': False,
+    'p99_ms': False,
+    'rate_per_sec': True,
+    'bytes_per_worker': False,
+}
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float = .1) -> dict[str, Any]:
+    """
+    Compare the metrics of two runs
+
+    :param results: results of this run
+    :param baseline: results of a previous run
+    :param tolerance: relative change beyond which a worse metric is a regression
+    :return: dotted metric path -> baseline, current value, relative change and if it regressed
+    """
+    comparison = {}
+    for path, current, previous in _walk(results, baseline):
+        higher_is_better = COMPARED_METRICS.get(path.rsplit('.', 1)[-1])
+        if higher_is_better is None or not previous:
+            continue
+        change = (current - previous) / previous
+        comparison[path] = {
+            'baseline': previous,
+            'current': current,
+            'change': change,
+            'regressed': (-change if higher_is_better else change) > tolerance,
+        }
+    return comparison
+
+
+def _walk(results: dict[str, Any], baseline: dict[str, Any], prefix: str = ''):
+    for key, value in results.items():
+        previous = baseline.get(key)
+        path = f'{prefix}{key}'
+        if isinstance(value, dict) and isinstance(previous, dict):
+            yield from _walk(value, previous, f'{path}.')
+        elif isinstance(value, (int, float)) and isinstance(previous, (int, float)):
+            yield path, value, previous
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+from typing import NamedTuple
+
+from mlops.cluster.aio.server import create_server
+from mlops.cluster.aio.storages.worker_storage_adapter import AsyncWorkerStorageAdapter
+from mlops.cluster.aio.worker_bridge import AsyncWorkerBridgeFactory
+from mlops.cluster.aio.worker_cluster import AsyncWorkerCluster
+from mlops.cluster.schedulers.best_fit_scheduler import BestFitScheduler
+from mlops.cluster.schedulers.interfaces import WorkerSchedulerBase
+from mlops.cluster.schedulers.locality_scheduler import LocalityScheduler
+from mlops.cluster.storages.indexed_memory_worker_storage import IndexedMemoryWorkerStorage
+from mlops.cluster.storages.instrumented_worker_storage import InstrumentedWorkerStorage
+from mlops.cluster.storages.sqlalchemy_worker_storage import SQLAlchemyWorkerStorage
+from mlops.common.channel_options import ChannelOptions, COMPRESSIONS
+from mlops.common.datasets import ManifestCache
+from mlops.common.grpc_tracing import AsyncTracingServerInterceptor
+from mlops.common.metrics_server import start_metrics_server
+from mlops.common.repos.cached_training_task_repository import CachedTrainingTaskRepository
+from mlops.common.repos.sqlalchemy_training_task_repository import (
+    SQLAlchemyTrainingTaskRepository, create_pooled_engine
+)
+from mlops.common.tracing import SlowCallProfiler
+
+
+def main(argv: list[str] | None = None):
+    args = Args(**vars(get_arg_parser().parse_args(argv)))
+    asyncio.run(serve(args))
+
+
+async def serve(args: 'Args'):
+    engine = create_pooled_engine(args.database_url)
+    task_repo = SQLAlchemyTrainingTaskRepository(engine)
+    task_repo.create_tables()
+
+    if args.persist_workers:
+        storage = SQLAlchemyWorkerStorage(engine)
+        storage.create_tables()
+        storage.load()
+    else:
+        storage = IndexedMemoryWorkerStorage()
+
+    bridge_factory = AsyncWorkerBridgeFactory(
+        ChannelOptions(
+            keepalive_time_ms=args.keepalive_ms,
+            max_message_bytes=args.max_message_mb << 20,
+            compression=args.compression
+        ),
+        idle_timeout_sec=args.channel_idle_sec
+    )
+    cluster = AsyncWorkerCluster(
+        storage=AsyncWorkerStorageAdapter(InstrumentedWorkerStorage(storage)),
+        worker_bridge_factory=bridge_factory,
+        task_repo=CachedTrainingTaskRepository(task_repo),
+        scheduler=create_scheduler(args),
+        manifests=ManifestCache() if args.scheduler == 'locality' else None,
+    )
+    restored = await cluster.restore_workers()
+    metrics_server = start_metrics_server(args.metrics_host, args.metrics_port) if args.metrics_port else None
+    profiler = SlowCallProfiler(args.slow_call_ms / 1e3, args.profile_mode) if args.slow_call_ms else None
+    server = create_server(
+        cluster, args.bind, args.max_concurrent_rpcs, interceptors=[AsyncTracingServerInterceptor(profiler)]
+    )
+
+    await server.start()
+    print(f'Cluster started: {args.bind}, {restored} workers restored')
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(grace=5)
+        await cluster.close()
+        await bridge_factory.close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        if isinstance(storage, SQLAlchemyWorkerStorage):
+            storage.close()
+
+
+def create_scheduler(args: 'Args') -> WorkerSchedulerBase | None:
+    if args.scheduler == 'best-fit':
+        return BestFitScheduler()
+    if args.scheduler == 'locality':
+        return LocalityScheduler(BestFitScheduler(), args.locality_wait_sec)
+    return None
+
+
+class Args(NamedTuple):
+    bind: str
+    database_url: str
+    max_concurrent_rpcs: int | None
+    scheduler: str
+    locality_wait_sec: float
+    persist_workers: bool
+    metrics_host: str
+    metrics_port: int | None
+    slow_call_ms: float | None
+    profile_mode: str
+    keepalive_ms: int
+    max_message_mb: int
+    compression: str
+    channel_idle_sec: float
+
+
+def get_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Start an asyncio worker cluster')
+    parser.add_argument('--bind', type=str, default='0.0.0.0:50000', help='The address to bind to')
+    parser.add_argument('--database-url', type=str, default='sqlite:///mlops.db',
+                        help='The SQLAlchemy url of the training task database')
+    parser.add_argument('--max-concurrent-rpcs', type=int, default=None,
+                        help='Reject new RPCs beyond this number of in-flight RPCs')
+    parser.add_argument('--scheduler', type=str, choices=['first-idle', 'best-fit', 'locality'], default='first-idle',
+                        help='How tasks are placed: on the first idle worker, '
+                             'or on the worker whose free resources fit the task best, '
+                             'or best fit unless a worker caching the input directory of the task is idle')
+    parser.add_argument('--locality-wait-sec', type=float, default=3.,
+                        help='Seconds a task waits for a worker caching its input directory with the locality '
+                             'scheduler before being placed anywhere')
+    parser.add_argument('--persist-workers', action='store_true',
+                        help='Keep the worker registry in the database, so workers survive a restart of the cluster')
+    parser.add_argument('--metrics-host', type=str, default='0.0.0.0', help='The host to serve the metrics on')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve the metrics at /metrics on this port, not served if not set')
+    parser.add_argument('--slow-call-ms', type=float, default=None,
+                        help='Log the RPCs slower than this with their phases, served at /debug/slow_calls '
+                             'with the metrics, not logged if not set')
+    parser.add_argument('--profile-mode', type=str, choices=['stack', 'cprofile'], default='stack',
+                        help='How slow RPCs are captured: stack samples taken while they run, '
+                             'or a cProfile profile of every RPC, kept for the slow ones')
+    parser.add_argument('--keepalive-ms', type=int, default=ChannelOptions().keepalive_time_ms,
+                        help='Ping the connections to the workers after this idle time, 0 to not ping')
+    parser.add_argument('--max-message-mb', type=int, default=ChannelOptions().max_message_bytes >> 20,
+                        help='Maximum size of a message to or from a worker')
+    parser.add_argument('--compression', type=str, choices=list(COMPRESSIONS), default='none',
+                        help='Compression of the calls to the workers')
+    parser.add_argument('--channel-idle-sec', type=float, default=AsyncWorkerBridgeFactory.IDLE_TIMEOUT_SEC,
+                        help='Seconds a channel to a worker is kept open without calls')
+
+    return parser
+
+
+if __name__ == '__main__':
+    main()
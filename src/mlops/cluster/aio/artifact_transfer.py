@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import AsyncIterator, Generator
+from pathlib import Path
+
+from mlops.common.artifacts import (
+    ChunkWriter, list_files, read_chunks, get_resume_offsets, partition, DEFAULT_CHUNK_SIZE, COMPRESSIONS
+)
+from mlops.cluster.artifact_transfer import to_stage_dataset_request
+from mlops.common.datasets import DatasetManifest
+from mlops.protos import worker_pb2, worker_pb2_grpc
+
+__ALL__ = ['AsyncArtifactTransfer']
+
+
+class AsyncArtifactTransfer:
+    """
+    Asynchronous counterpart of ArtifactTransfer
+
+    Files are read and written in the default executor, one chunk at a time, so the event loop never waits on disk.
+    """
+
+    def __init__(
+            self,
+            stub: worker_pb2_grpc.WorkerStub,
+            concurrency: int = 4,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            compression: str = 'zlib',
+            timeout: float | None = None
+    ):
+        self.stub = stub
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.compression = COMPRESSIONS[compression]
+        self.timeout = timeout
+
+    async def get_files(self, artifact: str) -> dict[str, int]:
+        info = await self.stub.GetArtifactInfo(worker_pb2.ArtifactRequest(artifact=artifact), timeout=self.timeout)
+        return {file.path: file.size for file in info.files}
+
+    async def upload(self, local_dir: Path, artifact: str) -> int:
+        sizes = await asyncio.to_thread(list_files, local_dir)
+        offsets = get_resume_offsets(sizes, await self.get_files(artifact))
+
+        async def upload_group(group: dict[str, int]) -> None:
+            chunks = (
+                chunk
+                for path, offset in group.items()
+                for chunk in read_chunks(local_dir, path, artifact, offset, self.chunk_size, self.compression)
+            )
+            await self.stub.UploadArtifact(_iterate_in_thread(chunks), timeout=self.timeout)
+
+        await asyncio.gather(*map(upload_group, partition(offsets, sizes, self.concurrency)))
+        return sum(sizes[path] - offset for path, offset in offsets.items())
+
+    async def stage_dataset(self, local_dir: Path, artifact: str, manifest: DatasetManifest) -> int:
+        request = to_stage_dataset_request(artifact, manifest)
+        if not (await self.stub.StageDataset(request, timeout=self.timeout)).missing_paths:
+            return 0
+        uploaded = await self.upload(local_dir, artifact)
+        if missing_paths := (await self.stub.StageDataset(request, timeout=self.timeout)).missing_paths:
+            raise RuntimeError(f'files of {artifact!r} not matching the dataset {manifest.digest}: {missing_paths}')
+        return uploaded
+
+    async def download(self, artifact: str, local_dir: Path) -> int:
+        sizes = await self.get_files(artifact)
+        offsets = get_resume_offsets(sizes, await asyncio.to_thread(list_files, local_dir))
+
+        async def download_group(group: dict[str, int]) -> None:
+            request = worker_pb2.DownloadArtifactRequest(
+                artifact=artifact,
+                files=[worker_pb2.ArtifactFile(path=path, size=offset) for path, offset in group.items()],
+                compression=self.compression,
+                chunk_size=self.chunk_size
+            )
+            writer = ChunkWriter(local_dir)
+            try:
+                async for chunk in self.stub.DownloadArtifact(request, timeout=self.timeout):
+                    await asyncio.to_thread(writer.write, chunk)
+            finally:
+                writer.close()
+
+        await asyncio.gather(*map(download_group, partition(offsets, sizes, self.concurrency)))
+        return sum(sizes[path] - offset for path, offset in offsets.items())
+
+
+_END = object()
+
+
+async def _iterate_in_thread(generator: Generator) -> AsyncIterator:
+    try:
+        while (item := await asyncio.to_thread(next, generator, _END)) is not _END:
+            yield item
+    finally:
+        await asyncio.to_thread(generator.close)  # Closes the file being read
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from collections.abc import Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTaskDispatcher:
+    """
+    Asynchronous counterpart of TaskDispatcher, running as a task on the event loop started on first notification
+    """
+
+    _ready: dict[str, None]  # ordered set of task types to dispatch
+    _delayed: dict[str, asyncio.TimerHandle]  # task type -> pending delayed notification
+    _event: asyncio.Event
+    _task: asyncio.Task | None
+
+    def __init__(self, dispatch: Callable[[str], Awaitable[None]]):
+        """
+        :param dispatch: coroutine function dispatching the pending tasks of a task type
+        """
+        self._dispatch = dispatch
+        self._ready = {}
+        self._delayed = {}
+        self._event = asyncio.Event()
+        self._task = None
+
+    def notify(self, task_type: str) -> None:
+        """
+        Notify that pending tasks of a type may be dispatchable
+
+        :param task_type: type of the task
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self._ready[task_type] = None
+        self._event.set()
+
+    def notify_later(self, task_type: str, delay: float) -> None:
+        """
+        See TaskDispatcher.notify_later
+        """
+        loop = asyncio.get_running_loop()
+        handle = self._delayed.get(task_type)
+        if handle is not None and handle.when() <= loop.time() + delay:
+            return
+        if handle is not None:
+            handle.cancel()
+        self._delayed[task_type] = loop.call_later(delay, self._notify_delayed, task_type)
+
+    async def close(self) -> None:
+        """
+        Stop the dispatcher task
+        """
+        for handle in self._delayed.values():
+            handle.cancel()
+        self._delayed.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._event.wait()
+            self._event.clear()
+            while self._ready:
+                task_type = next(iter(self._ready))
+                del self._ready[task_type]
+                try:
+                    await self._dispatch(task_type)
+                except Exception:
+                    logger.exception('failed to dispatch tasks of type %s', task_type)
+
+    def _notify_delayed(self, task_type: str) -> None:
+        del self._delayed[task_type]
+        self.notify(task_type)
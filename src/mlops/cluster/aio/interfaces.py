@@ -0,0 +1,138 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from mlops.cluster.model import TaskAssignment
+from mlops.cluster.status_hub import AsyncWorkerStatusSubscription
+from mlops.common.model import WorkerStatus, TrainingStatus, WorkerData
+
+
+class AsyncWorkerClusterTrainingControllerBase(ABC):
+    """
+    Asynchronous worker cluster interface for managing training tasks
+
+    See WorkerClusterTrainingControllerBase for the semantics of each method
+    """
+
+    @abstractmethod
+    async def get_workers_status(self) -> list[WorkerStatus]:
+        """
+        Get the status of all workers in the cluster
+
+        :return: list of WorkerStatus objects
+        """
+
+    @abstractmethod
+    async def get_worker_status(self, worker_id: str) -> WorkerStatus | None:
+        """
+        Get the status of a specific worker
+
+        :param worker_id: the worker id
+        :return: WorkerStatus object or None if worker not found
+        """
+
+    @abstractmethod
+    async def watch_workers_status(self, worker_id: str | None = None) -> AsyncWorkerStatusSubscription:
+        """
+        Watch the status changes of all workers or a specific worker
+
+        Subscribe before taking a snapshot with get_workers_status or get_worker_status so no change is missed.
+
+        :param worker_id: the worker id, or None to watch all workers
+        :return: AsyncWorkerStatusSubscription object, close it to stop watching
+        """
+
+    @abstractmethod
+    async def assign_training_task(self, task_id: int) -> WorkerStatus | None:
+        """
+        Assign a training task to a worker
+
+        :param task_id: the training task id
+        :return: WorkerStatus object or None if no worker available
+        :raises RepoNotFoundError: when the task does not exist
+        """
+
+    @abstractmethod
+    async def assign_training_tasks(self, task_ids: Sequence[int]) -> list[TaskAssignment]:
+        """
+        Assign training tasks to workers
+
+        The tasks are fetched at once and the workers are started concurrently.
+
+        :param task_ids: the training task ids
+        :return: list of TaskAssignment objects, one per distinct task id in the given order
+        """
+
+    @abstractmethod
+    async def enqueue_training_task(self, task_id: int, priority: int = 0) -> int | None:
+        """
+        Queue a training task, it's assigned as soon as a worker of its type is idle
+
+        :param task_id: the training task id
+        :param priority: tasks with a higher priority are assigned first
+        :return: number of pending tasks of the same type or None if task not found
+        """
+
+    @abstractmethod
+    async def get_training_status(self, task_id: int) -> TrainingStatus | None:
+        """
+        Get the status of a training task
+
+        :param task_id: id of the training task
+        :return: TrainingStatus object or None if task not found
+        """
+
+    @abstractmethod
+    async def pause_training_task(self, task_id: int) -> None:
+        """
+        Pause a training task
+
+        No operation if the task is already paused or completed or not found
+
+        :param task_id: id of the training task
+        """
+
+
+class AsyncWorkerClusterWorkerControllerBase(ABC):
+    """
+    Asynchronous worker cluster interface for managing workers
+
+    See WorkerClusterWorkerControllerBase for the semantics of each method
+    """
+
+    @abstractmethod
+    async def check_in(self, worker_data: WorkerData) -> str:
+        """
+        Check in a worker
+
+        :param worker_data: WorkerData object
+        :return: worker id assigned to the worker (a UUID)
+        """
+
+    @abstractmethod
+    async def report_status(self, worker_status: WorkerStatus) -> None:
+        """
+        Report worker status
+
+        :param worker_status: WorkerStatus object
+        """
+
+    @abstractmethod
+    async def report_training_status(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> None:
+        """
+        Report training status
+
+        :param worker_id: the worker id
+        :param training_status: TrainingStatus object or None if no training task assigned
+        :param task_id: the task the status is about, may be None if the worker has a single slot
+        """
+
+
+class AsyncWorkerClusterBase(AsyncWorkerClusterTrainingControllerBase, AsyncWorkerClusterWorkerControllerBase, ABC):
+    """
+    Asynchronous worker cluster interface for managing workers and training tasks
+    """
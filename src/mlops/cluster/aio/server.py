@@ -0,0 +1,36 @@
+from collections.abc import Sequence
+
+import grpc
+
+from mlops.cluster.aio.interfaces import AsyncWorkerClusterBase
+from mlops.cluster.aio.training_servicer import AsyncWorkerClusterTrainingServicer
+from mlops.cluster.aio.worker_servicer import AsyncWorkerClusterWorkerServicer
+from mlops.protos import worker_cluster_pb2_grpc
+
+
+def create_server(
+        cluster: AsyncWorkerClusterBase,
+        bind: str,
+        maximum_concurrent_rpcs: int | None = None,
+        interceptors: Sequence[grpc.aio.ServerInterceptor] = ()
+) -> grpc.aio.Server:
+    """
+    Create an asyncio gRPC server serving the cluster
+
+    All RPCs run as coroutines on the event loop, so the number of in-flight calls is not bound by threads.
+
+    :param cluster: the cluster to serve
+    :param bind: address to bind to, e.g. 0.0.0.0:50000
+    :param maximum_concurrent_rpcs: reject new RPCs beyond this limit, unlimited if None
+    :param interceptors: server interceptors, e.g. AsyncTracingServerInterceptor
+    :return: the server, not started yet
+    """
+    server = grpc.aio.server(interceptors=interceptors, maximum_concurrent_rpcs=maximum_concurrent_rpcs)
+    worker_cluster_pb2_grpc.add_WorkerClusterTrainingServicer_to_server(
+        AsyncWorkerClusterTrainingServicer(cluster), server
+    )
+    worker_cluster_pb2_grpc.add_WorkerClusterWorkerServicer_to_server(
+        AsyncWorkerClusterWorkerServicer(cluster), server
+    )
+    server.add_insecure_port(bind)
+    return server
@@ -0,0 +1,87 @@
+from abc import ABC, abstractmethod
+
+from mlops.cluster.model import WorkerRecord
+
+
+class AsyncWorkerStorageBase(ABC):
+    """
+    Interface for asynchronous worker storage classes
+
+    See WorkerStorageBase for the semantics of each method
+    """
+
+    @abstractmethod
+    async def get(self, worker_id: str) -> WorkerRecord | None:
+        """
+        Get worker record by worker id
+
+        :param worker_id: id of worker
+        :return: WorkerStatus object if worker exists, None otherwise
+        """
+
+    @abstractmethod
+    async def get_all(self) -> list[WorkerRecord]:
+        """
+        Get all worker records
+
+        :return: list of WorkerStatus objects
+        """
+
+    @abstractmethod
+    async def save(self, worker_record: WorkerRecord):
+        """
+        save worker status
+
+        :param worker_record: WorkerRecord object
+        """
+
+    @abstractmethod
+    async def delete(self, worker_id: str) -> bool:
+        """
+        Delete worker record by worker id
+
+        :param worker_id: id of worker
+        :return: True if worker was deleted, False otherwise
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        Clear all worker status
+        """
+
+    @abstractmethod
+    async def get_first_idle_by_type(self, worker_type: str) -> WorkerRecord | None:
+        """
+        Get first idle worker by worker type
+
+        A worker is idle if it's healthy and has a free slot, see WorkerStatus.free_slots
+
+        :param worker_type: type of worker
+        :return: WorkerStatus object if idle worker exists, None otherwise
+        """
+
+    @abstractmethod
+    async def get_idle_by_type(self, worker_type: str, limit: int) -> list[WorkerRecord]:
+        """
+        Get idle workers by worker type
+
+        :param worker_type: type of worker
+        :param limit: maximum number of workers to return
+        :return: list of idle WorkerRecord objects, in the order get_first_idle_by_type would return them
+        """
+
+    @abstractmethod
+    async def count_by_type(self, worker_type: str) -> int:
+        """
+        Count the workers of a type, healthy or not
+
+        :param worker_type: type of worker
+        :return: number of workers
+        """
+
+    @abstractmethod
+    async def cleanup(self) -> None:
+        """
+        Cleanup worker storage. Remove all workers that are not alive (unhealthy)
+        """
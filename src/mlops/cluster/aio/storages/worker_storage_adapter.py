@@ -0,0 +1,50 @@
+import asyncio
+
+from mlops.cluster.aio.storages.interfaces import AsyncWorkerStorageBase
+from mlops.cluster.model import WorkerRecord
+from mlops.cluster.storages.interfaces import WorkerStorageBase
+
+
+class AsyncWorkerStorageAdapter(AsyncWorkerStorageBase):
+    """
+    Expose a synchronous worker storage as an asynchronous one
+
+    In-memory storages never block, so their methods are called directly on the event loop.
+    Storages doing I/O should be wrapped with blocking=True to run their methods in the default executor.
+    """
+
+    def __init__(self, storage: WorkerStorageBase, blocking: bool = False):
+        self.storage = storage
+        self.blocking = blocking
+
+    async def _call(self, func, *args):
+        if self.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def get(self, worker_id: str) -> WorkerRecord | None:
+        return await self._call(self.storage.get, worker_id)
+
+    async def get_all(self) -> list[WorkerRecord]:
+        return await self._call(self.storage.get_all)
+
+    async def save(self, worker_record: WorkerRecord):
+        return await self._call(self.storage.save, worker_record)
+
+    async def delete(self, worker_id: str) -> bool:
+        return await self._call(self.storage.delete, worker_id)
+
+    async def clear(self) -> None:
+        return await self._call(self.storage.clear)
+
+    async def get_first_idle_by_type(self, worker_type: str) -> WorkerRecord | None:
+        return await self._call(self.storage.get_first_idle_by_type, worker_type)
+
+    async def get_idle_by_type(self, worker_type: str, limit: int) -> list[WorkerRecord]:
+        return await self._call(self.storage.get_idle_by_type, worker_type, limit)
+
+    async def count_by_type(self, worker_type: str) -> int:
+        return await self._call(self.storage.count_by_type, worker_type)
+
+    async def cleanup(self) -> None:
+        return await self._call(self.storage.cleanup)
@@ -0,0 +1,135 @@
+from collections.abc import AsyncIterator
+
+import grpc
+from google.protobuf import empty_pb2
+
+from mlops.cluster.aio.interfaces import AsyncWorkerClusterTrainingControllerBase
+from mlops.cluster.codec import to_raw_worker_status_event, to_raw_snapshot_events, to_raw_task_assignment
+from mlops.cluster.status_hub import WorkerStatusEventType
+from mlops.common.codec import to_raw_worker_status, to_raw_worker_statuses, to_raw_training_status
+from mlops.common.exc import RepoNotFoundError
+from mlops.common.grpc_metrics import instrument_servicer
+from mlops.protos import worker_cluster_pb2_grpc, worker_cluster_pb2, messages_pb2
+
+
+@instrument_servicer('WorkerClusterTraining')
+class AsyncWorkerClusterTrainingServicer(worker_cluster_pb2_grpc.WorkerClusterTrainingServicer):
+    def __init__(self, cluster: AsyncWorkerClusterTrainingControllerBase):
+        self.cluster = cluster
+
+    async def GetWorkersStatus(
+            self,
+            request,
+            context: grpc.aio.ServicerContext
+    ) -> worker_cluster_pb2.GetWorkersStatusResponse:
+        return worker_cluster_pb2.GetWorkersStatusResponse(
+            statuses=to_raw_worker_statuses(await self.cluster.get_workers_status())
+        )
+
+    async def GetWorkerStatus(
+            self,
+            request: worker_cluster_pb2.GetWorkerStatusRequest,
+            context: grpc.aio.ServicerContext
+    ) -> messages_pb2.WorkerStatus:
+        status = await self.cluster.get_worker_status(request.worker_id)
+        if status is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f'worker {request.worker_id} not found')
+        return to_raw_worker_status(status)
+
+    async def WatchWorkersStatus(
+            self,
+            request,
+            context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[worker_cluster_pb2.WorkerStatusEvent]:
+        async for event in self._watch(None, context):
+            yield event
+
+    async def WatchWorkerStatus(
+            self,
+            request: worker_cluster_pb2.GetWorkerStatusRequest,
+            context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[worker_cluster_pb2.WorkerStatusEvent]:
+        async for event in self._watch(request.worker_id, context):
+            yield event
+
+    async def AssignTrainingTask(
+            self,
+            request: worker_cluster_pb2.TaskRequest,
+            context: grpc.aio.ServicerContext
+    ) -> messages_pb2.WorkerStatus:
+        try:
+            status = await self.cluster.assign_training_task(request.task_id)
+        except RepoNotFoundError:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f'task {request.task_id} not found')
+        if status is None:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, f'no worker available for task {request.task_id}')
+        return to_raw_worker_status(status)
+
+    async def AssignTrainingTasks(
+            self,
+            request: worker_cluster_pb2.AssignTrainingTasksRequest,
+            context: grpc.aio.ServicerContext
+    ) -> worker_cluster_pb2.AssignTrainingTasksResponse:
+        assignments = await self.cluster.assign_training_tasks(request.task_ids)
+        return worker_cluster_pb2.AssignTrainingTasksResponse(
+            assignments=[to_raw_task_assignment(assignment) for assignment in assignments]
+        )
+
+    async def EnqueueTrainingTask(
+            self,
+            request: worker_cluster_pb2.EnqueueTrainingTaskRequest,
+            context: grpc.aio.ServicerContext
+    ) -> worker_cluster_pb2.EnqueueTrainingTaskResponse:
+        pending_tasks = await self.cluster.enqueue_training_task(request.task_id, request.priority)
+        if pending_tasks is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f'task {request.task_id} not found')
+        return worker_cluster_pb2.EnqueueTrainingTaskResponse(pending_tasks=pending_tasks)
+
+    async def GetTrainingStatus(
+            self,
+            request: worker_cluster_pb2.TaskRequest,
+            context: grpc.aio.ServicerContext
+    ) -> messages_pb2.TrainingStatus:
+        status = await self.cluster.get_training_status(request.task_id)
+        if status is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f'training status of task {request.task_id} not found')
+        return to_raw_training_status(status)
+
+    async def PauseTrainingTask(
+            self,
+            request: worker_cluster_pb2.TaskRequest,
+            context: grpc.aio.ServicerContext
+    ) -> empty_pb2.Empty:
+        await self.cluster.pause_training_task(request.task_id)
+        return empty_pb2.Empty()
+
+    async def _watch(
+            self,
+            worker_id: str | None,
+            context: grpc.aio.ServicerContext
+    ) -> AsyncIterator[worker_cluster_pb2.WorkerStatusEvent]:
+        # Subscribe before taking the snapshot so no change is missed
+        with await self.cluster.watch_workers_status(worker_id) as subscription:
+            for raw_event in await self._snapshot(worker_id, context):
+                yield raw_event
+            while (events := await subscription.get_async()) is not None:
+                for event in events:
+                    if event.type is WorkerStatusEventType.LAGGED:
+                        for raw_event in await self._snapshot(worker_id, context):
+                            yield raw_event
+                    else:
+                        yield to_raw_worker_status_event(event)
+
+    async def _snapshot(
+            self,
+            worker_id: str | None,
+            context: grpc.aio.ServicerContext
+    ) -> list[worker_cluster_pb2.WorkerStatusEvent]:
+        if worker_id is None:
+            statuses = await self.cluster.get_workers_status()
+        else:
+            status = await self.cluster.get_worker_status(worker_id)
+            if status is None:
+                await context.abort(grpc.StatusCode.NOT_FOUND, f'worker {worker_id} not found')
+            statuses = [status]
+        return to_raw_snapshot_events(statuses)
@@ -0,0 +1,269 @@
+import asyncio
+import heapq
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+import grpc
+from google.protobuf import empty_pb2
+
+from mlops.cluster.aio.artifact_transfer import AsyncArtifactTransfer
+from mlops.cluster.metrics import BRIDGE_CACHE, WORKER_CHANNELS
+from mlops.cluster.model import WorkerConnectionInfo
+from mlops.cluster.worker_bridge import ChannelPoolStats
+from mlops.common.channel_options import ChannelOptions
+from mlops.common.codec import from_raw_worker_status
+from mlops.common.datasets import DatasetManifest
+from mlops.common.grpc_tracing import AsyncTracingClientInterceptor
+from mlops.common.model import WorkerStatus
+from mlops.protos import worker_pb2_grpc, messages_pb2, worker_pb2
+from mlops.worker.interfaces import WorkerStartOptions
+
+__ALL__ = ['AsyncWorkerBridgeBase', 'AsyncWorkerBridgeFactoryBase', 'AsyncWorkerBridge', 'AsyncWorkerBridgeFactory']
+
+
+class AsyncWorkerBridgeBase(ABC):
+    """
+    Asynchronous bridge to a worker
+
+    See WorkerControllerBase for the semantics of each method
+    """
+
+    @abstractmethod
+    async def get_status(self, timeout: float | None = None) -> WorkerStatus:
+        """
+        Get the current status of the worker
+
+        :param timeout: seconds to wait for the worker, wait forever if None
+        :return: a WorkerStatus object
+        """
+
+    @abstractmethod
+    async def start(self, options: WorkerStartOptions) -> None:
+        """
+        Start the worker
+
+        :param options: WorkerStartOptions object
+        """
+
+    @abstractmethod
+    async def stop(self, task_id: int | None = None) -> None:
+        """
+        Stop the worker
+
+        :param task_id: stop only this task, or all the tasks of the worker if None
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Close the bridge
+        """
+
+
+class AsyncWorkerBridgeFactoryBase(ABC):
+    """
+    Factory for creating or getting asynchronous worker bridges
+    """
+
+    @abstractmethod
+    async def get_worker_bridge(self, worker_connection_info: WorkerConnectionInfo) -> AsyncWorkerBridgeBase:
+        """
+        Get a worker bridge via the connection info
+
+        :param worker_connection_info:
+        :return:
+        """
+
+    async def warm_up(self, worker_connection_info: WorkerConnectionInfo) -> None:
+        """
+        See WorkerBridgeFactoryBase.warm_up
+        """
+
+
+class AsyncWorkerBridge(AsyncWorkerBridgeBase):
+    def __init__(self, channel: grpc.aio.Channel):
+        self.channel = channel
+        self.worker_stub = worker_pb2_grpc.WorkerStub(channel)
+
+    async def get_status(self, timeout: float | None = None) -> WorkerStatus:
+        raw_status: messages_pb2.WorkerStatus = await self.worker_stub.GetStatus(empty_pb2.Empty(), timeout=timeout)
+        return from_raw_worker_status(raw_status)
+
+    async def start(self, options: WorkerStartOptions) -> None:
+        await self.worker_stub.StartWorker(
+            worker_pb2.StartWorkerRequest(
+                task_path=options.task_path,
+                task_id=options.task_id
+            )
+        )
+
+    async def stop(self, task_id: int | None = None) -> None:
+        await self.worker_stub.StopWorker(worker_pb2.StopWorkerRequest(task_id=task_id))
+
+    async def upload_artifact(self, local_dir: Path, artifact: str, **options) -> int:
+        """
+        See WorkerBridge.upload_artifact
+
+        :param options: options of AsyncArtifactTransfer
+        """
+        return await AsyncArtifactTransfer(self.worker_stub, **options).upload(local_dir, artifact)
+
+    async def stage_dataset(self, local_dir: Path, artifact: str, manifest: DatasetManifest, **options) -> int:
+        """
+        See WorkerBridge.stage_dataset
+
+        :param options: options of AsyncArtifactTransfer
+        """
+        return await AsyncArtifactTransfer(self.worker_stub, **options).stage_dataset(local_dir, artifact, manifest)
+
+    async def download_artifact(self, artifact: str, local_dir: Path, **options) -> int:
+        """
+        See WorkerBridge.download_artifact
+
+        :param options: options of AsyncArtifactTransfer
+        """
+        return await AsyncArtifactTransfer(self.worker_stub, **options).download(artifact, local_dir)
+
+    def connect(self) -> None:
+        """
+        Start connecting the channel if it's idle
+        """
+        self.channel.get_state(try_to_connect=True)
+
+    async def close(self) -> None:
+        await self.channel.close()
+
+
+@dataclass(slots=True)
+class AsyncCachedWorkerBridgeRecord:
+    bridge: AsyncWorkerBridge
+    last_access: float  # time.monotonic() of the last access
+
+    def touch(self) -> None:
+        self.last_access = time.monotonic()
+
+
+class AsyncWorkerBridgeFactory(AsyncWorkerBridgeFactoryBase):
+    """
+    Asynchronous counterpart of WorkerBridgeFactory
+
+    It must be used from a single event loop, which makes the cache lock-free.
+    Idle bridges are expired from a deadline heap by a background task started on first use.
+    """
+
+    _cached_bridges: dict[WorkerConnectionInfo, AsyncCachedWorkerBridgeRecord]
+    _expiry_heap: list[tuple[float, WorkerConnectionInfo]]  # (deadline, key), one entry per cached bridge
+    _clean_task: asyncio.Task | None
+    _hits: int
+    _misses: int
+    _evictions: int
+    _warm_ups: int
+
+    IDLE_TIMEOUT_SEC = 600
+
+    def __init__(self, channel_options: ChannelOptions = ChannelOptions(), idle_timeout_sec: float = IDLE_TIMEOUT_SEC):
+        """
+        See WorkerBridgeFactory
+        """
+        self.channel_options = channel_options
+        self.idle_timeout_sec = idle_timeout_sec
+        self._cached_bridges = {}
+        self._expiry_heap = []
+        self._clean_task = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._warm_ups = 0
+
+    async def _clean(self):
+        timeout = self.idle_timeout_sec
+        while True:
+            await asyncio.sleep(timeout)
+            timeout = await self._expire()
+
+    async def _expire(self) -> float:
+        """
+        Remove the expired bridges
+
+        :return: seconds until the next deadline
+        """
+        now = time.monotonic()
+        expired = []
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, key = heapq.heappop(self._expiry_heap)
+            record = self._cached_bridges.get(key)
+            if record is None:
+                continue
+            deadline = record.last_access + self.idle_timeout_sec
+            if deadline > now:  # Touched since the entry was pushed
+                heapq.heappush(self._expiry_heap, (deadline, key))
+                continue
+            del self._cached_bridges[key]
+            expired.append(record)
+        next_deadline = self._expiry_heap[0][0] if self._expiry_heap else now + self.idle_timeout_sec
+        self._evictions += len(expired)
+        BRIDGE_CACHE.labels('evict').inc(len(expired))
+        WORKER_CHANNELS.dec(len(expired))
+
+        await asyncio.gather(*(record.bridge.close() for record in expired))
+        return max(next_deadline - now, 0)
+
+    async def get_worker_bridge(self, worker_connection_info: WorkerConnectionInfo) -> AsyncWorkerBridge:
+        record = self._cached_bridges.get(worker_connection_info)
+        if record is not None:
+            record.touch()
+            self._hits += 1
+            BRIDGE_CACHE.labels('hit').inc()
+            return record.bridge
+        self._misses += 1
+        BRIDGE_CACHE.labels('miss').inc()
+        return self._add_bridge(worker_connection_info)
+
+    async def warm_up(self, worker_connection_info: WorkerConnectionInfo) -> None:
+        if worker_connection_info in self._cached_bridges:
+            return
+        self._add_bridge(worker_connection_info).connect()
+        self._warm_ups += 1
+        BRIDGE_CACHE.labels('warm').inc()
+
+    def get_stats(self) -> ChannelPoolStats:
+        return ChannelPoolStats(
+            channels=len(self._cached_bridges),
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            warm_ups=self._warm_ups
+        )
+
+    async def close(self) -> None:
+        """
+        Stop the clean task and close all cached bridges
+        """
+        if self._clean_task is not None:
+            self._clean_task.cancel()
+            self._clean_task = None
+        records = list(self._cached_bridges.values())
+        self._cached_bridges.clear()
+        self._expiry_heap.clear()
+        WORKER_CHANNELS.dec(len(records))
+        await asyncio.gather(*(record.bridge.close() for record in records))
+
+    def _add_bridge(self, worker_connection_info: WorkerConnectionInfo) -> AsyncWorkerBridge:
+        if self._clean_task is None:
+            self._clean_task = asyncio.create_task(self._clean())
+        record = self._create_bridge(worker_connection_info)
+        self._cached_bridges[worker_connection_info] = record
+        heapq.heappush(self._expiry_heap, (record.last_access + self.idle_timeout_sec, worker_connection_info))
+        WORKER_CHANNELS.inc()
+        return record.bridge
+
+    def _create_bridge(self, worker_connection_info: WorkerConnectionInfo) -> AsyncCachedWorkerBridgeRecord:
+        channel = grpc.aio.insecure_channel(
+            f'{worker_connection_info.host}:{worker_connection_info.port}',
+            options=self.channel_options.get_channel_args(),
+            compression=self.channel_options.get_compression(),
+            interceptors=[AsyncTracingClientInterceptor('worker_call')]
+        )
+        return AsyncCachedWorkerBridgeRecord(bridge=AsyncWorkerBridge(channel), last_access=time.monotonic())
@@ -0,0 +1,388 @@
+import asyncio
+import time
+import uuid
+from collections.abc import Sequence
+
+from mlops.cluster.aio.dispatcher import AsyncTaskDispatcher
+from mlops.cluster.aio.interfaces import AsyncWorkerClusterBase
+from mlops.cluster.aio.storages.interfaces import AsyncWorkerStorageBase
+from mlops.cluster.aio.worker_bridge import AsyncWorkerBridgeFactoryBase
+from mlops.cluster.core import WorkerClusterCore, Reservation
+from mlops.cluster.metrics import WORKER_REPORTS
+from mlops.cluster.model import WorkerRecord, SlotTask, TaskAssignment, WorkerProbe
+from mlops.cluster.schedulers.interfaces import WorkerSchedulerBase
+from mlops.cluster.status_hub import WorkerStatusHub, AsyncWorkerStatusSubscription
+from mlops.common.datasets import ManifestCache, with_dataset
+from mlops.common.exc import RepoNotFoundError
+from mlops.common.model import TrainingStatus, WorkerStatus, WorkerData, TrainingTask
+from mlops.common.repos.interfaces import TrainingTaskRepositoryBase
+from mlops.worker.interfaces import WorkerStartOptions
+
+_STATUS_REPORTS = WORKER_REPORTS.labels('status')
+_TRAINING_STATUS_REPORTS = WORKER_REPORTS.labels('training_status')
+
+
+class AsyncWorkerCluster(WorkerClusterCore, AsyncWorkerClusterBase):
+    """
+    Asynchronous worker cluster, deciding like WorkerCluster, see WorkerClusterCore
+
+    The task repository is synchronous and runs in the default executor,
+    storage and worker bridges are awaited directly on the event loop.
+
+    Workers hold a lease like in WorkerCluster, expired workers are removed by a reap task started on first check in.
+    Queued tasks are dispatched like in WorkerCluster, by a task on the event loop.
+    Tasks are placed by the scheduler if one is given, like in WorkerCluster.
+    The input directories are hashed in the default executor if manifests are given, like in WorkerCluster.
+    """
+
+    _reserve_lock: asyncio.Lock  # serializes the changes to the slots of the workers
+    _reap_task: asyncio.Task | None
+
+    def __init__(
+            self,
+            storage: AsyncWorkerStorageBase,
+            worker_bridge_factory: AsyncWorkerBridgeFactoryBase,
+            task_repo: TrainingTaskRepositoryBase,
+            status_hub: WorkerStatusHub | None = None,
+            lease_ttl_sec: float = 30.,
+            reap_interval_sec: float = 5.,
+            scheduler: WorkerSchedulerBase | None = None,
+            manifests: ManifestCache | None = None
+    ):
+        super().__init__(status_hub, lease_ttl_sec, scheduler, manifests)
+        self.storage = storage
+        self.task_repo = task_repo
+        self.worker_bridge_factory = worker_bridge_factory
+        self.reap_interval_sec = reap_interval_sec
+        self.dispatcher = AsyncTaskDispatcher(self._dispatch)
+        self._reserve_lock = asyncio.Lock()
+        self._reap_task = None
+
+    async def get_workers_status(self) -> list[WorkerStatus]:
+        return [w.status for w in await self.storage.get_all()]
+
+    async def get_worker_status(self, worker_id: str) -> WorkerStatus | None:
+        record = await self.storage.get(worker_id)
+        if record is None:
+            return None
+        return record.status
+
+    async def watch_workers_status(self, worker_id: str | None = None) -> AsyncWorkerStatusSubscription:
+        return self.status_hub.subscribe_async(worker_id)
+
+    async def assign_training_task(self, task_id: int) -> WorkerStatus | None:
+        task = await asyncio.to_thread(self.task_repo.get_by_id, task_id)
+        return await self._assign_task(await self._with_dataset(task))
+
+    async def assign_training_tasks(self, task_ids: Sequence[int]) -> list[TaskAssignment]:
+        task_ids = list(dict.fromkeys(task_ids))
+        tasks = await asyncio.to_thread(self.task_repo.get_by_ids, task_ids)
+        tasks_by_type = self._group_by_type(await asyncio.gather(*map(self._with_dataset, tasks.values())))
+
+        async with self._reserve_lock:
+            reservations = [
+                reservation
+                for type_tasks in tasks_by_type.values()
+                for reservation in await self._reserve_workers(type_tasks)
+            ]
+        results = await asyncio.gather(
+            *(self._start_task(task, reserved, replaced) for task, reserved, replaced in reservations),
+            return_exceptions=True
+        )
+        starts = {task.id: result for (task, _, _), result in zip(reservations, results)}
+        return self._to_assignments(task_ids, tasks, starts)
+
+    async def enqueue_training_task(self, task_id: int, priority: int = 0) -> int | None:
+        try:
+            task = await asyncio.to_thread(self.task_repo.get_by_id, task_id)
+        except RepoNotFoundError:
+            return None
+        depth = self.pending_tasks.push(task_id, task.task_type, priority)
+        self.dispatcher.notify(task.task_type)
+        return depth
+
+    async def get_training_status(self, task_id: int) -> TrainingStatus | None:
+        pending_status = self._get_pending_status(task_id)
+        if pending_status is not None:
+            return pending_status
+        return self._get_tracked_status(task_id, await self._get_task_worker(task_id))
+
+    async def pause_training_task(self, task_id: int) -> None:
+        if self.pending_tasks.remove(task_id):
+            return
+        record = await self._get_task_worker(task_id)
+        if record is None or not record.get_task(task_id).running:
+            return
+
+        bridge = await self.worker_bridge_factory.get_worker_bridge(record.connection)
+        await bridge.stop(task_id)
+
+    async def check_in(self, worker_data: WorkerData) -> str:
+        if self._reap_task is None:
+            self._reap_task = asyncio.create_task(self._reap())
+
+        record = self._new_record(worker_data, str(uuid.uuid4()))
+        await self._save_status(record)
+        await self.worker_bridge_factory.warm_up(record.connection)
+        self._notify_idle(worker_data.task_type)
+        return record.status.id
+
+    async def report_status(self, worker_status: WorkerStatus) -> None:
+        _STATUS_REPORTS.inc()
+        async with self._reserve_lock:
+            record = await self.storage.get(worker_status.id)
+            if record is None:
+                return  # Not checked in or expired
+            self.leases.renew(worker_status.id)
+            record = record.with_reported_status(worker_status)
+            await self._save_status(record)
+        if record.status.healthy and record.status.free_slots > 0:
+            self._notify_idle(record.status.task_type)
+
+    async def report_training_status(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> None:
+        _TRAINING_STATUS_REPORTS.inc()
+        async with self._reserve_lock:
+            record = await self.storage.get(worker_id)
+            if record is None:
+                return  # Not checked in or expired
+            self.leases.renew(worker_id)
+            applied = self._apply_training_status(record, training_status, task_id)
+            if applied is None:
+                return  # Not assigned by this cluster
+            updated, task = applied
+            if updated.status != record.status:  # The slot was freed
+                await self._save_status(updated)
+            else:
+                await self.storage.save(updated)
+        self._publish_training_status(worker_id, training_status, task.task_id)
+        if updated.status != record.status and updated.status.healthy:
+            self._notify_idle(updated.status.task_type)
+
+    async def pop_orphaned_tasks(self) -> list[int]:
+        """
+        Take the tasks whose worker was lost while running them
+
+        :return: ids of the orphaned tasks
+        """
+        task_ids = list(self._orphaned_tasks)
+        self._orphaned_tasks.clear()
+        return task_ids
+
+    async def reap_expired_workers(self) -> list[str]:
+        """
+        Remove the workers whose lease expired
+
+        :return: ids of the removed workers
+        """
+        removed = []
+        for worker_id in self.leases.pop_expired():
+            async with self._reserve_lock:
+                if self.leases.is_alive(worker_id):
+                    continue  # Renewed since it expired
+                record = await self.storage.get(worker_id)
+                if record is None:
+                    continue
+                await self._remove_worker(record)
+            removed.append(worker_id)
+        return removed
+
+    async def restore_workers(self) -> int:
+        """
+        Take over the workers already in the storage, e.g. loaded by a persistent storage after a restart
+
+        Each worker is granted a new lease, so it's removed by the reap task if it does not report again in time.
+        The tasks of their slots are tracked again and queued tasks are dispatched to their free slots.
+
+        :return: number of workers restored
+        """
+        if self._reap_task is None:
+            self._reap_task = asyncio.create_task(self._reap())
+
+        async with self._reserve_lock:
+            records = await self.storage.get_all()
+            for record in records:
+                self._restore_worker(record)
+        for task_type in {record.status.task_type for record in records}:
+            self._notify_idle(task_type)
+        return len(records)
+
+    async def probe_workers(self, timeout_sec: float = 2.) -> list[WorkerProbe]:
+        """
+        Get the live status of every worker and reconcile it into the storage
+
+        See WorkerCluster.probe_workers
+
+        :param timeout_sec: deadline of each call
+        :return: list of WorkerProbe objects, one per worker
+        """
+        records = await self.storage.get_all()
+        probes = await asyncio.gather(*(self._probe(record, timeout_sec) for record in records))
+        for record, probe in zip(records, probes):
+            await self._reconcile(record, probe)
+        return probes
+
+    async def close(self) -> None:
+        """
+        Stop the reap task and the dispatcher
+        """
+        if self._reap_task is not None:
+            self._reap_task.cancel()
+            self._reap_task = None
+        await self.dispatcher.close()
+
+    async def _assign_task(self, task: TrainingTask[int]) -> WorkerStatus | None:
+        async with self._reserve_lock:
+            reservations = await self._reserve_workers([task])
+        if not reservations:
+            return None
+        return await self._start_task(*reservations[0])
+
+    async def _reserve_workers(
+            self,
+            tasks: list[TrainingTask[int]]
+    ) -> list[Reservation]:
+        """
+        Reserve free slots of idle workers for tasks of the same type, the caller must hold the reserve lock
+
+        Slots are reserved before the workers are called, so concurrent assignments do not pick them again.
+        A worker with several free slots takes several tasks.
+
+        :return: list of (task, reserved worker record, complete task replaced in the slot),
+            shorter than tasks if not enough slots are free
+        """
+        if self.scheduler is not None:
+            return await self._reserve_scheduled_workers(tasks)
+
+        reservations = []
+        while len(reservations) < len(tasks):
+            workers = await self.storage.get_idle_by_type(tasks[0].task_type, len(tasks) - len(reservations))
+            if not workers:
+                break
+            for worker in workers:
+                if not self.leases.is_alive(worker.status.id):
+                    await self._remove_worker(worker)
+                    continue
+                await self._save_status(self._fill_slots(worker, tasks, reservations))
+        return reservations
+
+    async def _reserve_scheduled_workers(
+            self,
+            tasks: list[TrainingTask[int]]
+    ) -> list[Reservation]:
+        """
+        Reserve the slots chosen by the scheduler one task at a time, the caller must hold the reserve lock
+        """
+        reservations = []
+        for task in self._by_demand(tasks):
+            requirements = task.requirements
+            while (worker_id := self.scheduler.select(task.task_type, requirements, task.dataset)) is not None:
+                worker = await self.storage.get(worker_id)
+                if self._is_out_of_sync(worker_id, worker, requirements):
+                    continue
+                if not self.leases.is_alive(worker_id):
+                    await self._remove_worker(worker)
+                    continue
+                worker, replaced = worker.reserve(task.id, requirements)
+                await self._save_status(worker)
+                reservations.append((task, worker, replaced))
+                break
+        return reservations
+
+    async def _start_task(
+            self,
+            task: TrainingTask[int],
+            reserved: WorkerRecord,
+            replaced: SlotTask | None
+    ) -> WorkerStatus:
+        """
+        Start a task in a reserved slot, the reservation is reverted if the worker fails to start it
+        """
+        worker_id = reserved.status.id
+        try:
+            bridge = await self.worker_bridge_factory.get_worker_bridge(reserved.connection)
+            await bridge.start(WorkerStartOptions(
+                task_path=str(task.input_dir),  # TODO: add output dir
+                task_id=task.id
+            ))
+        except Exception:
+            async with self._reserve_lock:
+                record = await self.storage.get(worker_id)
+                if record is not None and record.get_task(task.id) is not None:
+                    await self._save_status(record.replace_task(task.id, replaced))
+            raise
+        async with self._reserve_lock:
+            started = self._track_start(task, worker_id, replaced, await self.storage.get(worker_id))
+            if started is not None:
+                await self.storage.save(started)
+        return reserved.status
+
+    async def _probe(self, record: WorkerRecord, timeout_sec: float) -> WorkerProbe:
+        started = time.perf_counter()
+        try:
+            bridge = await self.worker_bridge_factory.get_worker_bridge(record.connection)
+            status = await bridge.get_status(timeout=timeout_sec)
+        except Exception as e:
+            return self._to_probe(record, started, error=e)
+        return self._to_probe(record, started, status)
+
+    async def _reconcile(self, record: WorkerRecord, probe: WorkerProbe) -> None:
+        async with self._reserve_lock:
+            current = await self.storage.get(probe.worker_id)
+            updated = self._reconcile_probe(record, current, probe)
+            if updated is None:
+                return
+            if updated.status != current.status:
+                await self._save_status(updated)
+        if updated.status.healthy and updated.status.free_slots > 0:
+            self._notify_idle(updated.status.task_type)
+
+    async def _dispatch(self, task_type: str) -> None:
+        while (pending := self.pending_tasks.pop(task_type)) is not None:
+            try:
+                task = await asyncio.to_thread(self.task_repo.get_by_id, pending.task_id)
+                status = await self._assign_task(await self._with_dataset(task))
+            except RepoNotFoundError:
+                continue  # Deleted since it was queued
+            except Exception:
+                self._retry_failed(pending)
+                return
+            self._dispatch_failures.pop(task_type, None)
+            if status is None:  # No idle worker left
+                self._retry_later(pending)
+                return
+
+    async def _with_dataset(self, task: TrainingTask[int]) -> TrainingTask[int]:
+        if self.manifests is None:
+            return task
+        return await asyncio.to_thread(with_dataset, task, self.manifests)
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval_sec)
+            await self.reap_expired_workers()
+
+    async def _remove_worker(self, record: WorkerRecord) -> None:
+        """
+        Remove a lost worker and orphan its running tasks, the caller must hold the reserve lock
+        """
+        self._forget_worker(record.status.id)
+        if await self.storage.delete(record.status.id):  # Else already removed
+            self._orphan_tasks(record)
+
+    async def _save_status(self, record: WorkerRecord) -> None:
+        await self.storage.save(record)
+        self._publish_status(record)
+
+    async def _get_task_worker(self, task_id: int) -> WorkerRecord | None:
+        worker_id = self._task_workers.get(task_id)
+        if worker_id is None:
+            return None
+        record = await self.storage.get(worker_id)
+        if record is None or record.get_task(task_id) is None:
+            return None
+        return record
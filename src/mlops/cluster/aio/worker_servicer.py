@@ -0,0 +1,62 @@
+from collections.abc import AsyncIterator
+
+import grpc
+from google.protobuf import empty_pb2
+
+from mlops.cluster.aio.interfaces import AsyncWorkerClusterWorkerControllerBase
+from mlops.common.codec import from_raw_worker_status, from_raw_training_status, from_raw_worker_data
+from mlops.common.grpc_metrics import instrument_servicer
+from mlops.protos import worker_cluster_pb2_grpc, worker_cluster_pb2, messages_pb2
+
+
+@instrument_servicer('WorkerClusterWorker')
+class AsyncWorkerClusterWorkerServicer(worker_cluster_pb2_grpc.WorkerClusterWorkerServicer):
+    def __init__(self, cluster: AsyncWorkerClusterWorkerControllerBase):
+        self.cluster = cluster
+
+    async def CheckIn(
+            self,
+            request: messages_pb2.WorkerData,
+            context: grpc.aio.ServicerContext
+    ) -> worker_cluster_pb2.CheckInResponse:
+        try:
+            worker_id = await self.cluster.check_in(from_raw_worker_data(request))
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return worker_cluster_pb2.CheckInResponse(uuid=worker_id)
+
+    async def ReportStatus(
+            self,
+            request: worker_cluster_pb2.ReportStatusRequest,
+            context: grpc.aio.ServicerContext
+    ) -> empty_pb2.Empty:
+        await self._report_status(request)
+        return empty_pb2.Empty()
+
+    async def ReportTrainingStatus(
+            self,
+            request: worker_cluster_pb2.ReportTrainingStatusRequest,
+            context: grpc.aio.ServicerContext
+    ) -> empty_pb2.Empty:
+        await self._report_training_status(request)
+        return empty_pb2.Empty()
+
+    async def ReportStatusStream(
+            self,
+            request_iterator: AsyncIterator[worker_cluster_pb2.StatusReport],
+            context: grpc.aio.ServicerContext
+    ) -> empty_pb2.Empty:
+        async for report in request_iterator:
+            if report.HasField('status'):
+                await self._report_status(report.status)
+            elif report.HasField('training_status'):
+                await self._report_training_status(report.training_status)
+        return empty_pb2.Empty()
+
+    async def _report_status(self, request: worker_cluster_pb2.ReportStatusRequest) -> None:
+        await self.cluster.report_status(from_raw_worker_status(request.status))
+
+    async def _report_training_status(self, request: worker_cluster_pb2.ReportTrainingStatusRequest) -> None:
+        training_status = from_raw_training_status(request.status) if request.HasField('status') else None
+        task_id = request.task_id if request.HasField('task_id') else None
+        await self.cluster.report_training_status(request.worker_id, training_status, task_id)
@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from mlops.common.artifacts import (
+    ChunkWriter, list_files, read_chunks, get_resume_offsets, partition, DEFAULT_CHUNK_SIZE, COMPRESSIONS
+)
+from mlops.common.datasets import DatasetManifest
+from mlops.protos import worker_pb2, worker_pb2_grpc
+
+__ALL__ = ['ArtifactTransfer', 'to_stage_dataset_request']
+
+
+class ArtifactTransfer:
+    """
+    Transfer directories to and from the artifacts of a worker
+
+    The files are split into concurrency groups of similar sizes, each sent over its own stream.
+    A transfer resumes the files the other side has partially, and skips the files it has completely,
+    so a failed transfer is resumed by running it again.
+    """
+
+    def __init__(
+            self,
+            stub: worker_pb2_grpc.WorkerStub,
+            concurrency: int = 4,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            compression: str = 'zlib',
+            timeout: float | None = None
+    ):
+        """
+        :param stub: stub of the worker
+        :param concurrency: maximum number of concurrent streams
+        :param chunk_size: size of the uncompressed data of a chunk
+        :param compression: a key of COMPRESSIONS
+        :param timeout: seconds each call may take, no limit if None
+        """
+        self.stub = stub
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.compression = COMPRESSIONS[compression]
+        self.timeout = timeout
+
+    def get_files(self, artifact: str) -> dict[str, int]:
+        """
+        :param artifact: name of the artifact
+        :return: path -> size of the files of the artifact on the worker
+        """
+        info = self.stub.GetArtifactInfo(worker_pb2.ArtifactRequest(artifact=artifact), timeout=self.timeout)
+        return {file.path: file.size for file in info.files}
+
+    def upload(self, local_dir: Path, artifact: str) -> int:
+        """
+        Upload a directory as an artifact of the worker
+
+        :param local_dir: the directory to upload
+        :param artifact: name of the artifact
+        :return: number of bytes of file data uploaded
+        """
+        sizes = list_files(local_dir)
+        offsets = get_resume_offsets(sizes, self.get_files(artifact))
+
+        def upload_group(group: dict[str, int]) -> None:
+            chunks = (
+                chunk
+                for path, offset in group.items()
+                for chunk in read_chunks(local_dir, path, artifact, offset, self.chunk_size, self.compression)
+            )
+            self.stub.UploadArtifact(chunks, timeout=self.timeout)
+
+        self._run(upload_group, partition(offsets, sizes, self.concurrency))
+        return sum(sizes[path] - offset for path, offset in offsets.items())
+
+    def stage_dataset(self, local_dir: Path, artifact: str, manifest: DatasetManifest) -> int:
+        """
+        Stage a dataset as an artifact of the worker, only the files the worker hasn't cached are uploaded
+
+        :param local_dir: the directory of the dataset
+        :param artifact: name of the artifact
+        :param manifest: manifest of the directory, e.g. from a ManifestCache
+        :return: number of bytes of file data uploaded, 0 if the worker has cached the dataset
+        :raises RuntimeError: if files are still missing after the upload, e.g. the directory changed
+        """
+        request = to_stage_dataset_request(artifact, manifest)
+        if not self.stub.StageDataset(request, timeout=self.timeout).missing_paths:
+            return 0
+        uploaded = self.upload(local_dir, artifact)
+        if missing_paths := self.stub.StageDataset(request, timeout=self.timeout).missing_paths:
+            raise RuntimeError(f'files of {artifact!r} not matching the dataset {manifest.digest}: {missing_paths}')
+        return uploaded
+
+    def download(self, artifact: str, local_dir: Path) -> int:
+        """
+        Download an artifact of the worker into a directory
+
+        :param artifact: name of the artifact
+        :param local_dir: the directory to download into
+        :return: number of bytes of file data downloaded
+        """
+        sizes = self.get_files(artifact)
+        offsets = get_resume_offsets(sizes, list_files(local_dir))
+
+        def download_group(group: dict[str, int]) -> None:
+            request = worker_pb2.DownloadArtifactRequest(
+                artifact=artifact,
+                files=[worker_pb2.ArtifactFile(path=path, size=offset) for path, offset in group.items()],
+                compression=self.compression,
+                chunk_size=self.chunk_size
+            )
+            with ChunkWriter(local_dir) as writer:
+                for chunk in self.stub.DownloadArtifact(request, timeout=self.timeout):
+                    writer.write(chunk)
+
+        self._run(download_group, partition(offsets, sizes, self.concurrency))
+        return sum(sizes[path] - offset for path, offset in offsets.items())
+
+    @staticmethod
+    def _run(transfer, groups: list[dict[str, int]]) -> None:
+        if len(groups) <= 1:
+            for group in groups:
+                transfer(group)
+            return
+        with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix='artifact-transfer') as executor:
+            for future in [executor.submit(transfer, group) for group in groups]:
+                future.result()
+
+
+def to_stage_dataset_request(artifact: str, manifest: DatasetManifest) -> worker_pb2.StageDatasetRequest:
+    return worker_pb2.StageDatasetRequest(
+        artifact=artifact,
+        digest=manifest.digest,
+        files=[
+            worker_pb2.DatasetFile(path=path, digest=file.digest, size=file.size)
+            for path, file in manifest.files.items()
+        ]
+    )
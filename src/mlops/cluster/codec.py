@@ -0,0 +1,73 @@
+"""
+Conversions between the models of the cluster and the messages in worker_cluster_pb2,
+shared by the synchronous and the asyncio servicers
+"""
+from collections.abc import Iterable
+
+from mlops.cluster.model import TaskAssignment, TaskAssignmentResult
+from mlops.cluster.status_hub import WorkerStatusEvent, WorkerStatusEventType
+from mlops.common.codec import to_raw_worker_status, to_raw_training_status
+from mlops.common.model import WorkerStatus
+from mlops.protos import worker_cluster_pb2
+
+__ALL__ = ['to_raw_worker_status_event', 'to_raw_snapshot_events', 'to_raw_task_assignment']
+
+_RAW_ASSIGNMENT_RESULTS = {
+    TaskAssignmentResult.ASSIGNED: worker_cluster_pb2.ASSIGNED,
+    TaskAssignmentResult.NO_WORKER_AVAILABLE: worker_cluster_pb2.NO_WORKER_AVAILABLE,
+    TaskAssignmentResult.TASK_NOT_FOUND: worker_cluster_pb2.TASK_NOT_FOUND,
+    TaskAssignmentResult.START_FAILED: worker_cluster_pb2.START_FAILED,
+}
+
+
+def to_raw_worker_status_event(event: WorkerStatusEvent) -> worker_cluster_pb2.WorkerStatusEvent:
+    match event.type:
+        case WorkerStatusEventType.STATUS_CHANGED:
+            return worker_cluster_pb2.WorkerStatusEvent(
+                type=worker_cluster_pb2.STATUS_CHANGED,
+                worker_id=event.worker_id,
+                status=to_raw_worker_status(event.status)
+            )
+        case WorkerStatusEventType.TRAINING_STATUS_CHANGED:
+            return worker_cluster_pb2.WorkerStatusEvent(
+                type=worker_cluster_pb2.TRAINING_STATUS_CHANGED,
+                worker_id=event.worker_id,
+                training_status=(
+                    to_raw_training_status(event.training_status)
+                    if event.training_status is not None else None
+                ),
+                task_id=event.task_id
+            )
+        case WorkerStatusEventType.WORKER_REMOVED:
+            return worker_cluster_pb2.WorkerStatusEvent(
+                type=worker_cluster_pb2.WORKER_REMOVED,
+                worker_id=event.worker_id
+            )
+    raise ValueError(f'unexpected event type: {event.type}')
+
+
+def to_raw_snapshot_events(statuses: Iterable[WorkerStatus]) -> list[worker_cluster_pb2.WorkerStatusEvent]:
+    """
+    :return: a SNAPSHOT event per status, then a SNAPSHOT_END event
+    """
+    raw_events = [
+        worker_cluster_pb2.WorkerStatusEvent(
+            type=worker_cluster_pb2.SNAPSHOT,
+            worker_id=status.id,
+            status=to_raw_worker_status(status)
+        )
+        for status in statuses
+    ]
+    raw_events.append(worker_cluster_pb2.WorkerStatusEvent(type=worker_cluster_pb2.SNAPSHOT_END))
+    return raw_events
+
+
+def to_raw_task_assignment(assignment: TaskAssignment) -> worker_cluster_pb2.TaskAssignment:
+    return worker_cluster_pb2.TaskAssignment(
+        task_id=assignment.task_id,
+        result=_RAW_ASSIGNMENT_RESULTS[assignment.result],
+        worker_status=(
+            to_raw_worker_status(assignment.worker_status) if assignment.worker_status is not None else None
+        ),
+        error=assignment.error or ''
+    )
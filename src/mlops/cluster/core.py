@@ -0,0 +1,355 @@
+"""
+State and logic shared by WorkerCluster and AsyncWorkerCluster
+
+The clusters only differ in how they call the storage, the task repository and the workers: directly or on an
+event loop. How check-ins become records, slots are reserved, reports and probes are applied, and lost workers
+orphan their tasks is decided here, without I/O.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import replace
+from datetime import datetime
+
+import grpc
+
+from mlops.cluster.aio.dispatcher import AsyncTaskDispatcher
+from mlops.cluster.dispatcher import TaskDispatcher
+from mlops.cluster.leases import WorkerLeases
+from mlops.cluster.model import (
+    WorkerRecord, WorkerConnectionInfo, SlotTask, TaskAssignment, TaskAssignmentResult, WorkerProbe, ORPHANED_PHASE,
+    PENDING_PHASE
+)
+from mlops.cluster.schedulers.interfaces import WorkerSchedulerBase
+from mlops.cluster.status_hub import WorkerStatusHub, WorkerStatusEvent, WorkerStatusEventType
+from mlops.cluster.task_queue import PendingTaskQueue, PendingTask
+from mlops.common.datasets import ManifestCache
+from mlops.common.model import (
+    TrainingStatus, WorkerStatus, WorkerData, TrainingTask, Resources, SLOTS_OPTION, RESOURCES_OPTION, DATASETS_OPTION
+)
+
+__ALL__ = ['WorkerClusterCore', 'Reservation']
+
+logger = logging.getLogger(__name__)
+
+# (task, reserved worker record, complete task replaced in the slot)
+Reservation = tuple[TrainingTask[int], WorkerRecord, SlotTask | None]
+
+# Delay before dispatching again a task type whose dispatch failed, doubled on each consecutive failure
+_DISPATCH_RETRY_SEC = 1.
+_MAX_DISPATCH_RETRY_SEC = 60.
+
+
+class WorkerClusterCore:
+    """
+    Base of the worker clusters, holding the leases, the queue, the tasks of the workers and the orphaned tasks
+
+    Its methods don't call the storage, the task repository or the workers, the caller must hold the reserve lock
+    of the cluster when they change the tasks of the workers.
+    """
+
+    dispatcher: TaskDispatcher | AsyncTaskDispatcher  # set by the cluster
+    _task_workers: dict[int, str]  # task id -> id of the worker it's assigned to
+    _orphaned_tasks: dict[int, TrainingStatus]  # task id -> last training status, phase set to ORPHANED_PHASE
+    _dispatch_failures: dict[str, int]  # task type -> number of consecutive failed dispatches
+
+    def __init__(
+            self,
+            status_hub: WorkerStatusHub | None,
+            lease_ttl_sec: float,
+            scheduler: WorkerSchedulerBase | None,
+            manifests: ManifestCache | None
+    ):
+        self.status_hub = status_hub if status_hub is not None else WorkerStatusHub()
+        self.leases = WorkerLeases(lease_ttl_sec)
+        self.scheduler = scheduler
+        self.manifests = manifests
+        self._task_workers = {}
+        self._orphaned_tasks = {}
+        self._dispatch_failures = {}
+        self.pending_tasks = PendingTaskQueue()
+
+    def _new_record(self, worker_data: WorkerData, worker_id: str) -> WorkerRecord:
+        """
+        Create the record of a worker checking in and grant it a lease
+        """
+        slots = int(worker_data.options.get(SLOTS_OPTION, 1))
+        if slots < 1:
+            raise ValueError(f'invalid number of slots: {slots}')
+        resources = worker_data.options.get(RESOURCES_OPTION)
+        capacity = Resources.from_mapping(resources) if resources is not None else None
+
+        now = datetime.now()
+        self.leases.renew(worker_id)
+        return WorkerRecord(
+            status=WorkerStatus(
+                id=worker_id,
+                task_type=worker_data.task_type,
+                version=worker_data.version,
+                healthy=True,
+                has_task=False,
+                joined_at=now,
+                created_at=now,
+                slots=slots,
+                datasets=tuple(worker_data.options.get(DATASETS_OPTION, ()))
+            ),
+            connection=WorkerConnectionInfo(host=worker_data.host, port=worker_data.port),
+            capacity=capacity
+        )
+
+    def _get_pending_status(self, task_id: int) -> TrainingStatus | None:
+        if self.pending_tasks.get(task_id) is None:
+            return None
+        return TrainingStatus(name='', phase=PENDING_PHASE, progress=0., description='', is_complete=False)
+
+    def _get_tracked_status(self, task_id: int, record: WorkerRecord | None) -> TrainingStatus | None:
+        """
+        :param record: the worker running the task, None if no worker does
+        """
+        if record is None:
+            return self._orphaned_tasks.get(task_id)
+        return record.get_task(task_id).training_status
+
+    @staticmethod
+    def _apply_training_status(
+            record: WorkerRecord,
+            training_status: TrainingStatus | None,
+            task_id: int | None
+    ) -> tuple[WorkerRecord, SlotTask] | None:
+        """
+        Apply a training status reported by a worker to the task of its slot, a complete task frees its slot
+
+        :param task_id: the task reported, None for the only task of the worker
+        :return: (updated record, task reported), None if the task is not assigned by this cluster
+        """
+        if task_id is not None:
+            task = record.get_task(task_id)
+        else:
+            task = record.tasks[0] if len(record.tasks) == 1 else None
+        if task is None:
+            return None
+        complete = training_status is not None and training_status.is_complete
+        updated = record.replace_task(
+            task.task_id,
+            task._replace(training_status=training_status, running=task.running and not complete)
+        )
+        return updated, task
+
+    @staticmethod
+    def _group_by_type(tasks: Iterable[TrainingTask[int]]) -> dict[str, list[TrainingTask[int]]]:
+        tasks_by_type: dict[str, list[TrainingTask[int]]] = {}
+        for task in tasks:
+            tasks_by_type.setdefault(task.task_type, []).append(task)
+        return tasks_by_type
+
+    @staticmethod
+    def _fill_slots(
+            worker: WorkerRecord,
+            tasks: list[TrainingTask[int]],
+            reservations: list[Reservation]
+    ) -> WorkerRecord:
+        """
+        Reserve the free slots of a worker for the next tasks without a reservation
+
+        :return: the worker record with the slots reserved
+        """
+        while len(reservations) < len(tasks) and worker.status.free_slots > 0:
+            task = tasks[len(reservations)]
+            worker, replaced = worker.reserve(task.id, task.requirements)
+            reservations.append((task, worker, replaced))
+        return worker
+
+    @staticmethod
+    def _by_demand(tasks: Iterable[TrainingTask[int]]) -> list[TrainingTask[int]]:
+        """
+        Order tasks to be placed by the scheduler: the most demanding first, so the small tasks fill the gaps left
+        """
+        return sorted(tasks, key=lambda t: t.requirements, reverse=True)
+
+    def _is_out_of_sync(self, worker_id: str, worker: WorkerRecord | None, requirements: Resources) -> bool:
+        """
+        Check whether the scheduler selected a worker that is gone or can't run the requirements, and resync it
+
+        :param worker: the record of the selected worker in the storage
+        """
+        if worker is None:
+            self.scheduler.remove(worker_id)
+            return True
+        if self.leases.is_alive(worker_id) and not worker.can_run(requirements):
+            self.scheduler.update(worker)
+            return True
+        return False
+
+    def _track_start(
+            self,
+            task: TrainingTask[int],
+            worker_id: str,
+            replaced: SlotTask | None,
+            record: WorkerRecord | None
+    ) -> WorkerRecord | None:
+        """
+        Track a task started by a worker, in place of the complete task replaced in its slot
+
+        A queued task assigned directly leaves the queue only now, so it's still dispatched if no worker takes it.
+
+        :param record: the record of the worker in the storage now
+        :return: the record with the slot of the task marked started, to save, None if the slot is gone
+        """
+        self.pending_tasks.remove(task.id)
+        if replaced is not None and self._task_workers.get(replaced.task_id) == worker_id:
+            self._task_workers.pop(replaced.task_id, None)
+        self._task_workers[task.id] = worker_id
+        self._orphaned_tasks.pop(task.id, None)
+        slot_task = record.get_task(task.id) if record is not None else None
+        if slot_task is None or slot_task.started:
+            return None
+        return record.replace_task(task.id, slot_task._replace(started=True))
+
+    @staticmethod
+    def _to_assignments(
+            task_ids: Iterable[int],
+            tasks: Mapping[int, TrainingTask[int]],
+            starts: Mapping[int, WorkerStatus | Exception]
+    ) -> list[TaskAssignment]:
+        """
+        :param tasks: task id -> task found in the repository
+        :param starts: task id -> status of the worker it was started on, or exception raised starting it
+        """
+        assignments = []
+        for task_id in task_ids:
+            if task_id not in tasks:
+                assignments.append(TaskAssignment(task_id, TaskAssignmentResult.TASK_NOT_FOUND))
+            elif task_id not in starts:
+                assignments.append(TaskAssignment(task_id, TaskAssignmentResult.NO_WORKER_AVAILABLE))
+            elif isinstance(result := starts[task_id], Exception):
+                assignments.append(TaskAssignment(task_id, TaskAssignmentResult.START_FAILED, error=str(result)))
+            else:
+                assignments.append(TaskAssignment(task_id, TaskAssignmentResult.ASSIGNED, worker_status=result))
+        return assignments
+
+    @staticmethod
+    def _to_probe(
+            record: WorkerRecord,
+            started: float,
+            status: WorkerStatus | None = None,
+            error: Exception | None = None
+    ) -> WorkerProbe:
+        """
+        :param started: time.perf_counter() when the worker was called
+        """
+        worker_id = record.status.id
+        elapsed = time.perf_counter() - started
+        if status is None:
+            return WorkerProbe(worker_id, None, elapsed, error=str(error), timed_out=_is_timeout(error))
+        return WorkerProbe(worker_id, replace(status, id=worker_id), elapsed)
+
+    def _reconcile_probe(
+            self,
+            record: WorkerRecord,
+            current: WorkerRecord | None,
+            probe: WorkerProbe
+    ) -> WorkerRecord | None:
+        """
+        Apply a probe to the record of a worker, a worker not answering before the deadline is marked unhealthy
+
+        :param record: the record when the worker was probed
+        :param current: the record in the storage now
+        :return: the updated record, None if it changed while probing: the newer status wins
+        """
+        if current is None or current.status != record.status:
+            return None
+        if probe.status is None:
+            if probe.timed_out:
+                return current._replace(status=replace(current.status, healthy=False))
+            return current  # Unknown, e.g. the worker does not implement GetStatus
+        self.leases.renew(probe.worker_id)
+        # Slots are only freed by the reports of the worker, a start may still be in flight
+        return current.with_tasks(current.tasks, probe.status)
+
+    def _restore_worker(self, record: WorkerRecord) -> None:
+        worker_id = record.status.id
+        self.leases.renew(worker_id)
+        for task in record.tasks:
+            self._task_workers[task.task_id] = worker_id
+        if self.scheduler is not None:
+            self.scheduler.update(record)
+
+    def _forget_worker(self, worker_id: str) -> None:
+        """
+        Stop placing tasks on a worker before it's deleted from the storage
+        """
+        self.leases.revoke(worker_id)
+        if self.scheduler is not None:
+            self.scheduler.remove(worker_id)
+
+    def _orphan_tasks(self, record: WorkerRecord) -> None:
+        """
+        Orphan the running tasks of a lost worker deleted from the storage
+        """
+        worker_id = record.status.id
+        for task in record.tasks:
+            if self._task_workers.get(task.task_id) != worker_id:
+                continue  # Reassigned since
+            self._task_workers.pop(task.task_id, None)
+            if task.running:
+                training_status = task.training_status
+                self._orphaned_tasks[task.task_id] = TrainingStatus(
+                    name=training_status.name if training_status is not None else '',
+                    phase=ORPHANED_PHASE,
+                    progress=training_status.progress if training_status is not None else 0.,
+                    description=f'worker {worker_id} was lost',
+                    is_complete=False
+                )
+        self.status_hub.publish(WorkerStatusEvent(type=WorkerStatusEventType.WORKER_REMOVED, worker_id=worker_id))
+
+    def _publish_status(self, record: WorkerRecord) -> None:
+        """
+        Publish the status of a worker saved to the storage
+        """
+        if self.scheduler is not None:
+            self.scheduler.update(record)
+        self.status_hub.publish(WorkerStatusEvent(
+            type=WorkerStatusEventType.STATUS_CHANGED,
+            worker_id=record.status.id,
+            status=record.status
+        ))
+
+    def _publish_training_status(self, worker_id: str, training_status: TrainingStatus | None, task_id: int) -> None:
+        self.status_hub.publish(WorkerStatusEvent(
+            type=WorkerStatusEventType.TRAINING_STATUS_CHANGED,
+            worker_id=worker_id,
+            training_status=training_status,
+            task_id=task_id
+        ))
+
+    def _notify_idle(self, task_type: str) -> None:
+        if self.pending_tasks.depth(task_type):
+            self.dispatcher.notify(task_type)
+
+    def _retry_later(self, pending: PendingTask) -> None:
+        """
+        Queue a task again after no worker was available, and retry when the scheduler may place it
+        """
+        self.pending_tasks.requeue(pending)
+        retry_delay = self.scheduler.get_retry_delay() if self.scheduler is not None else None
+        if retry_delay is not None:
+            self.dispatcher.notify_later(pending.task_type, retry_delay)
+
+    def _retry_failed(self, pending: PendingTask) -> None:
+        """
+        Queue a task again after its dispatch failed, e.g. the task repository or the start of the worker did,
+        and retry its type with a backoff
+        """
+        self.pending_tasks.requeue(pending)
+        failures = self._dispatch_failures.get(pending.task_type, 0) + 1
+        self._dispatch_failures[pending.task_type] = failures
+        retry_delay = min(_DISPATCH_RETRY_SEC * 2 ** (failures - 1), _MAX_DISPATCH_RETRY_SEC)
+        logger.exception('failed to dispatch the task %s, retrying in %.1fs', pending.task_id, retry_delay)
+        self.dispatcher.notify_later(pending.task_type, retry_delay)
+
+
+def _is_timeout(error: Exception) -> bool:
+    if isinstance(error, (grpc.Call, grpc.aio.AioRpcError)):
+        return error.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    return isinstance(error, (TimeoutError, asyncio.TimeoutError))
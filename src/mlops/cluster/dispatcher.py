@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class TaskDispatcher:
+    """
+    Thread dispatching pending tasks when notified that a task type may be dispatchable
+
+    Notifications are coalesced per task type, so a burst of idle workers of the same type
+    wakes the dispatcher once. The dispatch function is expected to assign pending tasks of the type
+    until there is no pending task or no idle worker left.
+    """
+
+    _ready: dict[str, None]  # ordered set of task types to dispatch
+    _delayed: dict[str, float]  # task type -> time.monotonic() to dispatch it at
+    _cond: threading.Condition
+    _closed: bool
+    _thread: threading.Thread
+
+    def __init__(self, dispatch: Callable[[str], None]):
+        """
+        :param dispatch: function dispatching the pending tasks of a task type
+        """
+        self._dispatch = dispatch
+        self._ready = {}
+        self._delayed = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def notify(self, task_type: str) -> None:
+        """
+        Notify that pending tasks of a type may be dispatchable
+
+        :param task_type: type of the task
+        """
+        with self._cond:
+            self._ready[task_type] = None
+            self._cond.notify()
+
+    def notify_later(self, task_type: str, delay: float) -> None:
+        """
+        Notify that pending tasks of a type may be dispatchable after a delay, e.g. when a scheduler holds them back
+
+        :param task_type: type of the task
+        :param delay: seconds to wait, an earlier notification of the type is kept
+        """
+        deadline = time.monotonic() + delay
+        with self._cond:
+            if deadline < self._delayed.get(task_type, float('inf')):
+                self._delayed[task_type] = deadline
+                self._cond.notify()
+
+    def close(self) -> None:
+        """
+        Stop the dispatcher thread
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # Not wait_for, the timeout is recomputed when a task type is delayed
+                while not (self._move_due() or self._ready or self._closed):
+                    self._cond.wait(self._get_timeout())
+                if self._closed:
+                    return
+                task_type = next(iter(self._ready))
+                del self._ready[task_type]
+
+            try:
+                self._dispatch(task_type)
+            except Exception:
+                logger.exception('failed to dispatch tasks of type %s', task_type)
+
+    def _get_timeout(self) -> float | None:
+        if not self._delayed:
+            return None
+        return max(min(self._delayed.values()) - time.monotonic(), 0)
+
+    def _move_due(self) -> bool:
+        """
+        Make the delayed task types which are due ready, the caller must hold the condition
+
+        :return: True if a task type was made ready
+        """
+        now = time.monotonic()
+        due = [task_type for task_type, deadline in self._delayed.items() if deadline <= now]
+        for task_type in due:
+            del self._delayed[task_type]
+            self._ready[task_type] = None
+        return bool(due)
@@ -0,0 +1,103 @@
+import bisect
+import hashlib
+from collections.abc import Iterator
+
+
+class HashRing:
+    """
+    Consistent hash ring of shards
+
+    Each shard is placed at many points of the ring, and a key belongs to the first shard clockwise from its hash.
+    Adding or removing a shard only moves the keys of the arcs it takes or leaves, about 1/N of the keys,
+    and the other keys keep their shard. Looking up a key is O(log(N * replicas)).
+    It's not thread-safe.
+    """
+
+    replicas: int
+    _points: list[int]  # sorted hashes of the points of the ring
+    _owners: dict[int, str]  # hash of a point -> shard id
+    _shards: set[str]
+
+    def __init__(self, replicas: int = 64):
+        """
+        :param replicas: number of points per shard, more points spread the keys more evenly
+        """
+        self.replicas = replicas
+        self._points = []
+        self._owners = {}
+        self._shards = set()
+
+    def add(self, shard_id: str) -> None:
+        """
+        Add a shard, no operation if it's already in the ring
+
+        :param shard_id: the shard id
+        """
+        if shard_id in self._shards:
+            return
+        self._shards.add(shard_id)
+        for point in self._shard_points(shard_id):
+            if point in self._owners:
+                continue  # Collision, the point keeps its first owner
+            self._owners[point] = shard_id
+            bisect.insort(self._points, point)
+
+    def remove(self, shard_id: str) -> None:
+        """
+        Remove a shard, no operation if it's not in the ring
+
+        :param shard_id: the shard id
+        """
+        if shard_id not in self._shards:
+            return
+        self._shards.discard(shard_id)
+        for point in self._shard_points(shard_id):
+            if self._owners.get(point) == shard_id:
+                del self._owners[point]
+                del self._points[bisect.bisect_left(self._points, point)]
+
+    def get(self, key: str) -> str:
+        """
+        Get the shard owning a key
+
+        :param key: the key, e.g. a worker id
+        :return: the shard id
+        """
+        if not self._points:
+            raise LookupError('the ring has no shard')
+        return self._owners[self._points[self._index(key)]]
+
+    def walk(self, key: str) -> Iterator[str]:
+        """
+        Iterate over the shards clockwise from a key, each shard once
+
+        :param key: the key, the first shard is its owner
+        :return: iterator of shard ids
+        """
+        if not self._points:
+            return
+        start = self._index(key)
+        seen = set()
+        for i in range(len(self._points)):
+            shard_id = self._owners[self._points[(start + i) % len(self._points)]]
+            if shard_id not in seen:
+                seen.add(shard_id)
+                yield shard_id
+                if len(seen) == len(self._shards):
+                    return
+
+    def _index(self, key: str) -> int:
+        return bisect.bisect_left(self._points, _hash(key)) % len(self._points)
+
+    def _shard_points(self, shard_id: str) -> list[int]:
+        return [_hash(f'{shard_id}#{i}') for i in range(self.replicas)]
+
+    def __contains__(self, shard_id: str) -> bool:
+        return shard_id in self._shards
+
+    def __len__(self):
+        return len(self._shards)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
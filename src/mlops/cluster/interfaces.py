@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
+from mlops.cluster.model import TaskAssignment
+from mlops.cluster.status_hub import WorkerStatusSubscription
 from mlops.common.model import WorkerStatus, TrainingStatus, WorkerData
 
 
@@ -25,6 +28,17 @@ class WorkerClusterTrainingControllerBase(ABC):
         :return: WorkerStatus object or None if worker not found
         """
 
+    @abstractmethod
+    def watch_workers_status(self, worker_id: str | None = None) -> WorkerStatusSubscription:
+        """
+        Watch the status changes of all workers or a specific worker
+
+        Subscribe before taking a snapshot with get_workers_status or get_worker_status so no change is missed.
+
+        :param worker_id: the worker id, or None to watch all workers
+        :return: WorkerStatusSubscription object, close it to stop watching
+        """
+
     @abstractmethod
     def assign_training_task(self, task_id: int) -> WorkerStatus | None:
         """
@@ -32,6 +46,28 @@ class WorkerClusterTrainingControllerBase(ABC):
 
         :param task_id: the training task id
         :return: WorkerStatus object or None if no worker available
+        :raises RepoNotFoundError: when the task does not exist
+        """
+
+    @abstractmethod
+    def assign_training_tasks(self, task_ids: Sequence[int]) -> list[TaskAssignment]:
+        """
+        Assign training tasks to workers
+
+        The tasks are fetched at once and the workers are started concurrently.
+
+        :param task_ids: the training task ids
+        :return: list of TaskAssignment objects, one per distinct task id in the given order
+        """
+
+    @abstractmethod
+    def enqueue_training_task(self, task_id: int, priority: int = 0) -> int | None:
+        """
+        Queue a training task, it's assigned as soon as a worker of its type is idle
+
+        :param task_id: the training task id
+        :param priority: tasks with a higher priority are assigned first
+        :return: number of pending tasks of the same type or None if task not found
         """
 
     @abstractmethod
@@ -77,12 +113,18 @@ class WorkerClusterWorkerControllerBase(ABC):
         """
 
     @abstractmethod
-    def report_training_status(self, worker_id: str, training_status: TrainingStatus | None) -> None:
+    def report_training_status(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> None:
         """
         Report training status
 
         :param worker_id: the worker id
         :param training_status: TrainingStatus object or None if no training task assigned
+        :param task_id: the task the status is about, may be None if the worker has a single slot
         """
 
 
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class WorkerLeases:
+    """
+    Heartbeat leases of workers
+
+    All leases have the same time to live, so keeping them in renewal order also keeps them in expiry order.
+    Renewing a lease moves it to the end and expired leases are popped from the front,
+    which makes renewing O(1) and reaping O(expired).
+    It's thread-safe.
+    """
+
+    ttl_sec: float
+    _deadlines: OrderedDict[str, float]  # worker id -> deadline, ordered by deadline
+    _lock: threading.Lock
+
+    def __init__(self, ttl_sec: float):
+        """
+        :param ttl_sec: seconds a lease lasts after it's renewed
+        """
+        self.ttl_sec = ttl_sec
+        self._deadlines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def renew(self, worker_id: str) -> None:
+        """
+        Grant or renew the lease of a worker
+
+        :param worker_id: the worker id
+        """
+        deadline = time.monotonic() + self.ttl_sec
+        with self._lock:
+            self._deadlines[worker_id] = deadline
+            self._deadlines.move_to_end(worker_id)
+
+    def revoke(self, worker_id: str) -> None:
+        """
+        Remove the lease of a worker
+
+        :param worker_id: the worker id
+        """
+        with self._lock:
+            self._deadlines.pop(worker_id, None)
+
+    def is_alive(self, worker_id: str) -> bool:
+        """
+        Check if a worker holds a lease that has not expired
+
+        :param worker_id: the worker id
+        :return: True if the lease is valid, False otherwise
+        """
+        with self._lock:
+            deadline = self._deadlines.get(worker_id)
+        return deadline is not None and deadline > time.monotonic()
+
+    def pop_expired(self) -> list[str]:
+        """
+        Remove the expired leases
+
+        :return: ids of the workers whose lease expired
+        """
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            while self._deadlines:
+                worker_id, deadline = next(iter(self._deadlines.items()))
+                if deadline > now:
+                    break
+                self._deadlines.popitem(last=False)
+                expired.append(worker_id)
+        return expired
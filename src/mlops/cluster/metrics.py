@@ -0,0 +1,21 @@
+"""
+Metrics of the cluster internals, see mlops.common.metrics
+"""
+from mlops.common.metrics import registry
+
+__ALL__ = ['WORKER_REPORTS', 'PENDING_TASKS', 'BRIDGE_CACHE', 'WORKER_CHANNELS', 'STORAGE_DURATION']
+
+WORKER_REPORTS = registry.counter(
+    'mlops_worker_reports_total', 'Reports received from workers, by kind: status or training_status', ['kind']
+)
+PENDING_TASKS = registry.gauge('mlops_pending_tasks', 'Training tasks waiting for a free worker', ['task_type'])
+BRIDGE_CACHE = registry.counter(
+    'mlops_worker_bridge_cache_total',
+    'Lookups, warm-ups and evictions of the worker bridge cache, by result: hit, miss, warm or evict',
+    ['result']
+)
+WORKER_CHANNELS = registry.gauge('mlops_worker_channels', 'Open channels of the worker bridge caches')
+STORAGE_DURATION = registry.histogram(
+    'mlops_worker_storage_duration_seconds', 'Duration of the worker storage operations', ['storage', 'operation'],
+    buckets=(.00001, .00005, .0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, .5)
+)
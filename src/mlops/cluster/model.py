@@ -1,6 +1,13 @@
+from dataclasses import replace
+from enum import Enum
 from typing import NamedTuple
 
-from mlops.common.model import WorkerStatus
+from mlops.common.model import WorkerStatus, TrainingStatus, Resources
+
+# Phase of the training status of a task waiting in the pending queue for an idle worker
+PENDING_PHASE = 'pending'
+# Phase of the training status of a task whose worker was lost, the task can be rescheduled
+ORPHANED_PHASE = 'orphaned'
 
 
 class WorkerConnectionInfo(NamedTuple):
@@ -8,6 +15,144 @@ class WorkerConnectionInfo(NamedTuple):
     port: int
 
 
+class SlotTask(NamedTuple):
+    task_id: int
+    running: bool = True  # False once the task is complete, its slot can be reused
+    training_status: TrainingStatus | None = None  # the last training status reported for the task
+    requirements: Resources = Resources()  # resources held by the task while running
+    started: bool = False  # True once the worker accepted to start the task
+
+
 class WorkerRecord(NamedTuple):
     status: WorkerStatus
     connection: WorkerConnectionInfo
+    tasks: tuple[SlotTask, ...] = ()  # the last task assigned to each used slot of the worker
+    capacity: Resources | None = None  # the resources advertised by the worker, None if not advertised
+
+    @property
+    def free_resources(self) -> Resources | None:
+        """
+        The capacity left by the running tasks, None if the worker did not advertise its resources
+        """
+        if self.capacity is None:
+            return None
+        free = self.capacity
+        for task in self.tasks:
+            if task.running:
+                free = free.minus(task.requirements)
+        return free
+
+    def can_run(self, requirements: Resources) -> bool:
+        """
+        :param requirements: the resources required by a task
+        :return: True if the worker is healthy and has a free slot and enough free resources for the task
+        """
+        if not self.status.healthy or self.status.free_slots <= 0:
+            return False
+        free = self.free_resources
+        return free is None or requirements.fits(free)
+
+    def get_task(self, task_id: int) -> SlotTask | None:
+        """
+        Get the task of a slot
+
+        :param task_id: the training task id
+        :return: SlotTask object or None if the task is not in a slot of the worker
+        """
+        for task in self.tasks:
+            if task.task_id == task_id:
+                return task
+        return None
+
+    def reserve(self, task_id: int, requirements: Resources = Resources()) -> tuple['WorkerRecord', SlotTask | None]:
+        """
+        Put a task in a free slot
+
+        An unused slot is taken first, otherwise the slot of a complete task is reused.
+        The resources are not checked, see can_run.
+
+        :param task_id: the training task id
+        :param requirements: the resources required by the task
+        :return: the updated record and the complete task replaced, if any
+        """
+        if self.status.free_slots <= 0:
+            raise ValueError(f'worker {self.status.id} has no free slot')
+        tasks = list(self.tasks)
+        if len(tasks) < self.status.slots:
+            tasks.append(SlotTask(task_id, requirements=requirements))
+            return self.with_tasks(tuple(tasks)), None
+        for i, task in enumerate(tasks):
+            if not task.running:
+                tasks[i] = SlotTask(task_id, requirements=requirements)
+                return self.with_tasks(tuple(tasks)), task
+        raise ValueError(f'worker {self.status.id} has no free slot')
+
+    def replace_task(self, task_id: int, task: SlotTask | None) -> 'WorkerRecord':
+        """
+        Replace the task of a slot
+
+        :param task_id: the training task id in the slot
+        :param task: the new task of the slot, or None to free the slot
+        :return: the updated record
+        """
+        tasks = []
+        for slot_task in self.tasks:
+            if slot_task.task_id != task_id:
+                tasks.append(slot_task)
+            elif task is not None:
+                tasks.append(task)
+        return self.with_tasks(tuple(tasks))
+
+    def with_tasks(self, tasks: tuple[SlotTask, ...], status: WorkerStatus | None = None) -> 'WorkerRecord':
+        """
+        Replace the tasks and keep the task counts of the status in sync with them
+
+        :param tasks: the tasks of the slots
+        :param status: the new status, or None to keep the current one
+        :return: the updated record
+        """
+        running_tasks = sum(task.running for task in tasks)
+        return self._replace(tasks=tasks, status=replace(
+            status if status is not None else self.status,
+            slots=self.status.slots,
+            running_tasks=running_tasks,
+            has_task=running_tasks > 0
+        ))
+
+    def with_reported_status(self, status: WorkerStatus) -> 'WorkerRecord':
+        """
+        Apply a status reported by the worker
+
+        The cluster tracks which slots are in use, a report only frees them when the worker has no task.
+        Only the tasks the worker accepted to start are freed: a report sent before a start call reached
+        the worker must not free its slot, or the slot could be reserved twice.
+
+        :param status: the reported WorkerStatus object
+        :return: the updated record
+        """
+        tasks = self.tasks
+        if not status.has_task and status.running_tasks == 0:
+            tasks = tuple(task._replace(running=False) if task.running and task.started else task for task in tasks)
+        return self.with_tasks(tasks, status)
+
+
+class TaskAssignmentResult(Enum):
+    ASSIGNED = 'assigned'
+    NO_WORKER_AVAILABLE = 'no_worker_available'
+    TASK_NOT_FOUND = 'task_not_found'
+    START_FAILED = 'start_failed'
+
+
+class TaskAssignment(NamedTuple):
+    task_id: int
+    result: TaskAssignmentResult
+    worker_status: WorkerStatus | None = None  # set if the task is assigned
+    error: str | None = None  # set if the worker failed to start the task
+
+
+class WorkerProbe(NamedTuple):
+    worker_id: str
+    status: WorkerStatus | None  # the live status or None if the worker failed to answer
+    elapsed_sec: float  # round trip time of the call
+    error: str | None = None
+    timed_out: bool = False  # the worker did not answer before the deadline
@@ -0,0 +1,126 @@
+import bisect
+import itertools
+import math
+import threading
+
+from mlops.cluster.model import WorkerRecord
+from mlops.cluster.schedulers.interfaces import WorkerSchedulerBase
+from mlops.common.model import Resources
+
+# Bucket of the workers which did not advertise their resources, after every bucket of bounded resources
+_UNBOUNDED = Resources(math.inf, math.inf, math.inf)
+
+
+class BestFitScheduler(WorkerSchedulerBase):
+    """
+    Scheduler assigning a task to the idle worker with the least free resources that fit it.
+    It's thread-safe.
+
+    Packing small tasks into the fullest workers keeps the large workers free for large tasks.
+    Idle workers are indexed by task type into buckets of their free resources, rounded down to multiples of
+    the bucket steps. The cpu levels of a task type are kept sorted, and the buckets of each level sorted by
+    (memory, disk). A binary search skips the levels with less cpus than required, then in each level from the
+    smallest a binary search skips the buckets with less memory than required, and the first bucket with enough disk
+    is taken. Selecting takes O(L log B) for L cpu levels and B buckets per level, plus the buckets with enough memory
+    but not enough disk, where L is at most the largest free cpus divided by cpus_step.
+    Workers which did not advertise their resources are only chosen when no other worker fits.
+    """
+
+    _levels: dict[str, list[float]]  # task type -> sorted cpus of the non-empty buckets
+    _buckets: dict[tuple[str, float], list[tuple[float, float]]]  # (task type, cpus) -> sorted (memory, disk)
+    _workers: dict[tuple[str, Resources], dict[str, None]]  # (task type, bucket) -> ordered set of worker ids
+    _keys: dict[str, tuple[str, Resources]]  # worker id -> (task type, bucket) it's indexed by
+    _lock: threading.Lock
+
+    def __init__(self, cpus_step: float = .5, memory_step_mb: float = 256., disk_step_mb: float = 1024.):
+        """
+        :param cpus_step: granularity of the cpu buckets
+        :param memory_step_mb: granularity of the memory buckets
+        :param disk_step_mb: granularity of the disk buckets
+        """
+        self.steps = Resources(cpus_step, memory_step_mb, disk_step_mb)
+        self._levels = {}
+        self._buckets = {}
+        self._workers = {}
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def update(self, worker_record: WorkerRecord) -> None:
+        worker_id = worker_record.status.id
+        key = self._index_key(worker_record)
+        with self._lock:
+            old_key = self._keys.get(worker_id)
+            if old_key == key:
+                return  # Nothing to reindex
+            if old_key is not None:
+                self._unindex(worker_id, old_key)
+            if key is not None:
+                self._index(worker_id, key)
+
+    def remove(self, worker_id: str) -> None:
+        with self._lock:
+            key = self._keys.get(worker_id)
+            if key is not None:
+                self._unindex(worker_id, key)
+
+    def select(self, task_type: str, requirements: Resources, dataset: str | None = None) -> str | None:
+        with self._lock:
+            levels = self._levels.get(task_type)
+            if not levels:
+                return None
+            for cpus in itertools.islice(levels, bisect.bisect_left(levels, requirements.cpus), None):
+                buckets = self._buckets[task_type, cpus]
+                # (memory,) sorts before every bucket with this memory
+                start = bisect.bisect_left(buckets, (requirements.memory_mb,))
+                for memory_mb, disk_mb in itertools.islice(buckets, start, None):
+                    if requirements.disk_mb <= disk_mb:
+                        return next(iter(self._workers[task_type, Resources(cpus, memory_mb, disk_mb)]))
+            return None
+
+    def _index_key(self, record: WorkerRecord) -> tuple[str, Resources] | None:
+        """
+        :return: (task type, bucket) of an idle worker, None if the worker can not run any task
+        """
+        if not record.can_run(Resources()):
+            return None
+        free = record.free_resources
+        if free is None:
+            return record.status.task_type, _UNBOUNDED
+        # Rounded down, so every task fitting the bucket fits the worker
+        return record.status.task_type, Resources(*(
+            math.floor(amount / step) * step if step > 0 else amount
+            for amount, step in zip(free, self.steps)
+        ))
+
+    def _index(self, worker_id: str, key: tuple[str, Resources]) -> None:
+        self._keys[worker_id] = key
+        workers = self._workers.get(key)
+        if workers is None:
+            workers = self._workers[key] = {}
+            task_type, bucket = key
+            buckets = self._buckets.get((task_type, bucket.cpus))
+            if buckets is None:
+                buckets = self._buckets[task_type, bucket.cpus] = []
+                bisect.insort(self._levels.setdefault(task_type, []), bucket.cpus)
+            bisect.insort(buckets, (bucket.memory_mb, bucket.disk_mb))
+        workers[worker_id] = None
+
+    def _unindex(self, worker_id: str, key: tuple[str, Resources]) -> None:
+        del self._keys[worker_id]
+        workers = self._workers[key]
+        del workers[worker_id]
+        if workers:
+            return
+
+        del self._workers[key]
+        task_type, bucket = key
+        buckets = self._buckets[task_type, bucket.cpus]
+        del buckets[bisect.bisect_left(buckets, (bucket.memory_mb, bucket.disk_mb))]
+        if buckets:
+            return
+
+        del self._buckets[task_type, bucket.cpus]
+        levels = self._levels[task_type]
+        del levels[bisect.bisect_left(levels, bucket.cpus)]
+        if not levels:
+            del self._levels[task_type]
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+
+from mlops.cluster.model import WorkerRecord
+from mlops.common.model import Resources
+
+
+class WorkerSchedulerBase(ABC):
+    """
+    Interface for worker scheduler classes
+
+    Worker schedulers choose the worker a task is assigned to. They keep their own index of the workers,
+    the cluster updates it on every change of a worker record and on its removal.
+    """
+
+    @abstractmethod
+    def update(self, worker_record: WorkerRecord) -> None:
+        """
+        Index a new or changed worker record
+
+        :param worker_record: WorkerRecord object
+        """
+
+    @abstractmethod
+    def remove(self, worker_id: str) -> None:
+        """
+        Remove a worker from the index, if present
+
+        :param worker_id: id of worker
+        """
+
+    @abstractmethod
+    def select(self, task_type: str, requirements: Resources, dataset: str | None = None) -> str | None:
+        """
+        Choose an idle worker able to run a task
+
+        :param task_type: type of the task
+        :param requirements: the resources required by the task
+        :param dataset: digest of the input dataset of the task, see TrainingTask.dataset
+        :return: id of the worker or None if no worker can run the task, or none should yet
+        """
+
+    def get_retry_delay(self) -> float | None:
+        """
+        Seconds after which a task the scheduler declined although a worker could run it may be placed,
+        e.g. when it waits for a worker holding its data
+
+        :return: the delay, or None if only a change of the workers lets a declined task be placed
+        """
+        return None
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections.abc import Iterable
+
+from mlops.cluster.model import WorkerRecord
+from mlops.cluster.schedulers.interfaces import WorkerSchedulerBase
+from mlops.common.model import Resources
+
+
+class LocalityScheduler(WorkerSchedulerBase):
+    """
+    Scheduler assigning a task to an idle worker already holding its input dataset, see TrainingTask.dataset.
+    It's thread-safe.
+
+    Workers advertise the digests of the datasets they cache, see WorkerStatus.datasets.
+    A task goes to an idle worker caching its dataset, else to an idle worker on a host where another worker caches it,
+    e.g. sharing its cache directory. The workers holding each dataset are indexed by its digest,
+    so selecting only looks at the holders and at the workers on their hosts.
+
+    When the dataset is held by busy workers only, the task is declined until locality_wait_sec passed,
+    the time it usually takes a worker to free a slot, then placed by the fallback scheduler (delay scheduling).
+    The wait of a dataset starts when a task of it is first declined and ends when a task of it is placed locally,
+    so once the wait is over the following tasks of the dataset are not delayed again.
+    A wait is forgotten once no task of its dataset was selected for locality_wait_sec after it's over.
+    Tasks without a dataset, or whose dataset no worker of their type holds, are placed by the fallback scheduler.
+    """
+
+    _records: dict[str, WorkerRecord]  # worker id -> record
+    _holders: dict[str, dict[str, None]]  # dataset digest -> ordered set of the ids of the workers caching it
+    _host_holders: dict[str, dict[str, int]]  # dataset digest -> host -> number of workers of the host caching it
+    _host_workers: dict[str, dict[str, None]]  # host -> ordered set of worker ids
+    # dataset digest -> (time.monotonic() its tasks started waiting for a local worker, last time one was selected)
+    _waits: dict[str, tuple[float, float]]
+    _lock: threading.Lock
+
+    def __init__(self, fallback: WorkerSchedulerBase, locality_wait_sec: float = 3.):
+        """
+        :param fallback: scheduler placing the tasks without a local worker, it's kept up to date by this scheduler
+        :param locality_wait_sec: seconds a task may wait for a local worker, 0 to never wait
+        """
+        self.fallback = fallback
+        self.locality_wait_sec = locality_wait_sec
+        self._records = {}
+        self._holders = {}
+        self._host_holders = {}
+        self._host_workers = {}
+        self._waits = {}
+        self._lock = threading.Lock()
+
+    def update(self, worker_record: WorkerRecord) -> None:
+        self.fallback.update(worker_record)
+        worker_id = worker_record.status.id
+        with self._lock:
+            old_record = self._records.get(worker_id)
+            if old_record is not None:
+                if (old_record.connection.host, old_record.status.datasets) != (
+                        worker_record.connection.host, worker_record.status.datasets
+                ):
+                    self._unindex(old_record)
+                    old_record = None
+            self._records[worker_id] = worker_record
+            if old_record is None:
+                self._index(worker_record)
+
+    def remove(self, worker_id: str) -> None:
+        self.fallback.remove(worker_id)
+        with self._lock:
+            record = self._records.pop(worker_id, None)
+            if record is not None:
+                self._unindex(record)
+
+    def select(self, task_type: str, requirements: Resources, dataset: str | None = None) -> str | None:
+        if dataset is None:
+            return self.fallback.select(task_type, requirements)
+        with self._lock:
+            holders = self._holders.get(dataset, {})
+            hosts = self._host_holders.get(dataset, {})
+            busy = False
+            for worker_ids in (holders, *(self._host_workers[host] for host in hosts)):
+                for worker_id in worker_ids:
+                    record = self._records[worker_id]
+                    if record.status.task_type != task_type or not record.status.healthy:
+                        continue
+                    if record.can_run(requirements):
+                        self._waits.pop(dataset, None)
+                        return worker_id
+                    busy = True
+            if busy and self.locality_wait_sec > 0:
+                now = time.monotonic()
+                started, _ = self._waits.get(dataset, (now, now))
+                self._waits[dataset] = (started, now)
+                if now - started < self.locality_wait_sec:
+                    return None
+        return self.fallback.select(task_type, requirements)
+
+    def get_retry_delay(self) -> float | None:
+        fallback_delay = self.fallback.get_retry_delay()
+        now = time.monotonic()
+        with self._lock:
+            # The waits over and unused since, e.g. of the datasets whose tasks all went to the fallback
+            for dataset in [
+                dataset for dataset, (_, selected) in self._waits.items() if selected + self.locality_wait_sec <= now
+            ]:
+                del self._waits[dataset]
+            delays = [
+                started + self.locality_wait_sec - now
+                for started, _ in self._waits.values()
+                if started + self.locality_wait_sec > now
+            ]
+        if fallback_delay is not None:
+            delays.append(fallback_delay)
+        return min(delays, default=None)
+
+    def get_holders(self, dataset: str) -> list[str]:
+        """
+        :param dataset: digest of a dataset
+        :return: ids of the workers caching the dataset
+        """
+        with self._lock:
+            return list(self._holders.get(dataset, ()))
+
+    def _index(self, record: WorkerRecord) -> None:
+        worker_id = record.status.id
+        host = record.connection.host
+        self._host_workers.setdefault(host, {})[worker_id] = None
+        for dataset in _unique(record.status.datasets):
+            self._holders.setdefault(dataset, {})[worker_id] = None
+            hosts = self._host_holders.setdefault(dataset, {})
+            hosts[host] = hosts.get(host, 0) + 1
+
+    def _unindex(self, record: WorkerRecord) -> None:
+        worker_id = record.status.id
+        host = record.connection.host
+        workers = self._host_workers[host]
+        del workers[worker_id]
+        if not workers:
+            del self._host_workers[host]
+        for dataset in _unique(record.status.datasets):
+            holders = self._holders[dataset]
+            del holders[worker_id]
+            if not holders:
+                del self._holders[dataset]
+            hosts = self._host_holders[dataset]
+            hosts[host] -= 1
+            if not hosts[host]:
+                del hosts[host]
+            if not hosts:
+                del self._host_holders[dataset]
+
+
+def _unique(datasets: Iterable[str]) -> dict[str, None]:
+    return dict.fromkeys(datasets)
@@ -0,0 +1,227 @@
+import uuid
+from collections.abc import Mapping, Sequence
+
+from readerwriterlock import rwlock
+
+from mlops.cluster.hash_ring import HashRing
+from mlops.cluster.interfaces import WorkerClusterBase
+from mlops.cluster.model import TaskAssignment, TaskAssignmentResult
+from mlops.cluster.status_hub import WorkerStatusHub, WorkerStatusSubscription
+from mlops.cluster.worker_cluster import WorkerCluster
+from mlops.common.exc import RepoNotFoundError
+from mlops.common.model import WorkerStatus, TrainingStatus, WorkerData
+
+
+class ShardedWorkerCluster(WorkerClusterBase):
+    """
+    Routing layer over cluster shards, each shard owning the workers whose id it holds on a consistent hash ring
+
+    The router chooses the id of a checking in worker, and the worker is checked in to the shard owning the id,
+    so the reports of a worker are routed by its id without any lookup table.
+    Training tasks are forwarded or scattered across the shards:
+    an assignment tries the shards clockwise from the task id until one has a free worker,
+    a queued task waits in the first shard clockwise from its id with an idle worker of its type, else with a worker
+    of its type, else in the shard owning its id, and is only dispatched to the workers of that shard,
+    and status lookups and pauses ask every shard.
+
+    Adding or removing a shard moves only the workers whose owner changed on the ring, with their slots,
+    the other workers stay where they are. The tasks queued in a shard left without a worker of their type
+    are queued again, as well as the tasks of a removed shard.
+    The shards must publish to the status hub of the router, which watchers subscribe to.
+    It's thread-safe.
+    """
+
+    _shards: dict[str, WorkerCluster]
+    _ring: HashRing
+    _lock: rwlock.RWLockFair  # routing holds the read lock, adding or removing a shard the write lock
+
+    def __init__(self, shards: Mapping[str, WorkerCluster], status_hub: WorkerStatusHub, replicas: int = 64):
+        """
+        :param shards: shard id -> cluster of the shard
+        :param status_hub: the status hub the shards publish to
+        :param replicas: number of points of each shard on the ring
+        """
+        self.status_hub = status_hub
+        self._shards = {}
+        self._ring = HashRing(replicas)
+        self._lock = rwlock.RWLockFair()
+        for shard_id, shard in shards.items():
+            self._check_shard(shard)
+            self._shards[shard_id] = shard
+            self._ring.add(shard_id)
+
+    def get_workers_status(self) -> list[WorkerStatus]:
+        with self._lock.gen_rlock():
+            return [status for shard in self._shards.values() for status in shard.get_workers_status()]
+
+    def get_worker_status(self, worker_id: str) -> WorkerStatus | None:
+        with self._lock.gen_rlock():
+            return self._get_owner(worker_id).get_worker_status(worker_id)
+
+    def watch_workers_status(self, worker_id: str | None = None) -> WorkerStatusSubscription:
+        return self.status_hub.subscribe(worker_id)
+
+    def assign_training_task(self, task_id: int) -> WorkerStatus | None:
+        with self._lock.gen_rlock():
+            for shard_id in self._ring.walk(str(task_id)):
+                status = self._shards[shard_id].assign_training_task(task_id)
+                if status is not None:
+                    return status
+        return None
+
+    def assign_training_tasks(self, task_ids: Sequence[int]) -> list[TaskAssignment]:
+        task_ids = list(dict.fromkeys(task_ids))
+        if not task_ids:
+            return []
+
+        assignments: dict[int, TaskAssignment] = {}
+        remaining = task_ids
+        with self._lock.gen_rlock():
+            # The tasks no shard so far had a worker for are passed on to the next shard
+            for shard_id in self._ring.walk(str(task_ids[0])):
+                unassigned = []
+                for assignment in self._shards[shard_id].assign_training_tasks(remaining):
+                    assignments[assignment.task_id] = assignment
+                    if assignment.result == TaskAssignmentResult.NO_WORKER_AVAILABLE:
+                        unassigned.append(assignment.task_id)
+                remaining = unassigned
+                if not remaining:
+                    break
+        return [
+            assignments.get(task_id, TaskAssignment(task_id, TaskAssignmentResult.NO_WORKER_AVAILABLE))
+            for task_id in task_ids
+        ]
+
+    def enqueue_training_task(self, task_id: int, priority: int = 0) -> int | None:
+        with self._lock.gen_rlock():
+            return self._enqueue(task_id, priority)
+
+    def get_training_status(self, task_id: int) -> TrainingStatus | None:
+        with self._lock.gen_rlock():
+            for shard in self._shards.values():
+                status = shard.get_training_status(task_id)
+                if status is not None:
+                    return status
+        return None
+
+    def pause_training_task(self, task_id: int) -> None:
+        with self._lock.gen_rlock():
+            for shard in self._shards.values():
+                shard.pause_training_task(task_id)
+
+    def check_in(self, worker_data: WorkerData) -> str:
+        worker_id = str(uuid.uuid4())
+        with self._lock.gen_rlock():
+            return self._get_owner(worker_id).check_in(worker_data, worker_id=worker_id)
+
+    def report_status(self, worker_status: WorkerStatus) -> None:
+        with self._lock.gen_rlock():
+            self._get_owner(worker_status.id).report_status(worker_status)
+
+    def report_training_status(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> None:
+        with self._lock.gen_rlock():
+            self._get_owner(worker_id).report_training_status(worker_id, training_status, task_id)
+
+    def add_shard(self, shard_id: str, shard: WorkerCluster) -> int:
+        """
+        Add a shard and move to it the workers it now owns, and the queued tasks the other shards have no worker for
+
+        :param shard_id: the shard id
+        :param shard: cluster of the shard
+        :return: number of workers moved
+        """
+        self._check_shard(shard)
+        with self._lock.gen_wlock():
+            if shard_id in self._shards:
+                raise ValueError(f'shard {shard_id} already exists')
+            self._shards[shard_id] = shard
+            self._ring.add(shard_id)
+            sources = [source for source in self._shards.values() if source is not shard]
+            moved = sum(self._rebalance(source) for source in sources)
+            for source in sources:
+                self._move_pending(source)
+            return moved
+
+    def remove_shard(self, shard_id: str) -> WorkerCluster:
+        """
+        Remove a shard and move its workers and its queued tasks to their new owners
+
+        The dispatcher of the shard is closed, the shard is left empty but its other threads are not closed.
+
+        :param shard_id: the shard id
+        :return: cluster of the removed shard
+        """
+        with self._lock.gen_wlock():
+            if len(self._shards) == 1 and shard_id in self._shards:
+                raise ValueError('can not remove the last shard')
+            shard = self._shards.pop(shard_id)
+            self._ring.remove(shard_id)
+            shard.dispatcher.close()  # A task popped by the dispatcher is queued again or assigned once closed
+            self._rebalance(shard)
+            for pending in shard.pending_tasks.drain():
+                self._enqueue(pending.task_id, pending.priority)
+            return shard
+
+    def close(self) -> None:
+        """
+        Close every shard
+        """
+        with self._lock.gen_wlock():
+            for shard in self._shards.values():
+                shard.close()
+
+    def _rebalance(self, source: WorkerCluster) -> int:
+        """
+        Move the workers of a shard which another shard owns, the caller must hold the write lock
+
+        :return: number of workers moved
+        """
+        moved = 0
+        for status in source.get_workers_status():
+            target = self._get_owner(status.id)
+            if target is source:
+                continue
+            record = source.detach_worker(status.id)
+            if record is not None:
+                target.attach_worker(record)
+                moved += 1
+        return moved
+
+    def _move_pending(self, source: WorkerCluster) -> None:
+        """
+        Queue again the tasks of a shard which no longer has a worker of their type, the caller must hold the write lock
+        """
+        moved = []
+        for task_type in source.pending_tasks.get_types():
+            if not source.has_worker(task_type):
+                while (pending := source.pending_tasks.pop(task_type)) is not None:
+                    moved.append(pending)
+        for pending in moved:
+            self._enqueue(pending.task_id, pending.priority)
+
+    def _enqueue(self, task_id: int, priority: int) -> int | None:
+        """
+        Queue a task in the first shard which can dispatch it, the caller must hold the lock
+        """
+        shards = [self._shards[shard_id] for shard_id in self._ring.walk(str(task_id))]
+        try:
+            task_type = shards[0].task_repo.get_by_id(task_id).task_type
+        except RepoNotFoundError:
+            return None
+        for idle in (True, False):
+            for shard in shards:
+                if shard.has_worker(task_type, idle):
+                    return shard.enqueue_training_task(task_id, priority)
+        return shards[0].enqueue_training_task(task_id, priority)
+
+    def _get_owner(self, key: str) -> WorkerCluster:
+        return self._shards[self._ring.get(key)]
+
+    def _check_shard(self, shard: WorkerCluster) -> None:
+        if shard.status_hub is not self.status_hub:
+            raise ValueError('the shards must publish to the status hub of the router')
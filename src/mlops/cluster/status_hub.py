@@ -0,0 +1,226 @@
+import asyncio
+import threading
+from collections import deque
+from enum import Enum
+from typing import NamedTuple, TypeVar
+
+from mlops.common.model import WorkerStatus, TrainingStatus
+
+__ALL__ = [
+    'WorkerStatusEventType', 'WorkerStatusEvent', 'WorkerStatusSubscription', 'AsyncWorkerStatusSubscription',
+    'WorkerStatusHub'
+]
+
+
+class WorkerStatusEventType(Enum):
+    STATUS_CHANGED = 'status_changed'
+    TRAINING_STATUS_CHANGED = 'training_status_changed'
+    WORKER_REMOVED = 'worker_removed'
+    LAGGED = 'lagged'  # Events were dropped because the subscriber was too slow, it should resync from a snapshot
+
+
+class WorkerStatusEvent(NamedTuple):
+    type: WorkerStatusEventType
+    worker_id: str
+    status: WorkerStatus | None = None
+    training_status: TrainingStatus | None = None
+    task_id: int | None = None  # set for TRAINING_STATUS_CHANGED
+
+
+class WorkerStatusSubscription:
+    """
+    A subscription to worker status events
+
+    Events are buffered in a bounded queue. When the queue is full, the buffered events are dropped
+    and the next get returns a LAGGED event first, so a slow subscriber never blocks the publisher.
+    """
+
+    worker_id: str | None
+    max_queue_size: int
+    _events: deque[WorkerStatusEvent]
+    _lagged: bool
+    _closed: bool
+    _cond: threading.Condition
+
+    def __init__(self, hub: 'WorkerStatusHub', worker_id: str | None, max_queue_size: int):
+        self.worker_id = worker_id
+        self.max_queue_size = max_queue_size
+        self._hub = hub
+        self._events = deque()
+        self._lagged = False
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get(self, timeout: float | None = None) -> list[WorkerStatusEvent] | None:
+        """
+        Wait for events
+
+        :param timeout: seconds to wait, wait forever if None
+        :return: the buffered events, an empty list on timeout or None if the subscription is closed
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._events or self._lagged or self._closed, timeout)
+            return self._drain()
+
+    def close(self) -> None:
+        """
+        Unsubscribe and wake up the waiting consumer
+        """
+        self._hub.unsubscribe(self)
+        with self._cond:
+            self._closed = True
+            self._notify()
+
+    def _put(self, event: WorkerStatusEvent) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._events) >= self.max_queue_size:
+                self._events.clear()
+                self._lagged = True
+            else:
+                self._events.append(event)
+            self._notify()
+
+    def _drain(self) -> list[WorkerStatusEvent] | None:
+        if self._closed:
+            return None
+        events = []
+        if self._lagged:
+            events.append(WorkerStatusEvent(type=WorkerStatusEventType.LAGGED, worker_id=self.worker_id or ''))
+            self._lagged = False
+        events.extend(self._events)
+        self._events.clear()
+        return events
+
+    def _notify(self) -> None:
+        self._cond.notify_all()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncWorkerStatusSubscription(WorkerStatusSubscription):
+    """
+    A subscription to worker status events consumed from an event loop
+
+    Events may be published from any thread.
+    """
+
+    def __init__(self, hub: 'WorkerStatusHub', worker_id: str | None, max_queue_size: int):
+        super().__init__(hub, worker_id, max_queue_size)
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    async def get_async(self) -> list[WorkerStatusEvent] | None:
+        """
+        Wait for events
+
+        :return: the buffered events or None if the subscription is closed
+        """
+        while True:
+            self._ready.clear()
+            with self._cond:
+                events = self._drain()
+            if events is None or events:
+                return events
+            await self._ready.wait()
+
+    def _notify(self) -> None:
+        if not self._ready.is_set():
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+
+SubscriptionType = TypeVar('SubscriptionType', bound=WorkerStatusSubscription)
+
+
+class WorkerStatusHub:
+    """
+    Fan out worker status events to subscribers watching all workers or a specific worker
+
+    It's thread-safe.
+    """
+
+    DEFAULT_MAX_QUEUE_SIZE = 1024
+
+    _subscribers: set[WorkerStatusSubscription]  # subscribers watching all workers
+    _worker_subscribers: dict[str, set[WorkerStatusSubscription]]  # worker id -> subscribers watching it
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._subscribers = set()
+        self._worker_subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(
+            self,
+            worker_id: str | None = None,
+            max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE
+    ) -> WorkerStatusSubscription:
+        """
+        Subscribe to worker status events
+
+        :param worker_id: watch only this worker, or all workers if None
+        :param max_queue_size: maximum number of events buffered for the subscriber
+        :return: WorkerStatusSubscription object, close it to unsubscribe
+        """
+        return self._add(WorkerStatusSubscription(self, worker_id, max_queue_size))
+
+    def subscribe_async(
+            self,
+            worker_id: str | None = None,
+            max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE
+    ) -> AsyncWorkerStatusSubscription:
+        """
+        Subscribe to worker status events from the running event loop
+
+        :param worker_id: watch only this worker, or all workers if None
+        :param max_queue_size: maximum number of events buffered for the subscriber
+        :return: AsyncWorkerStatusSubscription object, close it to unsubscribe
+        """
+        return self._add(AsyncWorkerStatusSubscription(self, worker_id, max_queue_size))
+
+    def unsubscribe(self, subscription: WorkerStatusSubscription) -> None:
+        """
+        Remove a subscriber, prefer closing the subscription
+
+        :param subscription: WorkerStatusSubscription object
+        """
+        with self._lock:
+            if subscription.worker_id is None:
+                self._subscribers.discard(subscription)
+                return
+            subscribers = self._worker_subscribers.get(subscription.worker_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._worker_subscribers[subscription.worker_id]
+
+    def publish(self, event: WorkerStatusEvent) -> None:
+        """
+        Publish an event to the subscribers, never blocks on slow subscribers
+
+        :param event: WorkerStatusEvent object
+        """
+        with self._lock:
+            if not self._subscribers and not self._worker_subscribers:
+                return
+            subscribers = [*self._subscribers, *self._worker_subscribers.get(event.worker_id, ())]
+        for subscriber in subscribers:
+            subscriber._put(event)
+
+    def _add(self, subscription: SubscriptionType) -> SubscriptionType:
+        with self._lock:
+            if subscription.worker_id is None:
+                self._subscribers.add(subscription)
+            else:
+                self._worker_subscribers.setdefault(subscription.worker_id, set()).add(subscription)
+        return subscription
@@ -0,0 +1,128 @@
+import itertools
+
+from readerwriterlock import rwlock
+
+from mlops.cluster.model import WorkerRecord
+from mlops.cluster.storages.interfaces import WorkerStorageBase
+
+
+class IndexedMemoryWorkerStorage(WorkerStorageBase):
+    """
+    In-memory storage for worker status with per task type indexes.
+    It's thread-safe.
+
+    Healthy workers are indexed into idle and busy sets by task type, unhealthy workers are kept in their own set.
+    A worker is idle while it has a free slot.
+    The workers of each task type are counted, healthy or not.
+    The indexes are updated on every change, so looking up an idle worker, counting the workers of a type and
+    cleaning up unhealthy workers do not need to scan all the workers.
+    """
+
+    _workers: dict[str, WorkerRecord]
+    _keys: dict[str, tuple[str, bool, bool]]  # worker id -> (task type, healthy, busy) it's indexed by
+    _idle: dict[str, dict[str, None]]  # task type -> ordered set of worker ids
+    _busy: dict[str, dict[str, None]]  # task type -> ordered set of worker ids
+    _unhealthy: set[str]
+    _counts: dict[str, int]  # task type -> number of workers
+    _lock: rwlock.RWLockFair
+
+    def __init__(self):
+        self._workers = {}
+        self._keys = {}
+        self._idle = {}
+        self._busy = {}
+        self._unhealthy = set()
+        self._counts = {}
+        self._lock = rwlock.RWLockFair()
+
+    def get(self, worker_id: str) -> WorkerRecord | None:
+        with self._lock.gen_rlock():
+            return self._workers.get(worker_id)
+
+    def get_all(self) -> list[WorkerRecord]:
+        with self._lock.gen_rlock():
+            return list(self._workers.values())
+
+    def save(self, worker_record: WorkerRecord):
+        worker_id = worker_record.status.id
+        key = self._index_key(worker_record)
+        with self._lock.gen_wlock():
+            self._workers[worker_id] = worker_record
+            old_key = self._keys.get(worker_id)
+            if old_key == key:
+                return  # Nothing to reindex
+            if old_key is not None:
+                self._unindex(worker_id, old_key)
+            self._index(worker_id, key)
+
+    def delete(self, worker_id: str) -> bool:
+        with self._lock.gen_wlock():
+            if self._workers.pop(worker_id, None) is None:
+                return False
+            self._unindex(worker_id, self._keys[worker_id])
+            return True
+
+    def clear(self) -> None:
+        with self._lock.gen_wlock():
+            self._workers.clear()
+            self._keys.clear()
+            self._idle.clear()
+            self._busy.clear()
+            self._unhealthy.clear()
+            self._counts.clear()
+
+    def get_first_idle_by_type(self, task_type: str) -> WorkerRecord | None:
+        with self._lock.gen_rlock():
+            idle = self._idle.get(task_type)
+            if not idle:
+                return None
+            return self._workers[next(iter(idle))]
+
+    def get_idle_by_type(self, task_type: str, limit: int) -> list[WorkerRecord]:
+        with self._lock.gen_rlock():
+            idle = self._idle.get(task_type)
+            if not idle:
+                return []
+            return [self._workers[worker_id] for worker_id in itertools.islice(idle, limit)]
+
+    def count_by_type(self, task_type: str) -> int:
+        with self._lock.gen_rlock():
+            return self._counts.get(task_type, 0)
+
+    def cleanup(self) -> None:
+        with self._lock.gen_wlock():
+            for worker_id in list(self._unhealthy):
+                del self._workers[worker_id]
+                self._unindex(worker_id, self._keys[worker_id])
+
+    @staticmethod
+    def _index_key(record: WorkerRecord) -> tuple[str, bool, bool]:
+        status = record.status
+        return status.task_type, status.healthy, status.free_slots <= 0
+
+    def _index(self, worker_id: str, key: tuple[str, bool, bool]) -> None:
+        task_type, healthy, busy = key
+        self._keys[worker_id] = key
+        self._counts[task_type] = self._counts.get(task_type, 0) + 1
+        if not healthy:
+            self._unhealthy.add(worker_id)
+        elif busy:
+            self._busy.setdefault(task_type, {})[worker_id] = None
+        else:
+            self._idle.setdefault(task_type, {})[worker_id] = None
+
+    def _unindex(self, worker_id: str, key: tuple[str, bool, bool]) -> None:
+        task_type, healthy, busy = key
+        del self._keys[worker_id]
+        self._counts[task_type] -= 1
+        if not self._counts[task_type]:
+            del self._counts[task_type]
+        if not healthy:
+            self._unhealthy.discard(worker_id)
+            return
+
+        index = self._busy if busy else self._idle
+        bucket = index[task_type]
+        del bucket[worker_id]
+        if not bucket:
+            del index[task_type]
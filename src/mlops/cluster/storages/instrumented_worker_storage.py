@@ -0,0 +1,62 @@
+from mlops.cluster.metrics import STORAGE_DURATION
+from mlops.cluster.model import WorkerRecord
+from mlops.cluster.storages.interfaces import WorkerStorageBase
+from mlops.common.tracing import trace_phase
+
+
+class InstrumentedWorkerStorage(WorkerStorageBase):
+    """
+    Worker storage recording the duration of each operation of another storage in STORAGE_DURATION
+
+    The storage label is the class name of the wrapped storage.
+    The operations are also timed as the 'storage' phase of the traced call making them.
+    """
+
+    def __init__(self, storage: WorkerStorageBase):
+        self.storage = storage
+        name = type(storage).__name__
+        self._get = STORAGE_DURATION.labels(name, 'get')
+        self._get_all = STORAGE_DURATION.labels(name, 'get_all')
+        self._save = STORAGE_DURATION.labels(name, 'save')
+        self._delete = STORAGE_DURATION.labels(name, 'delete')
+        self._clear = STORAGE_DURATION.labels(name, 'clear')
+        self._get_first_idle_by_type = STORAGE_DURATION.labels(name, 'get_first_idle_by_type')
+        self._get_idle_by_type = STORAGE_DURATION.labels(name, 'get_idle_by_type')
+        self._count_by_type = STORAGE_DURATION.labels(name, 'count_by_type')
+        self._cleanup = STORAGE_DURATION.labels(name, 'cleanup')
+
+    def get(self, worker_id: str) -> WorkerRecord | None:
+        with self._get.time(), trace_phase('storage'):
+            return self.storage.get(worker_id)
+
+    def get_all(self) -> list[WorkerRecord]:
+        with self._get_all.time(), trace_phase('storage'):
+            return self.storage.get_all()
+
+    def save(self, worker_record: WorkerRecord):
+        with self._save.time(), trace_phase('storage'):
+            return self.storage.save(worker_record)
+
+    def delete(self, worker_id: str) -> bool:
+        with self._delete.time(), trace_phase('storage'):
+            return self.storage.delete(worker_id)
+
+    def clear(self) -> None:
+        with self._clear.time(), trace_phase('storage'):
+            self.storage.clear()
+
+    def get_first_idle_by_type(self, worker_type: str) -> WorkerRecord | None:
+        with self._get_first_idle_by_type.time(), trace_phase('storage'):
+            return self.storage.get_first_idle_by_type(worker_type)
+
+    def get_idle_by_type(self, worker_type: str, limit: int) -> list[WorkerRecord]:
+        with self._get_idle_by_type.time(), trace_phase('storage'):
+            return self.storage.get_idle_by_type(worker_type, limit)
+
+    def count_by_type(self, worker_type: str) -> int:
+        with self._count_by_type.time(), trace_phase('storage'):
+            return self.storage.count_by_type(worker_type)
+
+    def cleanup(self) -> None:
+        with self._cleanup.time(), trace_phase('storage'):
+            self.storage.cleanup()
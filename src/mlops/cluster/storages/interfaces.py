@@ -55,10 +55,31 @@ class WorkerStorageBase(ABC):
         """
         Get first idle worker by worker type
 
+        A worker is idle if it's healthy and has a free slot, see WorkerStatus.free_slots
+
         :param worker_type: type of worker
         :return: WorkerStatus object if idle worker exists, None otherwise
         """
 
+    @abstractmethod
+    def get_idle_by_type(self, worker_type: str, limit: int) -> list[WorkerRecord]:
+        """
+        Get idle workers by worker type
+
+        :param worker_type: type of worker
+        :param limit: maximum number of workers to return
+        :return: list of idle WorkerRecord objects, in the order get_first_idle_by_type would return them
+        """
+
+    @abstractmethod
+    def count_by_type(self, worker_type: str) -> int:
+        """
+        Count the workers of a type, healthy or not
+
+        :param worker_type: type of worker
+        :return: number of workers
+        """
+
     @abstractmethod
     def cleanup(self) -> None:
         """
@@ -30,10 +30,23 @@ class MemoryWorkerStorage(WorkerStorageBase):
     def get_first_idle_by_type(self, task_type: str) -> WorkerRecord | None:
         for worker in self.workers.values():
             status = worker.status
-            if status.healthy and status.has_task is False and status.task_type == task_type:
+            if status.healthy and status.free_slots > 0 and status.task_type == task_type:
                 return worker
         return None
 
+    def get_idle_by_type(self, task_type: str, limit: int) -> list[WorkerRecord]:
+        workers = []
+        for worker in self.workers.values():
+            if len(workers) >= limit:
+                break
+            status = worker.status
+            if status.healthy and status.free_slots > 0 and status.task_type == task_type:
+                workers.append(worker)
+        return workers
+
+    def count_by_type(self, task_type: str) -> int:
+        return sum(worker.status.task_type == task_type for worker in self.workers.values())
+
     def cleanup(self):
         for worker_id in list(self.workers.keys()):
             if not self.workers[worker_id].status.healthy:
@@ -0,0 +1,267 @@
+import logging
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from itertools import islice
+from typing import Any
+
+from sqlalchemy import JSON, Column, DateTime, Engine, MetaData, String, Table, bindparam, delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from mlops.cluster.model import WorkerRecord, WorkerConnectionInfo, SlotTask
+from mlops.cluster.storages.indexed_memory_worker_storage import IndexedMemoryWorkerStorage
+from mlops.cluster.storages.interfaces import WorkerStorageBase
+from mlops.common.exc import RepoError
+from mlops.common.model import WorkerStatus, TrainingStatus, Resources
+
+__ALL__ = ['metadata', 'workers_table', 'SQLAlchemyWorkerStorage']
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+workers_table = Table(
+    'workers',
+    metadata,
+    Column('worker_id', String(64), primary_key=True),
+    Column('record', JSON, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+)
+
+
+class SQLAlchemyWorkerStorage(WorkerStorageBase):
+    """
+    Worker storage persisted to a SQL database through SQLAlchemy core, with an in-memory hot copy.
+    It's thread-safe.
+
+    Reads and idle lookups are served by the hot copy, an IndexedMemoryWorkerStorage by default.
+    Writes update the hot copy at once and are written behind: only the last change of each worker is kept,
+    and a flush thread writes the changes every flush_interval_sec seconds in a single transaction,
+    so status reports do not wait for the database. A flush starts early when max_pending workers are changed.
+    Changes not flushed yet are lost if the process dies, close flushes them.
+
+    After a restart, load reads the workers back and WorkerCluster.restore_workers takes them over.
+    """
+
+    MAX_IDS_PER_QUERY = 1000
+
+    _pending: dict[str, WorkerRecord | None]  # worker id -> last record saved, None if deleted, since the last flush
+    _cleared: bool  # if the table must be emptied by the next flush
+    _pending_lock: threading.Lock
+    _flush_lock: threading.Lock  # flushes are applied in order
+    _wake_event: threading.Event
+    _close_event: threading.Event
+    _flush_thread: threading.Thread
+
+    def __init__(
+            self,
+            engine: Engine,
+            hot_storage: WorkerStorageBase | None = None,
+            flush_interval_sec: float = 1.,
+            max_pending: int = 10000
+    ):
+        """
+        :param engine: SQLAlchemy engine of the database
+        :param hot_storage: empty in-memory storage serving the reads, an IndexedMemoryWorkerStorage if None
+        :param flush_interval_sec: seconds between two flushes
+        :param max_pending: number of changed workers starting a flush before the interval ends
+        """
+        self.engine = engine
+        self.hot_storage = hot_storage if hot_storage is not None else IndexedMemoryWorkerStorage()
+        self.flush_interval_sec = flush_interval_sec
+        self.max_pending = max_pending
+        self._pending = {}
+        self._cleared = False
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._select_stmt = select(workers_table)
+        self._insert_stmt = insert(workers_table)
+        self._delete_stmt = delete(workers_table).where(
+            workers_table.c.worker_id.in_(bindparam('worker_ids', expanding=True))
+        )
+        self._clear_stmt = delete(workers_table)
+        self._wake_event = threading.Event()
+        self._close_event = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+
+    def create_tables(self) -> None:
+        """
+        Create the tables used by the storage if they do not exist
+        """
+        metadata.create_all(self.engine)
+
+    def load(self) -> int:
+        """
+        Replace the hot copy with the workers persisted in the database
+
+        :return: number of workers loaded
+        """
+        try:
+            with self.engine.connect() as conn:
+                records = [_to_record(row.record) for row in conn.execute(self._select_stmt)]
+        except SQLAlchemyError as e:
+            raise RepoError('failed to load workers') from e
+
+        with self._pending_lock:
+            self._pending.clear()
+            self._cleared = False
+            self.hot_storage.clear()
+            for record in records:
+                self.hot_storage.save(record)
+        return len(records)
+
+    def get(self, worker_id: str) -> WorkerRecord | None:
+        return self.hot_storage.get(worker_id)
+
+    def get_all(self) -> list[WorkerRecord]:
+        return self.hot_storage.get_all()
+
+    def save(self, worker_record: WorkerRecord):
+        with self._pending_lock:
+            self.hot_storage.save(worker_record)
+            self._pending[worker_record.status.id] = worker_record
+            pending = len(self._pending)
+        if pending >= self.max_pending:
+            self._wake_event.set()
+
+    def delete(self, worker_id: str) -> bool:
+        with self._pending_lock:
+            if not self.hot_storage.delete(worker_id):
+                return False
+            self._pending[worker_id] = None
+            return True
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self.hot_storage.clear()
+            self._pending.clear()
+            self._cleared = True
+
+    def get_first_idle_by_type(self, worker_type: str) -> WorkerRecord | None:
+        return self.hot_storage.get_first_idle_by_type(worker_type)
+
+    def get_idle_by_type(self, worker_type: str, limit: int) -> list[WorkerRecord]:
+        return self.hot_storage.get_idle_by_type(worker_type, limit)
+
+    def count_by_type(self, worker_type: str) -> int:
+        return self.hot_storage.count_by_type(worker_type)
+
+    def cleanup(self) -> None:
+        for record in self.hot_storage.get_all():
+            if not record.status.healthy:
+                self.delete(record.status.id)
+
+    def flush(self) -> int:
+        """
+        Write the pending changes in a single transaction
+
+        The changes are kept pending if the transaction fails, unless the workers changed again since.
+
+        :return: number of workers written
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                cleared, self._cleared = self._cleared, False
+            if not pending and not cleared:
+                return 0
+
+            now = datetime.now()
+            rows = [
+                {'worker_id': worker_id, 'record': _to_values(record), 'updated_at': now}
+                for worker_id, record in pending.items()
+                if record is not None
+            ]
+            try:
+                with self.engine.begin() as conn:
+                    if cleared:
+                        conn.execute(self._clear_stmt)
+                    # Saved workers are deleted then inserted again, which works on every database
+                    worker_ids = iter(pending)
+                    while chunk := list(islice(worker_ids, self.MAX_IDS_PER_QUERY)):
+                        conn.execute(self._delete_stmt, {'worker_ids': chunk})
+                    if rows:
+                        conn.execute(self._insert_stmt, rows)
+            except SQLAlchemyError as e:
+                with self._pending_lock:
+                    self._pending = {**pending, **self._pending}
+                    self._cleared = self._cleared or cleared
+                raise RepoError('failed to write workers') from e
+            return len(pending)
+
+    def close(self) -> None:
+        """
+        Stop the flush thread and flush the pending changes
+        """
+        self._close_event.set()
+        self._wake_event.set()
+        self._flush_thread.join()
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._close_event.is_set():
+            self._wake_event.wait(self.flush_interval_sec)
+            self._wake_event.clear()
+            if self._close_event.is_set():
+                return  # close flushes
+            try:
+                self.flush()
+            except RepoError:
+                logger.exception('failed to flush workers, retrying at the next flush')
+
+
+def _to_values(record: WorkerRecord) -> dict[str, Any]:
+    status = asdict(record.status)
+    status['joined_at'] = _to_iso(record.status.joined_at)
+    status['created_at'] = _to_iso(record.status.created_at)
+    return {
+        'status': status,
+        'connection': record.connection._asdict(),
+        'tasks': [
+            {
+                'task_id': task.task_id,
+                'running': task.running,
+                'training_status': asdict(task.training_status) if task.training_status is not None else None,
+                'requirements': task.requirements._asdict(),
+                'started': task.started,
+            }
+            for task in record.tasks
+        ],
+        'capacity': record.capacity._asdict() if record.capacity is not None else None,
+    }
+
+
+def _to_record(values: dict[str, Any]) -> WorkerRecord:
+    status = values['status']
+    capacity = values['capacity']
+    return WorkerRecord(
+        status=WorkerStatus(**{
+            **status,
+            'joined_at': _from_iso(status['joined_at']),
+            'created_at': _from_iso(status['created_at']),
+            'datasets': tuple(status.get('datasets', ())),
+        }),
+        connection=WorkerConnectionInfo(**values['connection']),
+        tasks=tuple(
+            SlotTask(
+                task_id=task['task_id'],
+                running=task['running'],
+                training_status=(
+                    TrainingStatus(**task['training_status']) if task['training_status'] is not None else None
+                ),
+                requirements=Resources(**task['requirements']),
+                started=task.get('started', True),  # Saved before it was tracked, the start is long done
+            )
+            for task in values['tasks']
+        ),
+        capacity=Resources(**capacity) if capacity is not None else None,
+    )
+
+
+def _to_iso(dt: datetime | None) -> str | None:
+    return dt.isoformat() if dt is not None else None
+
+
+def _from_iso(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
@@ -0,0 +1,153 @@
+import heapq
+import itertools
+import threading
+from typing import NamedTuple
+
+from mlops.cluster.metrics import PENDING_TASKS
+
+
+class PendingTask(NamedTuple):
+    sort_key: tuple[int, int]  # (-priority, sequence), smaller is dispatched first
+    task_id: int
+    task_type: str
+    priority: int
+
+
+class PendingTaskQueue:
+    """
+    Priority queues of pending training tasks, one per task type
+
+    Tasks with a higher priority are dispatched first, tasks with the same priority in FIFO order.
+    Pushing and popping are O(log n), removing a task is O(1) and its heap entry is skipped lazily.
+    The depth of each type is exported as the PENDING_TASKS gauge.
+    It's thread-safe.
+    """
+
+    _heaps: dict[str, list[tuple[tuple[int, int], int]]]  # task type -> heap of (sort key, task id)
+    _tasks: dict[int, PendingTask]  # task id -> the live entry of the task
+    _depths: dict[str, int]  # task type -> number of live entries
+    _counter: itertools.count
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._heaps = {}
+        self._tasks = {}
+        self._depths = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def push(self, task_id: int, task_type: str, priority: int = 0) -> int:
+        """
+        Queue a task, or update its priority if it's already queued
+
+        :param task_id: the training task id
+        :param task_type: type of the task
+        :param priority: higher is dispatched first
+        :return: number of pending tasks of the same type
+        """
+        return self.requeue(PendingTask(
+            sort_key=(-priority, next(self._counter)),
+            task_id=task_id,
+            task_type=task_type,
+            priority=priority
+        ))
+
+    def requeue(self, task: PendingTask) -> int:
+        """
+        Put back a popped task at its original position
+
+        :param task: PendingTask object returned by pop
+        :return: number of pending tasks of the same type
+        """
+        with self._lock:
+            old_task = self._tasks.get(task.task_id)
+            if old_task is not None:
+                self._decrement(old_task.task_type)
+            self._tasks[task.task_id] = task
+            self._depths[task.task_type] = self._depths.get(task.task_type, 0) + 1
+            PENDING_TASKS.labels(task.task_type).inc()
+            heapq.heappush(self._heaps.setdefault(task.task_type, []), (task.sort_key, task.task_id))
+            return self._depths[task.task_type]
+
+    def pop(self, task_type: str) -> PendingTask | None:
+        """
+        Take the next task of a type
+
+        :param task_type: type of the task
+        :return: PendingTask object or None if no task of this type is pending
+        """
+        with self._lock:
+            heap = self._heaps.get(task_type)
+            while heap:
+                sort_key, task_id = heapq.heappop(heap)
+                task = self._tasks.get(task_id)
+                if task is not None and task.sort_key == sort_key:
+                    del self._tasks[task_id]
+                    self._decrement(task_type)
+                    return task
+            self._heaps.pop(task_type, None)
+            return None
+
+    def remove(self, task_id: int) -> bool:
+        """
+        Remove a task from the queue
+
+        :param task_id: the training task id
+        :return: True if the task was pending, False otherwise
+        """
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task is None:
+                return False
+            self._decrement(task.task_type)
+            return True
+
+    def drain(self) -> list[PendingTask]:
+        """
+        Take every pending task, e.g. to queue them elsewhere
+
+        :return: list of PendingTask objects, in the order they would be dispatched within each type
+        """
+        with self._lock:
+            tasks = sorted(self._tasks.values())
+            for task in tasks:
+                self._decrement(task.task_type)
+            self._tasks.clear()
+            self._heaps.clear()
+            return tasks
+
+    def get(self, task_id: int) -> PendingTask | None:
+        """
+        Get a pending task
+
+        :param task_id: the training task id
+        :return: PendingTask object or None if the task is not pending
+        """
+        return self._tasks.get(task_id)
+
+    def get_types(self) -> list[str]:
+        """
+        :return: the types of the pending tasks
+        """
+        with self._lock:
+            return list(self._depths)
+
+    def depth(self, task_type: str) -> int:
+        """
+        Get the number of pending tasks of a type
+
+        :param task_type: type of the task
+        :return: number of pending tasks
+        """
+        return self._depths.get(task_type, 0)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def _decrement(self, task_type: str) -> None:
+        PENDING_TASKS.labels(task_type).dec()
+        depth = self._depths[task_type] - 1
+        if depth:
+            self._depths[task_type] = depth
+        else:
+            del self._depths[task_type]
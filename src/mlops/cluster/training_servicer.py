@@ -1,38 +1,132 @@
+from collections.abc import Iterator
+
+import grpc
+from google.protobuf import empty_pb2
+
+from mlops.cluster.interfaces import WorkerClusterTrainingControllerBase
+from mlops.cluster.codec import to_raw_worker_status_event, to_raw_snapshot_events, to_raw_task_assignment
+from mlops.cluster.status_hub import WorkerStatusEventType
+from mlops.common.codec import to_raw_worker_status, to_raw_worker_statuses, to_raw_training_status
+from mlops.common.exc import RepoNotFoundError
+from mlops.common.grpc_metrics import instrument_servicer
 from mlops.protos import worker_cluster_pb2_grpc, worker_cluster_pb2, messages_pb2
 
 
+@instrument_servicer('WorkerClusterTraining')
 class WorkerClusterTrainingServicer(worker_cluster_pb2_grpc.WorkerClusterTrainingServicer):
+    def __init__(self, cluster: WorkerClusterTrainingControllerBase):
+        self.cluster = cluster
+
     def GetWorkersStatus(
             self,
             request,
-            context
+            context: grpc.ServicerContext
     ) -> worker_cluster_pb2.GetWorkersStatusResponse:
-        return super().GetWorkersStatus(request, context)
+        return worker_cluster_pb2.GetWorkersStatusResponse(
+            statuses=to_raw_worker_statuses(self.cluster.get_workers_status())
+        )
 
     def GetWorkerStatus(
             self,
             request: worker_cluster_pb2.GetWorkerStatusRequest,
-            context
+            context: grpc.ServicerContext
     ) -> messages_pb2.WorkerStatus:
-        return super().GetWorkerStatus(request, context)
+        status = self.cluster.get_worker_status(request.worker_id)
+        if status is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f'worker {request.worker_id} not found')
+        return to_raw_worker_status(status)
+
+    def WatchWorkersStatus(
+            self,
+            request,
+            context: grpc.ServicerContext
+    ) -> Iterator[worker_cluster_pb2.WorkerStatusEvent]:
+        return self._watch(None, context)
+
+    def WatchWorkerStatus(
+            self,
+            request: worker_cluster_pb2.GetWorkerStatusRequest,
+            context: grpc.ServicerContext
+    ) -> Iterator[worker_cluster_pb2.WorkerStatusEvent]:
+        return self._watch(request.worker_id, context)
 
     def AssignTrainingTask(
             self,
             request: worker_cluster_pb2.TaskRequest,
-            context
+            context: grpc.ServicerContext
     ) -> messages_pb2.WorkerStatus:
-        return super().AssignTrainingTask(request, context)
+        try:
+            status = self.cluster.assign_training_task(request.task_id)
+        except RepoNotFoundError:
+            context.abort(grpc.StatusCode.NOT_FOUND, f'task {request.task_id} not found')
+        if status is None:
+            context.abort(grpc.StatusCode.UNAVAILABLE, f'no worker available for task {request.task_id}')
+        return to_raw_worker_status(status)
+
+    def AssignTrainingTasks(
+            self,
+            request: worker_cluster_pb2.AssignTrainingTasksRequest,
+            context: grpc.ServicerContext
+    ) -> worker_cluster_pb2.AssignTrainingTasksResponse:
+        assignments = self.cluster.assign_training_tasks(request.task_ids)
+        return worker_cluster_pb2.AssignTrainingTasksResponse(
+            assignments=[to_raw_task_assignment(assignment) for assignment in assignments]
+        )
+
+    def EnqueueTrainingTask(
+            self,
+            request: worker_cluster_pb2.EnqueueTrainingTaskRequest,
+            context: grpc.ServicerContext
+    ) -> worker_cluster_pb2.EnqueueTrainingTaskResponse:
+        pending_tasks = self.cluster.enqueue_training_task(request.task_id, request.priority)
+        if pending_tasks is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f'task {request.task_id} not found')
+        return worker_cluster_pb2.EnqueueTrainingTaskResponse(pending_tasks=pending_tasks)
 
     def GetTrainingStatus(
             self,
             request: worker_cluster_pb2.TaskRequest,
-            context
+            context: grpc.ServicerContext
     ) -> messages_pb2.TrainingStatus:
-        return super().GetTrainingStatus(request, context)
+        status = self.cluster.get_training_status(request.task_id)
+        if status is None:
+            context.abort(grpc.StatusCode.NOT_FOUND, f'training status of task {request.task_id} not found')
+        return to_raw_training_status(status)
 
     def PauseTrainingTask(
             self,
             request: worker_cluster_pb2.TaskRequest,
-            context
-    ) -> None:
-        return super().PauseTrainingTask(request, context)
+            context: grpc.ServicerContext
+    ) -> empty_pb2.Empty:
+        self.cluster.pause_training_task(request.task_id)
+        return empty_pb2.Empty()
+
+    def _watch(
+            self,
+            worker_id: str | None,
+            context: grpc.ServicerContext
+    ) -> Iterator[worker_cluster_pb2.WorkerStatusEvent]:
+        # Subscribe before taking the snapshot so no change is missed
+        with self.cluster.watch_workers_status(worker_id) as subscription:
+            context.add_callback(subscription.close)  # Wake up the loop when the client goes away
+            yield from self._snapshot(worker_id, context)
+            while (events := subscription.get()) is not None:
+                for event in events:
+                    if event.type is WorkerStatusEventType.LAGGED:
+                        yield from self._snapshot(worker_id, context)
+                    else:
+                        yield to_raw_worker_status_event(event)
+
+    def _snapshot(
+            self,
+            worker_id: str | None,
+            context: grpc.ServicerContext
+    ) -> Iterator[worker_cluster_pb2.WorkerStatusEvent]:
+        if worker_id is None:
+            statuses = self.cluster.get_workers_status()
+        else:
+            status = self.cluster.get_worker_status(worker_id)
+            if status is None:
+                context.abort(grpc.StatusCode.NOT_FOUND, f'worker {worker_id} not found')
+            statuses = [status]
+        yield from to_raw_snapshot_events(statuses)
@@ -1,23 +1,41 @@
+import heapq
 import threading
 import time
 import weakref
 from abc import ABC, abstractmethod
-from datetime import datetime
+from dataclasses import dataclass
+from pathlib import Path
 from typing import NamedTuple
 
 import grpc
-from google.protobuf import empty_pb2, timestamp_pb2
+from google.protobuf import empty_pb2
 from readerwriterlock import rwlock
 
+from mlops.cluster.artifact_transfer import ArtifactTransfer
+from mlops.cluster.metrics import BRIDGE_CACHE, WORKER_CHANNELS
 from mlops.cluster.model import WorkerConnectionInfo
+from mlops.common.channel_options import ChannelOptions
+from mlops.common.codec import from_raw_worker_status
+from mlops.common.datasets import DatasetManifest
+from mlops.common.grpc_tracing import TracingClientInterceptor
+from mlops.common.metrics import CounterChild
 from mlops.common.model import WorkerStatus
 from mlops.protos import worker_pb2_grpc, messages_pb2, worker_pb2
 from mlops.worker.interfaces import WorkerControllerBase, WorkerStartOptions
 
-__ALL__ = ['WorkerBridgeBase', 'WorkerBridgeFactoryBase', 'WorkerBridge', 'WorkerBridgeFactory']
+__ALL__ = ['WorkerBridgeBase', 'WorkerBridgeFactoryBase', 'WorkerBridge', 'WorkerBridgeFactory', 'ChannelPoolStats']
 
 
 class WorkerBridgeBase(WorkerControllerBase, ABC):
+    @abstractmethod
+    def get_status(self, timeout: float | None = None) -> WorkerStatus:
+        """
+        Get the current status of the worker
+
+        :param timeout: seconds to wait for the worker, wait forever if None
+        :return: a WorkerStatus object
+        """
+
     @abstractmethod
     def close(self) -> None:
         """
@@ -40,37 +58,77 @@ class WorkerBridgeFactoryBase(ABC):
         :return:
         """
 
+    def warm_up(self, worker_connection_info: WorkerConnectionInfo) -> None:
+        """
+        Start connecting to a worker in the background, e.g. when it checks in, so its first call doesn't wait
+        for the connection
+
+        :param worker_connection_info: connection info of the worker
+        """
+
 
-class WorkerBridge(WorkerControllerBase):
+class WorkerBridge(WorkerBridgeBase):
     def __init__(self, channel: grpc.Channel):
         self.channel = channel
         self.worker_stub = worker_pb2_grpc.WorkerStub(channel)
         self._finalizer = weakref.finalize(self, self.__finalize)  # Destructor
 
-    def get_status(self) -> WorkerStatus:
-        raw_status: messages_pb2.WorkerStatus = self.worker_stub.GetStatus(empty_pb2.Empty())
-        return WorkerStatus(
-            id=raw_status.id,
-            task_type=raw_status.task_type,
-            version=raw_status.version,
-            healthy=raw_status.healthy,
-            has_task=raw_status.has_task,
-            joined_at=self._to_datetime(raw_status.joined_at),
-            created_at=self._to_datetime(raw_status.created_at),
-        )
+    def connect(self) -> grpc.Future:
+        """
+        Start connecting the channel if it's idle
 
-    def _to_datetime(self, timestamp: timestamp_pb2.Timestamp) -> datetime:
-        return timestamp.ToDatetime()
+        :return: a future done when the channel is ready
+        """
+        return grpc.channel_ready_future(self.channel)
+
+    def get_status(self, timeout: float | None = None) -> WorkerStatus:
+        raw_status: messages_pb2.WorkerStatus = self.worker_stub.GetStatus(empty_pb2.Empty(), timeout=timeout)
+        return from_raw_worker_status(raw_status)
 
     def start(self, options: WorkerStartOptions) -> None:
         self.worker_stub.StartWorker(
             worker_pb2.StartWorkerRequest(
-                task_path=options.task_path
+                task_path=options.task_path,
+                task_id=options.task_id
             )
         )
 
-    def stop(self) -> None:
-        self.worker_stub.StopWorker(empty_pb2.Empty())
+    def stop(self, task_id: int | None = None) -> None:
+        self.worker_stub.StopWorker(worker_pb2.StopWorkerRequest(task_id=task_id))
+
+    def upload_artifact(self, local_dir: Path, artifact: str, **options) -> int:
+        """
+        Upload a directory as an artifact of the worker, e.g. the input directory of a task
+
+        :param local_dir: the directory to upload
+        :param artifact: name of the artifact
+        :param options: options of ArtifactTransfer
+        :return: number of bytes of file data uploaded
+        """
+        return ArtifactTransfer(self.worker_stub, **options).upload(local_dir, artifact)
+
+    def stage_dataset(self, local_dir: Path, artifact: str, manifest: DatasetManifest, **options) -> int:
+        """
+        Stage a dataset as an artifact of the worker, uploading only the files missing from its dataset cache
+
+        :param local_dir: the directory of the dataset
+        :param artifact: name of the artifact
+        :param manifest: manifest of the directory
+        :param options: options of ArtifactTransfer
+        :return: number of bytes of file data uploaded, 0 if the worker has cached the dataset
+        """
+        return ArtifactTransfer(self.worker_stub, **options).stage_dataset(local_dir, artifact, manifest)
+
+    def download_artifact(self, artifact: str, local_dir: Path, **options) -> int:
+        """
+        Download an artifact of the worker into a directory, e.g. the output directory of a task
+
+        :param artifact: name of the artifact
+        :param local_dir: the directory to download into
+        :param options: options of ArtifactTransfer
+        :return: number of bytes of file data downloaded
+        """
+        return ArtifactTransfer(self.worker_stub, **options).download(artifact, local_dir)
 
     def __finalize(self) -> None:
         self.channel.close()
@@ -79,54 +137,178 @@ class WorkerBridge(WorkerControllerBase):
         self._finalizer()
 
 
-class CachedWorkerBridgeRecord(NamedTuple):
+class ChannelPoolStats(NamedTuple):
+    channels: int  # open channels
+    hits: int  # lookups of a cached channel
+    misses: int  # lookups opening a channel
+    evictions: int  # channels closed after being idle
+    warm_ups: int  # channels opened ahead of their first call
+
+
+@dataclass(slots=True)
+class CachedWorkerBridgeRecord:
     bridge: WorkerBridge
-    breath: int
+    # time.monotonic() of the last access, updated under the read lock so a bridge is not expired while it's returned
+    last_access: float
+
+    def touch(self) -> None:
+        self.last_access = time.monotonic()
 
 
 class WorkerBridgeFactory(WorkerBridgeFactoryBase):
+    """
+    Worker bridge factory pooling a channel per worker address until it's idle for idle_timeout_sec
+
+    The channels are tuned by ChannelOptions: keepalive pings keep an idle connection open and detect a dead one,
+    so a pooled channel can be kept much longer than the connection setup it saves, and channels to the same address
+    share their connection. Channels to newly checked-in workers are connected ahead of their first call,
+    see warm_up.
+
+    Expiry is driven by a heap ordered by deadline. Accesses only touch the record,
+    the deadline in the heap is corrected lazily when it's reached,
+    so the clean thread only wakes up and works on bridges that might have expired.
+    """
+
     _cached_bridges: dict[WorkerConnectionInfo, CachedWorkerBridgeRecord]
+    _expiry_heap: list[tuple[float, WorkerConnectionInfo]]  # (deadline, key), one entry per cached bridge
     _clean_thread: threading.Thread
     _close_event: threading.Event
     _cache_lock: rwlock.RWLockFair
+    _hits: CounterChild  # counted without the lock, like the metrics
+    _misses: CounterChild
+    _evictions: int
+    _warm_ups: int
 
-    INITIAL_BREATH_SEC = 120
+    IDLE_TIMEOUT_SEC = 600
 
-    def __init__(self):
+    def __init__(self, channel_options: ChannelOptions = ChannelOptions(), idle_timeout_sec: float = IDLE_TIMEOUT_SEC):
+        """
+        :param channel_options: options of the channels to the workers
+        :param idle_timeout_sec: seconds a channel is kept without being used
+        """
+        self.channel_options = channel_options
+        self.idle_timeout_sec = idle_timeout_sec
         self._cached_bridges = {}
+        self._expiry_heap = []
         self._clean_thread = threading.Thread(target=self._clean, daemon=True)
         self._close_event = threading.Event()
         self._cache_lock = rwlock.RWLockFair()
+        self._hits = CounterChild()
+        self._misses = CounterChild()
+        self._evictions = 0
+        self._warm_ups = 0
         self._clean_thread.start()
 
     def _clean(self):
-        while not self._close_event.wait(0):
-            with self._cache_lock.gen_wlock():
-                for key, record in list(self._cached_bridges.items()):
-                    record.breath -= 1
-                    if record.breath <= 0:
-                        record.bridge.close()
-                        self._cached_bridges.pop(key, None)
-            time.sleep(1)
+        timeout = self.idle_timeout_sec
+        while not self._close_event.wait(timeout):
+            timeout = self._expire()
+
+    def _expire(self) -> float:
+        """
+        Remove the expired bridges
+
+        :return: seconds until the next deadline
+        """
+        now = time.monotonic()
+        expired = []
+        with self._cache_lock.gen_wlock():
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                _, key = heapq.heappop(self._expiry_heap)
+                record = self._cached_bridges.get(key)
+                if record is None:
+                    continue
+                deadline = record.last_access + self.idle_timeout_sec
+                if deadline > now:  # Touched since the entry was pushed
+                    heapq.heappush(self._expiry_heap, (deadline, key))
+                    continue
+                del self._cached_bridges[key]
+                expired.append(record)
+            next_deadline = self._expiry_heap[0][0] if self._expiry_heap else now + self.idle_timeout_sec
+            self._evictions += len(expired)
+        BRIDGE_CACHE.labels('evict').inc(len(expired))
+
+        for record in expired:
+            record.bridge.close()
+        WORKER_CHANNELS.dec(len(expired))
+        return max(next_deadline - now, 0)
 
     def get_worker_bridge(self, worker_connection_info: WorkerConnectionInfo) -> WorkerBridge:
         with self._cache_lock.gen_rlock():
             record = self._cached_bridges.get(worker_connection_info)
+            if record is not None:
+                record.touch()
+        if record is not None:
+            self._hits.inc()
+            BRIDGE_CACHE.labels('hit').inc()
+            return record.bridge
+        self._misses.inc()
+        BRIDGE_CACHE.labels('miss').inc()
+        return self._add_bridge(worker_connection_info)[0]
 
-        cache_hit = record is not None
-        if not cache_hit:
-            # Try to create a new bridge
-            record = self._create_bridge(worker_connection_info)
+    def warm_up(self, worker_connection_info: WorkerConnectionInfo) -> None:
+        with self._cache_lock.gen_rlock():
+            if worker_connection_info in self._cached_bridges:
+                return
+        bridge, added = self._add_bridge(worker_connection_info)
+        if added:
+            bridge.connect()
+            with self._cache_lock.gen_wlock():
+                self._warm_ups += 1
+            BRIDGE_CACHE.labels('warm').inc()
+
+    def get_stats(self) -> ChannelPoolStats:
+        with self._cache_lock.gen_rlock():
+            return ChannelPoolStats(
+                channels=len(self._cached_bridges),
+                hits=int(self._hits.value()),
+                misses=int(self._misses.value()),
+                evictions=self._evictions,
+                warm_ups=self._warm_ups
+            )
+
+    def close(self) -> None:
+        """
+        Stop the clean thread and close all cached bridges
+        """
+        self._close_event.set()
+        self._clean_thread.join()
+        with self._cache_lock.gen_wlock():
+            records = list(self._cached_bridges.values())
+            self._cached_bridges.clear()
+            self._expiry_heap.clear()
+        for record in records:
+            record.bridge.close()
+        WORKER_CHANNELS.dec(len(records))
 
+    def _add_bridge(self, worker_connection_info: WorkerConnectionInfo) -> tuple[WorkerBridge, bool]:
+        """
+        Create and cache a bridge, unless another thread cached one meanwhile
+
+        :return: the cached bridge and True if it's the new one
+        """
+        record = self._create_bridge(worker_connection_info)
         with self._cache_lock.gen_wlock():
-            if cache_hit:
-                record.breath = self.INITIAL_BREATH_SEC  # Reset the breath
+            # Cache the new bridge or get the bridge from another thread
+            cached_record = self._cached_bridges.setdefault(worker_connection_info, record)
+            if cached_record is record:
+                heapq.heappush(self._expiry_heap, (record.last_access + self.idle_timeout_sec, worker_connection_info))
             else:
-                # Cache the new bridge or get the bridge from another thread
-                record = self._cached_bridges.setdefault(worker_connection_info, record)
-        return record.bridge
+                cached_record.touch()
+        if cached_record is not record:
+            record.bridge.close()
+            return cached_record.bridge, False
+        WORKER_CHANNELS.inc()
+        return record.bridge, True
 
     def _create_bridge(self, worker_connection_info: WorkerConnectionInfo) -> CachedWorkerBridgeRecord:
-        channel = grpc.insecure_channel(f'{worker_connection_info.host}:{worker_connection_info.port}')
+        channel = grpc.intercept_channel(
+            grpc.insecure_channel(
+                f'{worker_connection_info.host}:{worker_connection_info.port}',
+                options=self.channel_options.get_channel_args(),
+                compression=self.channel_options.get_compression()
+            ),
+            TracingClientInterceptor('worker_call')
+        )
         bridge = WorkerBridge(channel)  # channel will be closed by the bridge automatically when it is destructed
-        return CachedWorkerBridgeRecord(bridge=bridge, breath=self.INITIAL_BREATH_SEC)
+        return CachedWorkerBridgeRecord(bridge=bridge, last_access=time.monotonic())
@@ -1,22 +1,79 @@
+import contextvars
+import threading
+import time
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from mlops.cluster.core import WorkerClusterCore, Reservation
+from mlops.cluster.dispatcher import TaskDispatcher
 from mlops.cluster.interfaces import WorkerClusterBase
+from mlops.cluster.metrics import WORKER_REPORTS
+from mlops.cluster.model import WorkerRecord, SlotTask, TaskAssignment, WorkerProbe
+from mlops.cluster.schedulers.interfaces import WorkerSchedulerBase
+from mlops.cluster.status_hub import WorkerStatusHub, WorkerStatusSubscription
 from mlops.cluster.storages.interfaces import WorkerStorageBase
 from mlops.cluster.worker_bridge import WorkerBridgeFactoryBase
-from mlops.common.model import TrainingStatus, WorkerStatus, WorkerData
+from mlops.common.datasets import ManifestCache, with_dataset
+from mlops.common.exc import RepoNotFoundError
+from mlops.common.model import TrainingStatus, WorkerStatus, WorkerData, TrainingTask
 from mlops.common.repos.interfaces import TrainingTaskRepositoryBase
 from mlops.worker.interfaces import WorkerStartOptions
 
+_STATUS_REPORTS = WORKER_REPORTS.labels('status')
+_TRAINING_STATUS_REPORTS = WORKER_REPORTS.labels('training_status')
+
+
+class WorkerCluster(WorkerClusterCore, WorkerClusterBase):
+    """
+    Worker cluster
+
+    Workers hold a lease renewed by each status report. A worker whose lease expired is no longer assigned tasks,
+    and is removed by the reap thread every reap_interval_sec seconds.
+    Its running tasks are marked as orphaned, see pop_orphaned_tasks.
+
+    A worker runs as many tasks at once as it has slots, see SLOTS_OPTION. The cluster tracks the task of each slot,
+    a slot is freed when the worker reports the task complete or reports it has no task.
+    Queued tasks are matched with free slots by the dispatcher thread, which is notified
+    when a task is queued and when a worker of the same type checks in or reports a free slot.
+
+    Tasks go to the first idle worker of their type, unless a scheduler is given.
+    A scheduler also takes into account the resources advertised by the workers, see RESOURCES_OPTION,
+    and the resources required by the tasks, see TrainingTask.requirements.
+    Given manifests, the input directories readable by the cluster are hashed before placing their tasks,
+    so a scheduler like LocalityScheduler can place the tasks of a dataset where it's cached, see TrainingTask.dataset.
+
+    Batch assignments and probes call the workers concurrently, with at most call_concurrency calls in flight.
+    """
 
-class WorkerCluster(WorkerClusterBase):
+    _reserve_lock: threading.Lock  # serializes the changes to the slots of the workers
+    _call_executor: ThreadPoolExecutor  # calls many workers concurrently, for batch assignments and probes
+    _reap_thread: threading.Thread
+    _close_event: threading.Event
 
     def __init__(
             self,
             storage: WorkerStorageBase,
             worker_bridge_factory: WorkerBridgeFactoryBase,
-            task_repo: TrainingTaskRepositoryBase
+            task_repo: TrainingTaskRepositoryBase,
+            status_hub: WorkerStatusHub | None = None,
+            lease_ttl_sec: float = 30.,
+            reap_interval_sec: float = 5.,
+            call_concurrency: int = 32,
+            scheduler: WorkerSchedulerBase | None = None,
+            manifests: ManifestCache | None = None
     ):
+        super().__init__(status_hub, lease_ttl_sec, scheduler, manifests)
         self.storage = storage
         self.task_repo = task_repo
         self.worker_bridge_factory = worker_bridge_factory
+        self.reap_interval_sec = reap_interval_sec
+        self.dispatcher = TaskDispatcher(self._dispatch)
+        self._reserve_lock = threading.Lock()
+        self._call_executor = ThreadPoolExecutor(max_workers=call_concurrency, thread_name_prefix='worker-call')
+        self._close_event = threading.Event()
+        self._reap_thread = threading.Thread(target=self._reap, daemon=True)
+        self._reap_thread.start()
 
     def get_workers_status(self) -> list[WorkerStatus]:
         return [w.status for w in self.storage.get_all()]
@@ -27,30 +84,372 @@ class WorkerCluster(WorkerClusterBase):
             return None
         return record.status
 
+    def watch_workers_status(self, worker_id: str | None = None) -> WorkerStatusSubscription:
+        return self.status_hub.subscribe(worker_id)
+
     def assign_training_task(self, task_id: int) -> WorkerStatus | None:
         task = self.task_repo.get_by_id(task_id)
-        worker = self.storage.get_first_idle_by_type(task.task_type)
-        if worker is None:
-            return None
+        return self._assign_task(self._with_dataset(task))
 
-        bridge = self.worker_bridge_factory.get_worker_bridge(worker.connection)
-        bridge.start(WorkerStartOptions(
-            task_path=str(task.input_dir)  # TODO: add output dir
-        ))
+    def assign_training_tasks(self, task_ids: Sequence[int]) -> list[TaskAssignment]:
+        task_ids = list(dict.fromkeys(task_ids))
+        tasks = self.task_repo.get_by_ids(task_ids)
+        tasks_by_type = self._group_by_type(map(self._with_dataset, tasks.values()))
 
-        return worker.status
+        with self._reserve_lock:
+            reservations = [
+                reservation
+                for type_tasks in tasks_by_type.values()
+                for reservation in self._reserve_workers(type_tasks)
+            ]
+        starts = {
+            # Each start runs in a copy of the context, so its calls to the worker are part of the current trace
+            task.id: self._call_executor.submit(
+                contextvars.copy_context().run, self._start_task, task, reserved, replaced
+            )
+            for task, reserved, replaced in reservations
+        }
+
+        return self._to_assignments(task_ids, tasks, {
+            task_id: start.exception() or start.result() for task_id, start in starts.items()
+        })
+
+    def enqueue_training_task(self, task_id: int, priority: int = 0) -> int | None:
+        try:
+            task = self.task_repo.get_by_id(task_id)
+        except RepoNotFoundError:
+            return None
+        depth = self.pending_tasks.push(task_id, task.task_type, priority)
+        self.dispatcher.notify(task.task_type)
+        return depth
 
     def get_training_status(self, task_id: int) -> TrainingStatus | None:
-        pass
+        pending_status = self._get_pending_status(task_id)
+        if pending_status is not None:
+            return pending_status
+        return self._get_tracked_status(task_id, self._get_task_worker(task_id))
 
     def pause_training_task(self, task_id: int) -> None:
-        pass
+        if self.pending_tasks.remove(task_id):
+            return
+        record = self._get_task_worker(task_id)
+        if record is None or not record.get_task(task_id).running:
+            return
+
+        bridge = self.worker_bridge_factory.get_worker_bridge(record.connection)
+        bridge.stop(task_id)
+
+    def check_in(self, worker_data: WorkerData, worker_id: str | None = None) -> str:
+        """
+        Check in a worker
 
-    def check_in(self, worker_data: WorkerData) -> str:
-        pass
+        :param worker_data: WorkerData object
+        :param worker_id: the id to give the worker, a new UUID if None, e.g. chosen by a shard router
+        :return: the worker id
+        """
+        record = self._new_record(worker_data, worker_id if worker_id is not None else str(uuid.uuid4()))
+        self._save_status(record)
+        self.worker_bridge_factory.warm_up(record.connection)
+        self._notify_idle(worker_data.task_type)
+        return record.status.id
 
     def report_status(self, worker_status: WorkerStatus) -> None:
-        pass
+        _STATUS_REPORTS.inc()
+        with self._reserve_lock:
+            record = self.storage.get(worker_status.id)
+            if record is None:
+                return  # Not checked in or expired
+            self.leases.renew(worker_status.id)
+            record = record.with_reported_status(worker_status)
+            self._save_status(record)
+        if record.status.healthy and record.status.free_slots > 0:
+            self._notify_idle(record.status.task_type)
+
+    def report_training_status(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> None:
+        _TRAINING_STATUS_REPORTS.inc()
+        with self._reserve_lock:
+            record = self.storage.get(worker_id)
+            if record is None:
+                return  # Not checked in or expired
+            self.leases.renew(worker_id)
+            applied = self._apply_training_status(record, training_status, task_id)
+            if applied is None:
+                return  # Not assigned by this cluster
+            updated, task = applied
+            if updated.status != record.status:  # The slot was freed
+                self._save_status(updated)
+            else:
+                self.storage.save(updated)
+        self._publish_training_status(worker_id, training_status, task.task_id)
+        if updated.status != record.status and updated.status.healthy:
+            self._notify_idle(updated.status.task_type)
+
+    def has_worker(self, task_type: str, idle: bool = False) -> bool:
+        """
+        Check if a worker of a type is checked in
+
+        :param task_type: type of the worker
+        :param idle: only count the healthy workers with a free slot
+        :return: True if such a worker is checked in
+        """
+        if idle:
+            return bool(self.storage.get_idle_by_type(task_type, 1))
+        return self.storage.count_by_type(task_type) > 0
+
+    def pop_orphaned_tasks(self) -> list[int]:
+        """
+        Take the tasks whose worker was lost while running them
+
+        :return: ids of the orphaned tasks
+        """
+        with self._reserve_lock:
+            task_ids = list(self._orphaned_tasks)
+            self._orphaned_tasks.clear()
+        return task_ids
+
+    def reap_expired_workers(self) -> list[str]:
+        """
+        Remove the workers whose lease expired
+
+        :return: ids of the removed workers
+        """
+        removed = []
+        for worker_id in self.leases.pop_expired():
+            with self._reserve_lock:
+                if self.leases.is_alive(worker_id):
+                    continue  # Renewed since it expired
+                record = self.storage.get(worker_id)
+                if record is None:
+                    continue
+                self._remove_worker(record)
+            removed.append(worker_id)
+        return removed
+
+    def restore_workers(self) -> int:
+        """
+        Take over the workers already in the storage, e.g. loaded by a persistent storage after a restart
+
+        Each worker is granted a new lease, so it's removed by the reap thread if it does not report again in time.
+        The tasks of their slots are tracked again and queued tasks are dispatched to their free slots.
+
+        :return: number of workers restored
+        """
+        with self._reserve_lock:
+            records = self.storage.get_all()
+            for record in records:
+                self._restore_worker(record)
+        for task_type in {record.status.task_type for record in records}:
+            self._notify_idle(task_type)
+        return len(records)
+
+    def detach_worker(self, worker_id: str) -> WorkerRecord | None:
+        """
+        Remove a worker without orphaning its tasks, to hand it over to another cluster with attach_worker
+
+        :param worker_id: the worker id
+        :return: the WorkerRecord object of the worker or None if not found
+        """
+        with self._reserve_lock:
+            record = self.storage.get(worker_id)
+            if record is None:
+                return None
+            self._forget_worker(worker_id)
+            self.storage.delete(worker_id)
+            for task in record.tasks:
+                if self._task_workers.get(task.task_id) == worker_id:
+                    self._task_workers.pop(task.task_id, None)
+        return record
 
-    def report_training_status(self, worker_id: str, training_status: TrainingStatus | None) -> None:
-        pass
+    def attach_worker(self, record: WorkerRecord) -> None:
+        """
+        Take over a worker detached from another cluster, like restore_workers does
+
+        :param record: the WorkerRecord object returned by detach_worker
+        """
+        with self._reserve_lock:
+            self.storage.save(record)
+            self._restore_worker(record)
+        if record.status.healthy and record.status.free_slots > 0:
+            self._notify_idle(record.status.task_type)
+
+    def probe_workers(self, timeout_sec: float = 2.) -> list[WorkerProbe]:
+        """
+        Get the live status of every worker and reconcile it into the storage
+
+        Workers are called concurrently with a deadline each, so a probe takes about as long as the slowest worker.
+        A worker not answering before the deadline is marked unhealthy until it reports again.
+        Other errors, e.g. a worker not implementing GetStatus, leave the status of the worker unknown: unchanged.
+
+        :param timeout_sec: deadline of each call
+        :return: list of WorkerProbe objects, one per worker
+        """
+        records = self.storage.get_all()
+        probes = list(self._call_executor.map(lambda record: self._probe(record, timeout_sec), records))
+        for record, probe in zip(records, probes):
+            self._reconcile(record, probe)
+        return probes
+
+    def close(self) -> None:
+        """
+        Stop the reap thread, the dispatcher and the call executor
+        """
+        self._close_event.set()
+        self._reap_thread.join()
+        self.dispatcher.close()
+        self._call_executor.shutdown()
+
+    def _assign_task(self, task: TrainingTask[int]) -> WorkerStatus | None:
+        with self._reserve_lock:
+            reservations = self._reserve_workers([task])
+        if not reservations:
+            return None
+        return self._start_task(*reservations[0])
+
+    def _reserve_workers(
+            self,
+            tasks: list[TrainingTask[int]]
+    ) -> list[Reservation]:
+        """
+        Reserve free slots of idle workers for tasks of the same type, the caller must hold the reserve lock
+
+        Slots are reserved before the workers are called, so concurrent assignments do not pick them again.
+        A worker with several free slots takes several tasks.
+
+        :return: list of (task, reserved worker record, complete task replaced in the slot),
+            shorter than tasks if not enough slots are free
+        """
+        if self.scheduler is not None:
+            return self._reserve_scheduled_workers(tasks)
+
+        reservations = []
+        while len(reservations) < len(tasks):
+            workers = self.storage.get_idle_by_type(tasks[0].task_type, len(tasks) - len(reservations))
+            if not workers:
+                break
+            for worker in workers:
+                if not self.leases.is_alive(worker.status.id):
+                    self._remove_worker(worker)
+                    continue
+                self._save_status(self._fill_slots(worker, tasks, reservations))
+        return reservations
+
+    def _reserve_scheduled_workers(
+            self,
+            tasks: list[TrainingTask[int]]
+    ) -> list[Reservation]:
+        """
+        Reserve the slots chosen by the scheduler one task at a time, the caller must hold the reserve lock
+        """
+        reservations = []
+        for task in self._by_demand(tasks):
+            requirements = task.requirements
+            while (worker_id := self.scheduler.select(task.task_type, requirements, task.dataset)) is not None:
+                worker = self.storage.get(worker_id)
+                if self._is_out_of_sync(worker_id, worker, requirements):
+                    continue
+                if not self.leases.is_alive(worker_id):
+                    self._remove_worker(worker)
+                    continue
+                worker, replaced = worker.reserve(task.id, requirements)
+                self._save_status(worker)
+                reservations.append((task, worker, replaced))
+                break
+        return reservations
+
+    def _start_task(
+            self,
+            task: TrainingTask[int],
+            reserved: WorkerRecord,
+            replaced: SlotTask | None
+    ) -> WorkerStatus:
+        """
+        Start a task in a reserved slot, the reservation is reverted if the worker fails to start it
+        """
+        worker_id = reserved.status.id
+        try:
+            bridge = self.worker_bridge_factory.get_worker_bridge(reserved.connection)
+            bridge.start(WorkerStartOptions(
+                task_path=str(task.input_dir),  # TODO: add output dir
+                task_id=task.id
+            ))
+        except Exception:
+            with self._reserve_lock:
+                record = self.storage.get(worker_id)
+                if record is not None and record.get_task(task.id) is not None:
+                    self._save_status(record.replace_task(task.id, replaced))
+            raise
+        with self._reserve_lock:
+            started = self._track_start(task, worker_id, replaced, self.storage.get(worker_id))
+            if started is not None:
+                self.storage.save(started)
+        return reserved.status
+
+    def _probe(self, record: WorkerRecord, timeout_sec: float) -> WorkerProbe:
+        started = time.perf_counter()
+        try:
+            bridge = self.worker_bridge_factory.get_worker_bridge(record.connection)
+            status = bridge.get_status(timeout=timeout_sec)
+        except Exception as e:
+            return self._to_probe(record, started, error=e)
+        return self._to_probe(record, started, status)
+
+    def _reconcile(self, record: WorkerRecord, probe: WorkerProbe) -> None:
+        with self._reserve_lock:
+            current = self.storage.get(probe.worker_id)
+            updated = self._reconcile_probe(record, current, probe)
+            if updated is None:
+                return
+            if updated.status != current.status:
+                self._save_status(updated)
+        if updated.status.healthy and updated.status.free_slots > 0:
+            self._notify_idle(updated.status.task_type)
+
+    def _dispatch(self, task_type: str) -> None:
+        while (pending := self.pending_tasks.pop(task_type)) is not None:
+            try:
+                task = self.task_repo.get_by_id(pending.task_id)
+                status = self._assign_task(self._with_dataset(task))
+            except RepoNotFoundError:
+                continue  # Deleted since it was queued
+            except Exception:
+                self._retry_failed(pending)
+                return
+            self._dispatch_failures.pop(task_type, None)
+            if status is None:  # No idle worker left
+                self._retry_later(pending)
+                return
+
+    def _with_dataset(self, task: TrainingTask[int]) -> TrainingTask[int]:
+        if self.manifests is None:
+            return task
+        return with_dataset(task, self.manifests)
+
+    def _save_status(self, record: WorkerRecord) -> None:
+        self.storage.save(record)
+        self._publish_status(record)
+
+    def _reap(self) -> None:
+        while not self._close_event.wait(self.reap_interval_sec):
+            self.reap_expired_workers()
+
+    def _remove_worker(self, record: WorkerRecord) -> None:
+        """
+        Remove a lost worker and orphan its running tasks, the caller must hold the reserve lock
+        """
+        self._forget_worker(record.status.id)
+        if self.storage.delete(record.status.id):  # Else removed by another thread
+            self._orphan_tasks(record)
+
+    def _get_task_worker(self, task_id: int) -> WorkerRecord | None:
+        worker_id = self._task_workers.get(task_id)
+        if worker_id is None:
+            return None
+        record = self.storage.get(worker_id)
+        if record is None or record.get_task(task_id) is None:
+            return None
+        return record
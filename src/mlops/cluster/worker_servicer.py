@@ -1,24 +1,62 @@
+from collections.abc import Iterator
+
+import grpc
+from google.protobuf import empty_pb2
+
+from mlops.cluster.interfaces import WorkerClusterWorkerControllerBase
+from mlops.common.codec import from_raw_worker_status, from_raw_training_status, from_raw_worker_data
+from mlops.common.grpc_metrics import instrument_servicer
 from mlops.protos import worker_cluster_pb2_grpc, worker_cluster_pb2, messages_pb2
 
 
+@instrument_servicer('WorkerClusterWorker')
 class WorkerClusterWorkerServicer(worker_cluster_pb2_grpc.WorkerClusterWorkerServicer):
+    def __init__(self, cluster: WorkerClusterWorkerControllerBase):
+        self.cluster = cluster
+
     def CheckIn(
             self,
             request: messages_pb2.WorkerData,
-            context
+            context: grpc.ServicerContext
     ) -> worker_cluster_pb2.CheckInResponse:
-        return super().CheckIn(request, context)
+        try:
+            worker_id = self.cluster.check_in(from_raw_worker_data(request))
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return worker_cluster_pb2.CheckInResponse(uuid=worker_id)
 
     def ReportStatus(
             self,
             request: worker_cluster_pb2.ReportStatusRequest,
-            context
-    ) -> None:
-        return super().ReportStatus(request, context)
+            context: grpc.ServicerContext
+    ) -> empty_pb2.Empty:
+        self._report_status(request)
+        return empty_pb2.Empty()
 
     def ReportTrainingStatus(
             self,
             request: worker_cluster_pb2.ReportTrainingStatusRequest,
-            context
-    ) -> None:
-        return super().ReportTrainingStatus(request, context)
+            context: grpc.ServicerContext
+    ) -> empty_pb2.Empty:
+        self._report_training_status(request)
+        return empty_pb2.Empty()
+
+    def ReportStatusStream(
+            self,
+            request_iterator: Iterator[worker_cluster_pb2.StatusReport],
+            context: grpc.ServicerContext
+    ) -> empty_pb2.Empty:
+        for report in request_iterator:
+            if report.HasField('status'):
+                self._report_status(report.status)
+            elif report.HasField('training_status'):
+                self._report_training_status(report.training_status)
+        return empty_pb2.Empty()
+
+    def _report_status(self, request: worker_cluster_pb2.ReportStatusRequest) -> None:
+        self.cluster.report_status(from_raw_worker_status(request.status))
+
+    def _report_training_status(self, request: worker_cluster_pb2.ReportTrainingStatusRequest) -> None:
+        training_status = from_raw_training_status(request.status) if request.HasField('status') else None
+        task_id = request.task_id if request.HasField('task_id') else None
+        self.cluster.report_training_status(request.worker_id, training_status, task_id)
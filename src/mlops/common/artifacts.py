@@ -0,0 +1,224 @@
+"""
+Files of artifacts as ArtifactChunk messages, shared by the workers and the cluster
+
+Files are read through mmap, each chunk is a memoryview slice of the mapping: the data is compressed straight from
+the mapping, and only copied once into the message when it's sent uncompressed. Chunks are written with os.pwrite
+at their offset. The chunks of a file are sent in order, so the size of a partially received file is the offset
+to resume it from.
+"""
+import mmap
+import os
+import zlib
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from mlops.protos import worker_pb2
+
+__ALL__ = [
+    'DEFAULT_CHUNK_SIZE', 'MAX_CHUNK_SIZE', 'COMPRESSIONS', 'resolve_path', 'list_files', 'read_chunks', 'ChunkWriter',
+    'get_resume_offsets', 'partition'
+]
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+# Larger chunks could exceed the default maximum message size of gRPC when sent uncompressed
+MAX_CHUNK_SIZE = 1 << 21
+
+# Compression name -> ChunkCompression
+COMPRESSIONS = {
+    'none': worker_pb2.CHUNK_COMPRESSION_NONE,
+    'zlib': worker_pb2.CHUNK_COMPRESSION_ZLIB,
+}
+
+# Fast compression, transfers should be bound by the network rather than the CPU
+_ZLIB_LEVEL = 1
+
+
+def resolve_path(root: Path, relative: str) -> Path:
+    """
+    Resolve a path relative to a root, refusing paths outside the root
+
+    :param root: the root directory
+    :param relative: the relative path, with / separators
+    :return: the path
+    :raises ValueError: if the path is absolute or outside the root
+    """
+    if not relative or Path(relative).is_absolute():
+        raise ValueError(f'invalid relative path: {relative!r}')
+    root = root.resolve()
+    path = (root / relative).resolve()
+    if not path.is_relative_to(root) or path == root:
+        raise ValueError(f'path outside of {root}: {relative!r}')
+    return path
+
+
+def list_files(root: Path) -> dict[str, int]:
+    """
+    List the files under a directory
+
+    :param root: the directory, may not exist
+    :return: path relative to root -> size
+    """
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = Path(directory, name)
+            files[path.relative_to(root).as_posix()] = path.stat().st_size
+    return files
+
+
+def read_chunks(
+        root: Path,
+        relative: str,
+        artifact: str = '',
+        offset: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compression: int = worker_pb2.CHUNK_COMPRESSION_ZLIB
+) -> Iterator[worker_pb2.ArtifactChunk]:
+    """
+    Read a file as chunks
+
+    A chunk is sent uncompressed when compression doesn't make it smaller, e.g. for already compressed data.
+    An empty file, or a file read from its end, yields a single empty chunk, so it's still created by the receiver.
+
+    :param root: the directory of the artifact
+    :param relative: path of the file in the artifact
+    :param artifact: name of the artifact set in the chunks
+    :param offset: offset to read from
+    :param chunk_size: size of the uncompressed data of a chunk
+    :param compression: ChunkCompression of the chunks
+    :return: the chunks
+    """
+    with open(resolve_path(root, relative), 'rb') as file:
+        file_size = os.fstat(file.fileno()).st_size
+        if offset >= file_size:
+            yield worker_pb2.ArtifactChunk(artifact=artifact, path=relative, offset=file_size, file_size=file_size)
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping, memoryview(mapping) as view:
+            for start in range(offset, file_size, chunk_size):
+                with view[start:start + chunk_size] as data:
+                    yield worker_pb2.ArtifactChunk(
+                        artifact=artifact,
+                        path=relative,
+                        offset=start,
+                        file_size=file_size,
+                        **_compress(data, compression)
+                    )
+
+
+def _compress(data: memoryview, compression: int) -> dict:
+    if compression == worker_pb2.CHUNK_COMPRESSION_ZLIB:
+        compressed = zlib.compress(data, _ZLIB_LEVEL)
+        if len(compressed) < len(data):
+            return {'data': compressed, 'compression': compression}
+    return {'data': data.tobytes(), 'compression': worker_pb2.CHUNK_COMPRESSION_NONE}
+
+
+class ChunkWriter:
+    """
+    Write received chunks into the files of a directory
+
+    Files are kept open until close. A file is truncated to its size when its last chunk is written,
+    so a file overwritten from the start doesn't keep the end of its previous content.
+    """
+
+    _files: dict[str, int]  # relative path -> file descriptor
+    _offsets: dict[str, int]  # relative path -> end of the data written
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._files = {}
+        self._offsets = {}
+
+    def write(self, chunk: worker_pb2.ArtifactChunk) -> None:
+        """
+        Write a chunk at its offset
+
+        :param chunk: the chunk
+        :raises ValueError: if the chunk is invalid, or would leave a hole in its file
+        """
+        fd = self._files.get(chunk.path)
+        if fd is None:
+            path = resolve_path(self.root, chunk.path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = self._files[chunk.path] = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+            self._offsets[chunk.path] = os.fstat(fd).st_size
+        received = self._offsets[chunk.path]
+        if chunk.offset > received:
+            raise ValueError(f'chunk of {chunk.path} at {chunk.offset} is beyond the {received} bytes received')
+
+        data = _decompress(chunk)
+        end = chunk.offset + len(data)
+        if end > chunk.file_size:
+            raise ValueError(f'chunk of {chunk.path} ends at {end}, beyond the size of the file {chunk.file_size}')
+        written = os.pwrite(fd, data, chunk.offset)
+        while written < len(data):
+            with memoryview(data)[written:] as rest:
+                written += os.pwrite(fd, rest, chunk.offset + written)
+        self._offsets[chunk.path] = end
+        if end == chunk.file_size:
+            os.ftruncate(fd, end)
+
+    def get_offsets(self) -> dict[str, int]:
+        """
+        :return: path -> end of the data written, of the files written so far
+        """
+        return dict(self._offsets)
+
+    def close(self) -> None:
+        files, self._files = self._files, {}
+        for fd in files.values():
+            os.close(fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _decompress(chunk: worker_pb2.ArtifactChunk) -> bytes:
+    if chunk.compression == worker_pb2.CHUNK_COMPRESSION_NONE:
+        return chunk.data
+    if chunk.compression == worker_pb2.CHUNK_COMPRESSION_ZLIB:
+        try:
+            return zlib.decompress(chunk.data)
+        except zlib.error as e:
+            raise ValueError(f'invalid chunk of {chunk.path}: {e}') from e
+    raise ValueError(f'unknown compression: {chunk.compression}')
+
+
+def get_resume_offsets(source: Mapping[str, int], target: Mapping[str, int]) -> dict[str, int]:
+    """
+    Get the files to transfer and the offset to resume each of them from
+
+    A file is resumed if the target has a part of it, and skipped if the target has a file of the same size.
+    Content is not compared, files are expected to be complete once written.
+
+    :param source: path -> size of the files to transfer
+    :param target: path -> size of the files already transferred
+    :return: path -> offset of the files to transfer
+    """
+    offsets = {}
+    for path, size in source.items():
+        if path not in target or target[path] != size:
+            received = target.get(path, 0)
+            offsets[path] = received if received < size else 0
+    return offsets
+
+
+def partition(offsets: Mapping[str, int], sizes: Mapping[str, int], count: int) -> list[dict[str, int]]:
+    """
+    Split the files to transfer into groups of similar remaining sizes, the largest files first
+
+    :param offsets: path -> offset of the files to transfer
+    :param sizes: path -> size of the files
+    :param count: maximum number of groups
+    :return: the non-empty groups, path -> offset
+    """
+    groups: list[dict[str, int]] = [{} for _ in range(max(count, 1))]
+    loads = [0] * len(groups)
+    for path in sorted(offsets, key=lambda p: sizes[p] - offsets[p], reverse=True):
+        i = loads.index(min(loads))
+        groups[i][path] = offsets[path]
+        loads[i] += sizes[path] - offsets[path]
+    return [group for group in groups if group]
@@ -0,0 +1,60 @@
+"""
+Tuning of the gRPC channels from the cluster to the workers, and of the worker servers accepting them
+"""
+from typing import Any, NamedTuple
+
+import grpc
+
+__ALL__ = ['ChannelOptions', 'COMPRESSIONS']
+
+COMPRESSIONS = {
+    'none': grpc.Compression.NoCompression,
+    'deflate': grpc.Compression.Deflate,
+    'gzip': grpc.Compression.Gzip,
+}
+
+
+class ChannelOptions(NamedTuple):
+    # Ping the connection after this idle time, so a dead worker or a dropped connection is noticed
+    # before the next call, and middleboxes don't drop an idle connection. 0 to not ping.
+    keepalive_time_ms: int = 30_000
+    keepalive_timeout_ms: int = 10_000
+    max_message_bytes: int = 16 << 20
+    compression: str = 'none'  # a key of COMPRESSIONS, for the calls to the workers
+
+    def get_channel_args(self) -> list[tuple[str, Any]]:
+        """
+        :return: the options of a channel to a worker
+        """
+        args = [
+            ('grpc.max_send_message_length', self.max_message_bytes),
+            ('grpc.max_receive_message_length', self.max_message_bytes),
+        ]
+        if self.keepalive_time_ms > 0:
+            args += [
+                ('grpc.keepalive_time_ms', self.keepalive_time_ms),
+                ('grpc.keepalive_timeout_ms', self.keepalive_timeout_ms),
+                ('grpc.keepalive_permit_without_calls', 1),
+                ('grpc.http2.max_pings_without_data', 0),
+            ]
+        return args
+
+    def get_server_args(self) -> list[tuple[str, Any]]:
+        """
+        :return: the options of a worker server, accepting the keepalive pings of the channels
+        """
+        args = [
+            ('grpc.max_send_message_length', self.max_message_bytes),
+            ('grpc.max_receive_message_length', self.max_message_bytes),
+        ]
+        if self.keepalive_time_ms > 0:
+            # A server closes the connections pinging more often than every 5 minutes by default,
+            # half the interval leaves room for the jitter of the pings
+            args += [
+                ('grpc.keepalive_permit_without_calls', 1),
+                ('grpc.http2.min_ping_interval_without_data_ms', self.keepalive_time_ms // 2),
+            ]
+        return args
+
+    def get_compression(self) -> grpc.Compression:
+        return COMPRESSIONS[self.compression]
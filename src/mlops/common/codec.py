@@ -0,0 +1,119 @@
+"""
+Conversions between the models in mlops.common.model and the messages in messages_pb2
+
+Timestamps are converted with integer arithmetic instead of Timestamp.FromDatetime and Timestamp.ToDatetime,
+and the conversion of a datetime is cached: statuses are listed far more often than they change,
+so listing many workers converts mostly the same timestamps again.
+"""
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from google.protobuf import json_format, struct_pb2, timestamp_pb2
+
+from mlops.common.model import WorkerStatus, TrainingStatus, WorkerData
+from mlops.protos import messages_pb2
+
+__ALL__ = [
+    'to_raw_worker_status', 'to_raw_worker_statuses', 'from_raw_worker_status',
+    'to_raw_training_status', 'from_raw_training_status',
+    'to_raw_worker_data', 'from_raw_worker_data',
+    'to_timestamp', 'from_timestamp'
+]
+
+# Naive datetimes are taken as UTC, like Timestamp.FromDatetime and Timestamp.ToDatetime do
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_raw_worker_status(status: WorkerStatus) -> messages_pb2.WorkerStatus:
+    return messages_pb2.WorkerStatus(
+        id=status.id,
+        task_type=status.task_type,
+        version=status.version,
+        healthy=status.healthy,
+        has_task=status.has_task,
+        joined_at=to_timestamp(status.joined_at),
+        created_at=to_timestamp(status.created_at),
+        slots=status.slots,
+        running_tasks=status.running_tasks,
+        datasets=status.datasets,
+    )
+
+
+def to_raw_worker_statuses(statuses: Iterable[WorkerStatus]) -> list[messages_pb2.WorkerStatus]:
+    return [to_raw_worker_status(status) for status in statuses]
+
+
+def from_raw_worker_status(raw_status: messages_pb2.WorkerStatus) -> WorkerStatus:
+    return WorkerStatus(
+        id=raw_status.id,
+        task_type=raw_status.task_type,
+        version=raw_status.version,
+        healthy=raw_status.healthy,
+        has_task=raw_status.has_task,
+        joined_at=from_timestamp(raw_status.joined_at) if raw_status.HasField('joined_at') else None,
+        created_at=from_timestamp(raw_status.created_at),
+        slots=raw_status.slots or 1,
+        running_tasks=raw_status.running_tasks,
+        datasets=tuple(raw_status.datasets),
+    )
+
+
+def to_raw_training_status(status: TrainingStatus) -> messages_pb2.TrainingStatus:
+    return messages_pb2.TrainingStatus(
+        name=status.name,
+        phase=status.phase,
+        progress=status.progress,
+        description=status.description,
+        is_completed=status.is_complete,
+    )
+
+
+def from_raw_training_status(raw_status: messages_pb2.TrainingStatus) -> TrainingStatus:
+    return TrainingStatus(
+        name=raw_status.name,
+        phase=raw_status.phase,
+        progress=raw_status.progress,
+        description=raw_status.description,
+        is_complete=raw_status.is_completed,
+    )
+
+
+def to_raw_worker_data(worker_data: WorkerData) -> messages_pb2.WorkerData:
+    options = struct_pb2.Struct()
+    options.update(worker_data.options)
+    return messages_pb2.WorkerData(
+        host=worker_data.host,
+        port=worker_data.port,
+        task_type=worker_data.task_type,
+        version=worker_data.version,
+        options=options
+    )
+
+
+def from_raw_worker_data(raw_data: messages_pb2.WorkerData) -> WorkerData:
+    return WorkerData(
+        host=raw_data.host,
+        port=raw_data.port,
+        task_type=raw_data.task_type,
+        version=raw_data.version,
+        options=json_format.MessageToDict(raw_data.options),
+    )
+
+
+def to_timestamp(dt: datetime | None) -> timestamp_pb2.Timestamp | None:
+    if dt is None:
+        return None
+    seconds, nanos = _to_seconds_nanos(dt)
+    return timestamp_pb2.Timestamp(seconds=seconds, nanos=nanos)
+
+
+def from_timestamp(timestamp: timestamp_pb2.Timestamp) -> datetime:
+    return _EPOCH + timedelta(seconds=timestamp.seconds, microseconds=timestamp.nanos // 1000)
+
+
+@lru_cache(maxsize=1 << 16)
+def _to_seconds_nanos(dt: datetime) -> tuple[int, int]:
+    delta = dt - (_EPOCH if dt.tzinfo is None else _EPOCH_UTC)
+    return delta.days * 86400 + delta.seconds, delta.microseconds * 1000
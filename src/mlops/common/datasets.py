@@ -0,0 +1,112 @@
+"""
+Datasets identified by their content
+
+A dataset is a directory, its manifest lists the SHA-256 digest and the size of each file, and the digest of the
+dataset is the digest of its manifest, so directories with the same files have the same digest wherever they are.
+"""
+import hashlib
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import replace
+from pathlib import Path
+from typing import NamedTuple
+
+from mlops.common.model import TrainingTask, DATASET_OPTION
+
+__ALL__ = ['DatasetFile', 'DatasetManifest', 'hash_file', 'build_manifest', 'ManifestCache', 'with_dataset']
+
+
+class DatasetFile(NamedTuple):
+    digest: str
+    size: int
+
+
+class DatasetManifest(NamedTuple):
+    digest: str
+    files: Mapping[str, DatasetFile]  # path relative to the dataset directory -> file
+
+    @classmethod
+    def from_files(cls, files: Mapping[str, DatasetFile]) -> 'DatasetManifest':
+        """
+        :param files: path -> file
+        :return: the manifest of the files, with its digest
+        """
+        sha = hashlib.sha256()
+        for path in sorted(files):
+            file = files[path]
+            sha.update(f'{path}\0{file.digest}\0{file.size}\n'.encode())
+        return cls(sha.hexdigest(), dict(files))
+
+    @property
+    def size(self) -> int:
+        return sum(file.size for file in self.files.values())
+
+
+def hash_file(path: Path) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, 'sha256').hexdigest()
+
+
+def build_manifest(root: Path) -> DatasetManifest:
+    """
+    Hash the files of a directory
+
+    :param root: the directory
+    :return: the manifest of the directory
+    """
+    return ManifestCache().get(root)
+
+
+class ManifestCache:
+    """
+    Manifests of directories, a file is hashed again only if its size or modification time changed
+
+    It's thread-safe.
+    """
+
+    _files: dict[Path, tuple[int, int, DatasetFile]]  # path -> (size, mtime_ns, file) when hashed
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def get(self, root: Path) -> DatasetManifest:
+        """
+        :param root: the directory
+        :return: the manifest of the directory
+        """
+        files = {}
+        for directory, _, names in os.walk(root):
+            for name in names:
+                path = Path(directory, name)
+                stat = path.stat()
+                with self._lock:
+                    cached = self._files.get(path)
+                if cached is None or cached[:2] != (stat.st_size, stat.st_mtime_ns):
+                    file = DatasetFile(hash_file(path), stat.st_size)
+                    with self._lock:
+                        self._files[path] = (stat.st_size, stat.st_mtime_ns, file)
+                else:
+                    file = cached[2]
+                files[path.relative_to(root).as_posix()] = file
+        return DatasetManifest.from_files(files)
+
+
+def with_dataset(task: TrainingTask, manifests: ManifestCache) -> TrainingTask:
+    """
+    Fill in the dataset of a task from its input directory, see TrainingTask.dataset
+
+    :param task: the task
+    :param manifests: cache of the manifests of the input directories
+    :return: a copy of the task with its dataset, or the task if it already has one or its input directory
+        can't be read
+    """
+    if task.dataset is not None or not task.input_dir.is_dir():
+        return task
+    try:
+        digest = manifests.get(task.input_dir).digest
+    except OSError:  # e.g. changed while listed
+        return task
+    return replace(task, config={**task.config, DATASET_OPTION: digest})
@@ -10,6 +10,12 @@ class RepoError(DomainError):
     """
 
 
+class RepoNotFoundError(RepoError):
+    """
+    Exception raised when an entity is not found in a repository.
+    """
+
+
 class RepoCreateError(RepoError):
     """
     Exception raised for errors in the creation of a repository.
@@ -0,0 +1,97 @@
+import functools
+import inspect
+import time
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
+from mlops.common.metrics import CounterChild, registry
+
+__ALL__ = ['RPC_DURATION', 'RPCS', 'instrument_servicer']
+
+RPC_DURATION = registry.histogram(
+    'mlops_rpc_duration_seconds', 'Duration of the RPCs handled, until the last message of streams',
+    ['service', 'method']
+)
+RPCS = registry.counter('mlops_rpcs_total', 'RPCs handled by status code', ['service', 'method', 'code'])
+
+ServicerType = TypeVar('ServicerType', bound=type)
+
+
+def instrument_servicer(service: str) -> Callable[[ServicerType], ServicerType]:
+    """
+    Class decorator recording the duration and the status code of every RPC method of a servicer
+
+    RPC methods are the methods defined by the class whose name starts with an uppercase letter,
+    like the methods generated in the servicer base classes. Works for sync and asyncio servicers.
+
+    :param service: the service label of the metrics
+    :return: the decorator
+    """
+
+    def decorate(cls: ServicerType) -> ServicerType:
+        for name, method in list(vars(cls).items()):
+            if name[:1].isupper() and inspect.isfunction(method):
+                setattr(cls, name, _instrument(service, name, method))
+        return cls
+
+    return decorate
+
+
+def _instrument(service: str, name: str, method: Callable) -> Callable:
+    duration = RPC_DURATION.labels(service, name)
+    counters: dict[str, CounterChild] = {}  # status code name -> counter
+
+    def record(started: float, context, failed: bool) -> None:
+        duration.observe(time.perf_counter() - started)
+        code = context.code()
+        code_name = code.name if code is not None else 'UNKNOWN' if failed else 'OK'
+        counter = counters.get(code_name)
+        if counter is None:
+            counter = counters[code_name] = RPCS.labels(service, name, code_name)
+        counter.inc()
+
+    if inspect.isasyncgenfunction(method):
+        @functools.wraps(method)
+        async def wrapper(self, request, context):
+            started = time.perf_counter()
+            failed = True
+            try:
+                async for response in method(self, request, context):
+                    yield response
+                failed = False
+            finally:
+                record(started, context, failed)
+    elif inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(self, request, context):
+            started = time.perf_counter()
+            failed = True
+            try:
+                response = await method(self, request, context)
+                failed = False
+                return response
+            finally:
+                record(started, context, failed)
+    else:
+        @functools.wraps(method)
+        def wrapper(self, request, context):
+            started = time.perf_counter()
+            try:
+                response = method(self, request, context)
+            except BaseException:
+                record(started, context, True)
+                raise
+            if isinstance(response, Iterator):  # A response stream, recorded when it ends
+                return _record_stream(response, lambda failed: record(started, context, failed))
+            record(started, context, False)
+            return response
+    return wrapper
+
+
+def _record_stream(responses: Iterator, record: Callable[[bool], None]) -> Iterator:
+    failed = True
+    try:
+        yield from responses
+        failed = False
+    finally:
+        record(failed)
@@ -0,0 +1,282 @@
+"""
+gRPC interceptors propagating the trace id in the metadata and timing the phases of the calls
+
+Servers time the 'deserialize' and 'handler' phases of each call, under the trace id sent by the client or a new one,
+and send the trace id back in the trailing metadata. Clients send the trace id of the call being handled, so a call
+from the cluster to a worker carries the trace id of the RPC that triggered it, and time their calls as a phase of it.
+"""
+import collections
+import functools
+import inspect
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import grpc
+
+from mlops.common.tracing import Trace, SlowCallProfiler, current_trace, new_trace_id, trace_phase
+
+__ALL__ = [
+    'TRACE_ID_METADATA_KEY',
+    'TracingServerInterceptor',
+    'AsyncTracingServerInterceptor',
+    'TracingClientInterceptor',
+    'AsyncTracingClientInterceptor'
+]
+
+TRACE_ID_METADATA_KEY = 'x-trace-id'
+
+
+class _CallTracer:
+    """
+    Trace of a single server call, the deserialization of its requests may happen before it's started
+    """
+
+    __slots__ = ('method', 'trace_id', 'profiler', 'trace', '_deserialize_sec')
+
+    def __init__(self, method: str, trace_id: str, profiler: SlowCallProfiler | None):
+        self.method = method
+        self.trace_id = trace_id
+        self.profiler = profiler
+        self.trace: Trace | None = None
+        self._deserialize_sec = 0.
+
+    def wrap_deserializer(self, deserializer: Callable[[bytes], Any] | None) -> Callable[[bytes], Any] | None:
+        if deserializer is None:
+            return None
+
+        def deserialize(data: bytes) -> Any:
+            started = time.perf_counter()
+            try:
+                return deserializer(data)
+            finally:
+                elapsed = time.perf_counter() - started
+                if self.trace is None:
+                    self._deserialize_sec += elapsed
+                else:
+                    self.trace.add_phase('deserialize', elapsed)
+
+        return deserialize
+
+    def start(self, context, awaitable: Any = None) -> tuple[Any, Any]:
+        """
+        Start the trace in the current thread or task
+
+        :param context: the servicer context of the call
+        :param awaitable: the coroutine or async generator handling an asyncio call
+        :return: token and profile to pass to finish
+        """
+        self.trace = trace = Trace(self.trace_id, self.method, awaitable)
+        if self._deserialize_sec:
+            trace.add_phase('deserialize', self._deserialize_sec)
+        context.set_trailing_metadata(((TRACE_ID_METADATA_KEY, self.trace_id),))
+        token = trace.activate()
+        profile = self.profiler.start(trace) if self.profiler is not None else None
+        return token, profile
+
+    def finish(self, handler_started: float, token: Any, profile: Any) -> None:
+        trace = self.trace
+        trace.add_phase('handler', time.perf_counter() - handler_started)
+        if self.profiler is not None:
+            self.profiler.finish(trace, profile)
+        Trace.deactivate(token)
+
+
+def _get_trace_id(metadata) -> str:
+    for key, value in metadata or ():
+        if key == TRACE_ID_METADATA_KEY:
+            return value
+    return new_trace_id()
+
+
+def _handler_behavior_name(handler: grpc.RpcMethodHandler) -> str:
+    if handler.request_streaming:
+        return 'stream_stream' if handler.response_streaming else 'stream_unary'
+    return 'unary_stream' if handler.response_streaming else 'unary_unary'
+
+
+class TracingServerInterceptor(grpc.ServerInterceptor):
+    """
+    Trace the calls of a sync server
+
+    :param profiler: captures the stack samples or profile of the slow calls, not captured if None
+    """
+
+    def __init__(self, profiler: SlowCallProfiler | None = None):
+        self.profiler = profiler
+
+    def intercept_service(self, continuation, handler_call_details: grpc.HandlerCallDetails):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        tracer = _CallTracer(
+            handler_call_details.method, _get_trace_id(handler_call_details.invocation_metadata), self.profiler
+        )
+        name = _handler_behavior_name(handler)
+        return handler._replace(**{
+            'request_deserializer': tracer.wrap_deserializer(handler.request_deserializer),
+            name: _trace_behavior(tracer, getattr(handler, name), handler.response_streaming),
+        })
+
+
+def _trace_behavior(tracer: _CallTracer, behavior: Callable, response_streaming: bool) -> Callable:
+    if response_streaming:
+        @functools.wraps(behavior)
+        def traced(request, context) -> Iterator:
+            token, profile = tracer.start(context)
+            started = time.perf_counter()
+            try:
+                yield from behavior(request, context)
+            finally:
+                tracer.finish(started, token, profile)
+    else:
+        @functools.wraps(behavior)
+        def traced(request, context):
+            token, profile = tracer.start(context)
+            started = time.perf_counter()
+            try:
+                return behavior(request, context)
+            finally:
+                tracer.finish(started, token, profile)
+    return traced
+
+
+class AsyncTracingServerInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Trace the calls of an asyncio server
+
+    :param profiler: captures the stack samples or profile of the slow calls, not captured if None
+    """
+
+    def __init__(self, profiler: SlowCallProfiler | None = None):
+        self.profiler = profiler
+
+    async def intercept_service(self, continuation, handler_call_details: grpc.HandlerCallDetails):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        tracer = _CallTracer(
+            handler_call_details.method, _get_trace_id(handler_call_details.invocation_metadata), self.profiler
+        )
+        name = _handler_behavior_name(handler)
+        return handler._replace(**{
+            'request_deserializer': tracer.wrap_deserializer(handler.request_deserializer),
+            name: _trace_async_behavior(tracer, getattr(handler, name)),
+        })
+
+
+def _trace_async_behavior(tracer: _CallTracer, behavior: Callable) -> Callable:
+    if inspect.isasyncgenfunction(behavior):
+        @functools.wraps(behavior)
+        async def traced(request, context):
+            responses = behavior(request, context)
+            token, profile = tracer.start(context, responses)
+            started = time.perf_counter()
+            try:
+                async for response in responses:
+                    yield response
+            finally:
+                tracer.finish(started, token, profile)
+    else:
+        @functools.wraps(behavior)
+        async def traced(request, context):
+            coroutine = behavior(request, context)
+            token, profile = tracer.start(context, coroutine)
+            started = time.perf_counter()
+            try:
+                return await coroutine
+            finally:
+                tracer.finish(started, token, profile)
+    return traced
+
+
+class _ClientCallDetails(
+    collections.namedtuple(
+        '_ClientCallDetails', ('method', 'timeout', 'metadata', 'credentials', 'wait_for_ready', 'compression')
+    ),
+    grpc.ClientCallDetails
+):
+    pass
+
+
+def _current_trace_id() -> str:
+    trace = current_trace()
+    return trace.trace_id if trace is not None else new_trace_id()
+
+
+def _with_trace_id(client_call_details: grpc.ClientCallDetails) -> _ClientCallDetails:
+    return _ClientCallDetails(
+        client_call_details.method,
+        client_call_details.timeout,
+        [*(client_call_details.metadata or ()), (TRACE_ID_METADATA_KEY, _current_trace_id())],
+        client_call_details.credentials,
+        client_call_details.wait_for_ready,
+        client_call_details.compression
+    )
+
+
+def _with_async_trace_id(client_call_details: grpc.aio.ClientCallDetails) -> grpc.aio.ClientCallDetails:
+    metadata = grpc.aio.Metadata(*(client_call_details.metadata or ()))
+    metadata.add(TRACE_ID_METADATA_KEY, _current_trace_id())
+    return client_call_details._replace(metadata=metadata)
+
+
+class TracingClientInterceptor(
+    grpc.UnaryUnaryClientInterceptor,
+    grpc.UnaryStreamClientInterceptor,
+    grpc.StreamUnaryClientInterceptor,
+    grpc.StreamStreamClientInterceptor
+):
+    """
+    Send the trace id of the call being handled, or a new one, with the calls of a sync channel,
+    e.g. grpc.intercept_channel(channel, TracingClientInterceptor('worker_call'))
+
+    Blocking unary calls are timed as a phase of the call being handled.
+
+    :param phase: name of the phase
+    """
+
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        with trace_phase(self.phase):
+            return continuation(_with_trace_id(client_call_details), request)
+
+    def intercept_unary_stream(self, continuation, client_call_details, request):
+        return continuation(_with_trace_id(client_call_details), request)
+
+    def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        return continuation(_with_trace_id(client_call_details), request_iterator)
+
+    def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        return continuation(_with_trace_id(client_call_details), request_iterator)
+
+
+class AsyncTracingClientInterceptor(
+    grpc.aio.UnaryUnaryClientInterceptor,
+    grpc.aio.UnaryStreamClientInterceptor,
+    grpc.aio.StreamUnaryClientInterceptor,
+    grpc.aio.StreamStreamClientInterceptor
+):
+    """
+    Asynchronous counterpart of TracingClientInterceptor, pass it in the interceptors of a grpc.aio channel
+    """
+
+    def __init__(self, phase: str):
+        self.phase = phase
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        with trace_phase(self.phase):
+            call = await continuation(_with_async_trace_id(client_call_details), request)
+            await call  # Time the whole call, the response is kept by the call
+        return call
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        return await continuation(_with_async_trace_id(client_call_details), request)
+
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        return await continuation(_with_async_trace_id(client_call_details), request_iterator)
+
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        return await continuation(_with_async_trace_id(client_call_details), request_iterator)
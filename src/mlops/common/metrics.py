@@ -0,0 +1,348 @@
+"""
+Metrics registry with counters, gauges and histograms, exposed in the Prometheus text format
+
+Recording does not take a lock: each thread records into its own cell of a metric, and a scrape sums the cells.
+A lock is only taken the first time a thread records into a metric, when a new label set is used, by scrapes,
+and when a thread ends: its cells are folded into the base values of their metrics, so they don't pile up.
+Metrics are defined once at module level, e.g. REQUESTS = registry.counter('requests_total', 'Requests handled').
+"""
+import bisect
+import math
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Sequence
+from typing import Generic, TypeVar
+
+__ALL__ = ['Counter', 'Gauge', 'Histogram', 'MetricsRegistry', 'registry', 'CONTENT_TYPE']
+
+# Content type of MetricsRegistry.expose
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1., 2.5, 5., 10.)
+
+Sample = tuple[str, dict[str, str], float]  # (name suffix, labels, value)
+
+
+class _ThreadEnd:
+    """
+    Kept in a thread-local next to the cell of the thread, it's collected when the thread ends
+    """
+
+    __slots__ = ('__weakref__',)
+
+
+class _Cells:
+    """
+    Per-thread cells of a metric, each written by its own thread only
+
+    The cell of an ended thread is added to the base values and dropped.
+    """
+
+    __slots__ = ('size', '_local', '_cells', '_base', '_lock')
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._cells: dict[int, list[float]] = {}  # id of the cell -> cell of a live thread
+        self._base = [0.] * size  # the sum of the cells of the ended threads
+        self._lock = threading.Lock()
+
+    def get(self) -> list[float]:
+        cell = getattr(self._local, 'cell', None)
+        if cell is None:
+            cell = self._local.cell = [0.] * self.size
+            thread_end = self._local.thread_end = _ThreadEnd()
+            with self._lock:
+                self._cells[id(cell)] = cell
+            weakref.finalize(thread_end, self._fold, cell)
+        return cell
+
+    def sum(self) -> list[float]:
+        with self._lock:
+            return [sum(values) for values in zip(self._base, *self._cells.values())]
+
+    def _fold(self, cell: list[float]) -> None:
+        with self._lock:
+            del self._cells[id(cell)]
+            for i, value in enumerate(cell):
+                self._base[i] += value
+
+
+class CounterChild:
+    __slots__ = ('_cells',)
+
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.) -> None:
+        self._cells.get()[0] += amount
+
+    def value(self) -> float:
+        return self._cells.sum()[0]
+
+
+class GaugeChild:
+    __slots__ = ('_cells', '_function')
+
+    def __init__(self):
+        self._cells = _Cells(1)
+        self._function: Callable[[], float] | None = None
+
+    def inc(self, amount: float = 1.) -> None:
+        self._cells.get()[0] += amount
+
+    def dec(self, amount: float = 1.) -> None:
+        self._cells.get()[0] -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """
+        Read the value from a function at each scrape instead, e.g. the length of a queue
+
+        :param function: returns the current value
+        """
+        self._function = function
+
+    def value(self) -> float:
+        if self._function is not None:
+            return float(self._function())
+        return self._cells.sum()[0]
+
+
+class HistogramChild:
+    __slots__ = ('bounds', '_cells')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        # Count of each bucket, the last one above every bound, then the sum of the observed values
+        self._cells = _Cells(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.get()
+        cell[bisect.bisect_left(self.bounds, value)] += 1
+        cell[-1] += value
+
+    def time(self) -> '_Timer':
+        """
+        Observe the duration of a with block in seconds
+        """
+        return _Timer(self)
+
+    def snapshot(self) -> tuple[list[float], float]:
+        """
+        :return: cumulative count of each bucket, the last one is the total count, and the sum of the values
+        """
+        values = self._cells.sum()
+        counts, total = values[:-1], values[-1]
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        return counts, total
+
+
+class _Timer:
+    __slots__ = ('_histogram', '_started')
+
+    def __init__(self, histogram: HistogramChild):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._histogram.observe(time.perf_counter() - self._started)
+
+
+ChildType = TypeVar('ChildType', CounterChild, GaugeChild, HistogramChild)
+
+
+class _Metric(ABC, Generic[ChildType]):
+    """
+    A metric and its children, one per label set, an unlabeled metric has a single child
+    """
+
+    TYPE: str
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], ChildType] = {}
+        self._lock = threading.Lock()
+        self._default = self._new_child() if not self.labelnames else None
+
+    def labels(self, *values: str) -> ChildType:
+        """
+        Get the child of a label set, keep it to record without looking it up again
+
+        :param values: the label values, in the order of labelnames
+        :return: the child metric
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f'{self.name} expects labels {self.labelnames}')
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def collect(self) -> Iterator[Sample]:
+        if self._default is not None:
+            yield from self._collect_child(self._default, {})
+            return
+        with self._lock:
+            children = list(self._children.items())
+        for values, child in children:
+            yield from self._collect_child(child, dict(zip(self.labelnames, values)))
+
+    def _get_default(self) -> ChildType:
+        if self._default is None:
+            raise ValueError(f'{self.name} has labels, use labels()')
+        return self._default
+
+    @abstractmethod
+    def _new_child(self) -> ChildType:
+        """
+        :return: a new child of the metric, for a label set
+        """
+
+    def _collect_child(self, child: ChildType, labels: dict[str, str]) -> Iterator[Sample]:
+        yield '', labels, child.value()
+
+
+class Counter(_Metric[CounterChild]):
+    TYPE = 'counter'
+
+    def inc(self, amount: float = 1.) -> None:
+        self._get_default().inc(amount)
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+
+class Gauge(_Metric[GaugeChild]):
+    TYPE = 'gauge'
+
+    def inc(self, amount: float = 1.) -> None:
+        self._get_default().inc(amount)
+
+    def dec(self, amount: float = 1.) -> None:
+        self._get_default().dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._get_default().set_function(function)
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+
+class Histogram(_Metric[HistogramChild]):
+    TYPE = 'histogram'
+
+    def __init__(
+            self,
+            name: str,
+            help_text: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def observe(self, value: float) -> None:
+        self._get_default().observe(value)
+
+    def time(self) -> _Timer:
+        return self._get_default().time()
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.bounds)
+
+    def _collect_child(self, child: HistogramChild, labels: dict[str, str]) -> Iterator[Sample]:
+        counts, total = child.snapshot()
+        for bound, count in zip((*self.bounds, math.inf), counts):
+            yield '_bucket', {**labels, 'le': _format_value(bound)}, count
+        yield '_sum', labels, total
+        yield '_count', labels, counts[-1]
+
+
+MetricType = TypeVar('MetricType', Counter, Gauge, Histogram)
+
+
+class MetricsRegistry:
+    """
+    Registry of the metrics of a process
+
+    Defining a metric again returns the existing one, so modules can define their metrics independently.
+    It's thread-safe.
+    """
+
+    _metrics: dict[str, Counter | Gauge | Histogram]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(
+            self,
+            name: str,
+            help_text: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def expose(self) -> str:
+        """
+        Render every metric in the Prometheus text format, see CONTENT_TYPE
+
+        :return: the metrics
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {_escape(metric.help_text, quotes=False)}')
+            lines.append(f'# TYPE {metric.name} {metric.TYPE}')
+            for suffix, labels, value in metric.collect():
+                lines.append(f'{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def _register(self, metric_type: type[MetricType], name: str, help_text: str, labelnames, **kwargs) -> MetricType:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_type(name, help_text, labelnames, **kwargs)
+            elif type(metric) is not metric_type or metric.labelnames != tuple(labelnames):
+                raise ValueError(f'metric {name} is already defined as another {metric.TYPE}')
+            return metric
+
+
+# The registry of the process
+registry = MetricsRegistry()
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _escape(text: str, quotes: bool = True) -> str:
+    # Help texts escape backslashes and line feeds, label values also escape double quotes
+    text = text.replace('\\', r'\\').replace('\n', r'\n')
+    return text.replace('"', r'\"') if quotes else text
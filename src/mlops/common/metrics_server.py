@@ -0,0 +1,43 @@
+import threading
+
+from flask import Flask, Response, jsonify
+from werkzeug.serving import BaseWSGIServer, make_server
+
+from mlops.common.metrics import MetricsRegistry, CONTENT_TYPE, registry as default_registry
+from mlops.common.tracing import slow_call_log
+
+__ALL__ = ['create_metrics_app', 'start_metrics_server']
+
+
+def create_metrics_app(registry: MetricsRegistry = default_registry) -> Flask:
+    """
+    Create a Flask app serving the metrics of a registry at /metrics, and the slow call log at /debug/slow_calls
+
+    :param registry: the registry to expose
+    :return: Flask app
+    """
+    app = Flask(__name__)
+
+    @app.get('/metrics')
+    def metrics() -> Response:
+        return Response(registry.expose(), content_type=CONTENT_TYPE)
+
+    @app.get('/debug/slow_calls')
+    def slow_calls() -> Response:
+        return jsonify(slow_call_log.get_all())
+
+    return app
+
+
+def start_metrics_server(host: str, port: int, registry: MetricsRegistry = default_registry) -> BaseWSGIServer:
+    """
+    Serve the metrics of a registry from a daemon thread
+
+    :param host: the host to bind to
+    :param port: the port to bind to
+    :param registry: the registry to expose
+    :return: the server, call shutdown to stop it
+    """
+    server = make_server(host, port, create_metrics_app(registry), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True, name='metrics-server').start()
+    return server
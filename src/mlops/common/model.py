@@ -1,12 +1,13 @@
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, TypeVar
+from typing import Any, NamedTuple, TypeVar
 
 from typing_extensions import Generic
 
 
-@dataclass
+@dataclass(slots=True)
 class TrainingStatus:
     name: str
     phase: str
@@ -15,7 +16,7 @@ class TrainingStatus:
     is_complete: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkerStatus:
     id: str
     task_type: str
@@ -24,9 +25,61 @@ class WorkerStatus:
     has_task: bool
     joined_at: datetime | None
     created_at: datetime
+    slots: int = 1  # number of tasks the worker can run at once
+    running_tasks: int = 0
+    datasets: tuple[str, ...] = ()  # digests of the datasets cached by the worker
 
+    @property
+    def free_slots(self) -> int:
+        # Workers with a single slot may only report has_task
+        return self.slots - max(self.running_tasks, int(self.has_task))
 
-@dataclass
+
+# Key of WorkerData.options holding the number of tasks the worker can run at once, 1 if not set
+SLOTS_OPTION = 'slots'
+# Key of WorkerData.options holding the resources of the worker, and of TrainingTask.config holding
+# the resources required by the task, both mappings of Resources field names to amounts
+RESOURCES_OPTION = 'resources'
+# Key of WorkerData.options holding the digests of the datasets cached by the worker when it checked in,
+# the status reports carry the current ones
+DATASETS_OPTION = 'datasets'
+# Key of TrainingTask.config holding the digest of the input directory of the task, see mlops.common.datasets
+DATASET_OPTION = 'dataset'
+
+
+class Resources(NamedTuple):
+    cpus: float = 0.
+    memory_mb: float = 0.
+    disk_mb: float = 0.
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> 'Resources':
+        """
+        Read resources from a mapping of field names to amounts, a missing resource is 0
+
+        :param data: the mapping, e.g. the RESOURCES_OPTION of the worker options
+        :return: Resources object
+        """
+        resources = cls(*(float(data.get(name, 0.)) for name in cls._fields))
+        if any(amount < 0 for amount in resources):
+            raise ValueError(f'invalid resources: {data}')
+        return resources
+
+    def fits(self, capacity: 'Resources') -> bool:
+        """
+        :param capacity: the available resources
+        :return: True if every resource is at most as large as in capacity
+        """
+        return all(amount <= available for amount, available in zip(self, capacity))
+
+    def plus(self, other: 'Resources') -> 'Resources':
+        return Resources(*(a + b for a, b in zip(self, other)))
+
+    def minus(self, other: 'Resources') -> 'Resources':
+        return Resources(*(a - b for a, b in zip(self, other)))
+
+
+@dataclass(slots=True)
 class WorkerData:
     host: str
     port: int
@@ -49,3 +102,13 @@ class TrainingTask(Generic[IdType]):
     config: dict[str, Any]
     created_at: datetime
     updated_at: datetime | None
+
+    @property
+    def requirements(self) -> Resources:
+        # Tasks without requirements fit any worker
+        return Resources.from_mapping(self.config.get(RESOURCES_OPTION, {}))
+
+    @property
+    def dataset(self) -> str | None:
+        # Digest of the input directory, if known
+        return self.config.get(DATASET_OPTION)
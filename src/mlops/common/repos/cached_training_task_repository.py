@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from mlops.common.model import TrainingTask
+from mlops.common.repos.interfaces import TrainingTaskRepositoryBase
+
+__ALL__ = ['CacheStats', 'CachedTrainingTaskRepository']
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class _CacheEntry(NamedTuple):
+    task: TrainingTask[int]
+    expires_at: float
+
+
+class CachedTrainingTaskRepository(TrainingTaskRepositoryBase):
+    """
+    Read-through cache in front of another training task repository
+
+    Tasks are kept in a bounded LRU cache and expire after a fixed time to live.
+    A task is invalidated when it's updated through this repository.
+    Each invalidation bumps a generation, and a task read before a bump is not cached, so a read racing an update
+    can not cache the task as it was before the update.
+    It's thread-safe.
+    """
+
+    _cache: OrderedDict[int, _CacheEntry]
+    _generation: int  # bumped when tasks are invalidated
+    _lock: threading.Lock
+
+    def __init__(self, repo: TrainingTaskRepositoryBase, max_size: int = 4096, ttl_sec: float = 300.):
+        """
+        :param repo: the repository to cache
+        :param max_size: maximum number of tasks kept in the cache
+        :param ttl_sec: seconds a task is kept in the cache after it's fetched
+        """
+        self.repo = repo
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        self._cache = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_by_id(self, task_id: int) -> TrainingTask[int]:
+        generation = self._get_generation()
+        task = self._get_cached(task_id)
+        if task is not None:
+            return task
+
+        task = self.repo.get_by_id(task_id)
+        self._put([task], generation)
+        return task
+
+    def get_by_ids(self, task_ids: Iterable[int]) -> dict[int, TrainingTask[int]]:
+        generation = self._get_generation()
+        tasks = {}
+        missing = []
+        for task_id in task_ids:
+            task = self._get_cached(task_id)
+            if task is None:
+                missing.append(task_id)
+            else:
+                tasks[task_id] = task
+
+        if missing:
+            fetched = self.repo.get_by_ids(missing)
+            self._put(fetched.values(), generation)
+            tasks.update(fetched)
+        return tasks
+
+    def create(self, task: TrainingTask[None]) -> TrainingTask[int]:
+        return self.repo.create(task)
+
+    def update(self, task: TrainingTask[int]) -> TrainingTask[int]:
+        self.invalidate(task.id)
+        try:
+            return self.repo.update(task)
+        finally:
+            # Drop the task cached by a concurrent read, and keep the reads in flight from caching it
+            self.invalidate(task.id)
+
+    def invalidate(self, task_id: int) -> None:
+        """
+        Remove a task from the cache
+
+        :param task_id: id of the task
+        """
+        with self._lock:
+            self._cache.pop(task_id, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        """
+        Remove all tasks from the cache
+        """
+        with self._lock:
+            self._cache.clear()
+            self._generation += 1
+
+    def stats(self) -> CacheStats:
+        """
+        Get the cache statistics
+
+        :return: CacheStats object
+        """
+        with self._lock:
+            return CacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions, size=len(self._cache))
+
+    def _get_cached(self, task_id: int) -> TrainingTask[int] | None:
+        with self._lock:
+            entry = self._cache.get(task_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._cache[task_id]
+                self._evictions += 1
+                self._misses += 1
+                return None
+            self._cache.move_to_end(task_id)
+            self._hits += 1
+            return entry.task
+
+    def _get_generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def _put(self, tasks: Iterable[TrainingTask[int]], generation: int) -> None:
+        """
+        Cache tasks read from the repository, unless tasks were invalidated since
+
+        :param generation: the generation before the tasks were read
+        """
+        with self._lock:
+            if generation != self._generation:
+                return
+            expires_at = time.monotonic() + self.ttl_sec
+            for task in tasks:
+                self._cache[task.id] = _CacheEntry(task=task, expires_at=expires_at)
+                self._cache.move_to_end(task.id)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self._evictions += 1
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 
+from mlops.common.exc import RepoNotFoundError
 from mlops.common.model import TrainingTask
 
 
@@ -12,9 +14,30 @@ class TrainingTaskRepositoryBase(ABC):
 
         :param task_id: id of the task
         :return: TrainingTask object
+        :raises RepoNotFoundError: when the task does not exist
         :raises RepoError: when task retrieval fails
         """
 
+    def get_by_ids(self, task_ids: Iterable[int]) -> dict[int, TrainingTask[int]]:
+        """
+        Get multiple tasks by their ids
+
+        Tasks that do not exist are omitted from the result.
+        The default implementation calls get_by_id for each id,
+        implementations should override it to fetch all the tasks at once.
+
+        :param task_ids: ids of the tasks
+        :return: dict mapping task id to TrainingTask object
+        :raises RepoError: when task retrieval fails
+        """
+        tasks = {}
+        for task_id in task_ids:
+            try:
+                tasks[task_id] = self.get_by_id(task_id)
+            except RepoNotFoundError:
+                pass
+        return tasks
+
     @abstractmethod
     def create(self, task: TrainingTask[None]) -> TrainingTask[int]:
         """
@@ -0,0 +1,166 @@
+from collections.abc import Iterable
+from dataclasses import replace
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import (
+    JSON, BigInteger, Column, DateTime, Engine, Index, Integer, MetaData, Row, String, Table, bindparam,
+    create_engine, insert, select, update
+)
+from sqlalchemy.exc import SQLAlchemyError
+
+from mlops.common.exc import RepoError, RepoNotFoundError, RepoCreateError, RepoUpdateError
+from mlops.common.model import TrainingTask
+from mlops.common.repos.interfaces import TrainingTaskRepositoryBase
+
+__ALL__ = ['metadata', 'training_tasks_table', 'create_pooled_engine', 'SQLAlchemyTrainingTaskRepository']
+
+metadata = MetaData()
+
+training_tasks_table = Table(
+    'training_tasks',
+    metadata,
+    Column('id', BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True),
+    Column('name', String(255), nullable=False),
+    Column('input_dir', String(4096), nullable=False),
+    Column('output_dir', String(4096), nullable=False),
+    Column('task_type', String(64), nullable=False),
+    Column('version', String(64), nullable=False),
+    Column('config', JSON, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=True),
+    # Covers lookups by task type alone and by task type ordered/filtered by creation time
+    Index('ix_training_tasks_task_type_created_at', 'task_type', 'created_at'),
+    Index('ix_training_tasks_created_at', 'created_at'),
+)
+
+
+def create_pooled_engine(
+        url: str,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 5.,
+        pool_recycle: int = 1800,
+        **kwargs: Any
+) -> Engine:
+    """
+    Create an engine with a connection pool tuned for the cluster
+
+    Connections are reused in LIFO order so idle connections beyond the working set can be recycled by the server,
+    and are checked before being handed out so a restarted database does not surface as a failed dispatch.
+
+    :param url: database url
+    :param pool_size: number of connections kept open in the pool
+    :param max_overflow: number of connections allowed to be opened beyond pool_size under load
+    :param pool_timeout: seconds to wait for a connection before giving up
+    :param pool_recycle: seconds after which a connection is replaced
+    :param kwargs: other arguments passed to sqlalchemy.create_engine
+    :return: Engine object
+    """
+    return create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+        **kwargs
+    )
+
+
+class SQLAlchemyTrainingTaskRepository(TrainingTaskRepositoryBase):
+    """
+    Training task repository backed by a SQL database through SQLAlchemy core
+
+    Statements are built once with bound parameters, so they are compiled once per engine
+    and reused from SQLAlchemy's compiled cache (and from the driver's prepared statements if it has any).
+    """
+
+    MAX_IDS_PER_QUERY = 1000
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        table = training_tasks_table
+        self._get_by_id_stmt = select(table).where(table.c.id == bindparam('task_id'))
+        self._get_by_ids_stmt = select(table).where(table.c.id.in_(bindparam('task_ids', expanding=True)))
+        self._insert_stmt = insert(table)
+        self._update_stmt = update(table).where(table.c.id == bindparam('task_id'))
+
+    def create_tables(self) -> None:
+        """
+        Create the tables used by the repository if they do not exist
+        """
+        metadata.create_all(self.engine)
+
+    def get_by_id(self, task_id: int) -> TrainingTask[int]:
+        try:
+            with self.engine.connect() as conn:
+                row = conn.execute(self._get_by_id_stmt, {'task_id': task_id}).one_or_none()
+        except SQLAlchemyError as e:
+            raise RepoError(f'failed to get training task {task_id}') from e
+
+        if row is None:
+            raise RepoNotFoundError(f'training task {task_id} not found')
+        return self._to_task(row)
+
+    def get_by_ids(self, task_ids: Iterable[int]) -> dict[int, TrainingTask[int]]:
+        task_ids = iter(dict.fromkeys(task_ids))  # Deduplicate and keep order
+        tasks = {}
+        try:
+            with self.engine.connect() as conn:
+                while chunk := list(islice(task_ids, self.MAX_IDS_PER_QUERY)):
+                    for row in conn.execute(self._get_by_ids_stmt, {'task_ids': chunk}):
+                        tasks[row.id] = self._to_task(row)
+        except SQLAlchemyError as e:
+            raise RepoError('failed to get training tasks') from e
+        return tasks
+
+    def create(self, task: TrainingTask[None]) -> TrainingTask[int]:
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(self._insert_stmt, self._to_values(task))
+        except SQLAlchemyError as e:
+            raise RepoCreateError('failed to create training task') from e
+        return replace(task, id=result.inserted_primary_key[0])
+
+    def update(self, task: TrainingTask[int]) -> TrainingTask[int]:
+        task = replace(task, updated_at=datetime.now())
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(self._update_stmt, {'task_id': task.id, **self._to_values(task)})
+        except SQLAlchemyError as e:
+            raise RepoUpdateError(f'failed to update training task {task.id}') from e
+
+        if result.rowcount == 0:
+            raise RepoUpdateError(f'training task {task.id} not found')
+        return task
+
+    @staticmethod
+    def _to_values(task: TrainingTask) -> dict[str, Any]:
+        return {
+            'name': task.name,
+            'input_dir': str(task.input_dir),
+            'output_dir': str(task.output_dir),
+            'task_type': task.task_type,
+            'version': task.version,
+            'config': task.config,
+            'created_at': task.created_at,
+            'updated_at': task.updated_at,
+        }
+
+    @staticmethod
+    def _to_task(row: Row) -> TrainingTask[int]:
+        return TrainingTask(
+            id=row.id,
+            name=row.name,
+            input_dir=Path(row.input_dir),
+            output_dir=Path(row.output_dir),
+            task_type=row.task_type,
+            version=row.version,
+            config=row.config,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
@@ -0,0 +1,306 @@
+"""
+Traces of the RPCs: a trace id propagated between processes, the time spent in each phase of a call,
+and the stack samples or profile of the slow calls
+
+The trace of the running call is held in a context variable, so it follows the call across threads started with
+contextvars.copy_context().run and across asyncio tasks. Code on the path of a call records its phases with
+trace_phase, which does nothing outside a traced call. See mlops.common.grpc_tracing for the interceptors.
+"""
+import collections
+import contextvars
+import heapq
+import itertools
+import logging
+import sys
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import cProfile
+
+__ALL__ = [
+    'Trace', 'current_trace', 'new_trace_id', 'trace_phase', 'SlowCallLog', 'SlowCallProfiler', 'slow_call_log'
+]
+
+logger = logging.getLogger(__name__)
+
+_current_trace: contextvars.ContextVar['Trace | None'] = contextvars.ContextVar('mlops_trace', default=None)
+
+
+class Trace:
+    """
+    The trace of a call being handled
+    """
+
+    __slots__ = (
+        'trace_id', 'method', 'started', 'started_at', 'phases', 'thread_id', 'awaitable', 'samples', 'profile', 'finished',
+        '_lock'
+    )
+
+    def __init__(self, trace_id: str, method: str, awaitable: Any = None):
+        """
+        :param trace_id: the id of the trace, shared by the calls made to handle the call
+        :param method: the full name of the called method
+        :param awaitable: the coroutine or async generator handling an asyncio call, None for a sync call
+        """
+        self.trace_id = trace_id
+        self.method = method
+        self.started = time.perf_counter()
+        self.started_at = datetime.now()
+        self.phases: dict[str, float] = {}  # phase -> seconds spent in it
+        self.thread_id = threading.get_ident()
+        self.awaitable = awaitable
+        self.samples: list[str] = []  # stacks sampled while the call was slow
+        self.profile: str | None = None
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        # Phases may be recorded by the threads a call fans out to
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def activate(self) -> contextvars.Token:
+        """
+        Make this trace the current trace
+
+        :return: token to pass to deactivate
+        """
+        return _current_trace.set(self)
+
+    @staticmethod
+    def deactivate(token: contextvars.Token) -> None:
+        _current_trace.reset(token)
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class _Phase:
+    __slots__ = ('_trace', '_phase', '_started')
+
+    def __init__(self, trace: Trace, phase: str):
+        self._trace = trace
+        self._phase = phase
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._trace.add_phase(self._phase, time.perf_counter() - self._started)
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def trace_phase(phase: str) -> _Phase | _NoPhase:
+    """
+    Record the time spent in a with block as a phase of the current call, e.g. 'storage'
+
+    :param phase: name of the phase, the time of blocks with the same name is summed
+    :return: context manager
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NO_PHASE
+    return _Phase(trace, phase)
+
+
+class SlowCallLog:
+    """
+    The last slow calls, oldest first.
+    It's thread-safe.
+    """
+
+    def __init__(self, max_records: int = 100):
+        self._records: collections.deque[dict[str, Any]] = collections.deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def add(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def get_all(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._records)
+
+
+# The slow call log of the process
+slow_call_log = SlowCallLog()
+
+
+class SlowCallProfiler:
+    """
+    Capture why the calls slower than a threshold are slow
+
+    In 'stack' mode, a watchdog thread samples the stack of each call still running at the threshold,
+    then every sample_interval_sec until it ends, so calls faster than the threshold cost a heap push.
+    The stack of an asyncio call is the chain of coroutines its handler is suspended in.
+    In 'cprofile' mode, each call runs under cProfile and the profile of the slow calls is kept. It's costly,
+    and cProfile profiles a whole thread, so a thread profiles one call at a time and the profile of an asyncio call
+    includes the other tasks of the event loop.
+
+    Slow calls are logged as warnings and added to the slow call log.
+    """
+
+    _heap: list[tuple[float, int, Trace]]  # (deadline of the next sample, sequence, trace)
+    _cond: threading.Condition
+    _counter: itertools.count
+    _profiling: threading.local
+    _watchdog_thread: threading.Thread | None
+
+    def __init__(
+            self,
+            threshold_sec: float = 1.,
+            mode: str = 'stack',
+            sample_interval_sec: float = .1,
+            max_samples: int = 20,
+            log: SlowCallLog = slow_call_log
+    ):
+        if mode not in ('stack', 'cprofile'):
+            raise ValueError(f'invalid mode: {mode}')
+        self.threshold_sec = threshold_sec
+        self.mode = mode
+        self.sample_interval_sec = sample_interval_sec
+        self.max_samples = max_samples
+        self.log = log
+        self._heap = []
+        self._cond = threading.Condition()
+        self._counter = itertools.count()
+        self._profiling = threading.local()
+        self._watchdog_thread = None
+
+    def start(self, trace: Trace) -> 'cProfile.Profile | None':
+        """
+        Watch a call starting
+
+        :param trace: the trace of the call
+        :return: the profiler of the call in 'cprofile' mode, pass it to finish
+        """
+        if self.mode == 'cprofile':
+            if getattr(self._profiling, 'active', False):
+                return None  # Profiling another call of this thread
+            import cProfile  # Only loaded in 'cprofile' mode, the worker only uses the trace ids
+            self._profiling.active = True
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+
+        with self._cond:
+            if self._watchdog_thread is None:
+                self._watchdog_thread = threading.Thread(target=self._watch, daemon=True, name='slow-call-watchdog')
+                self._watchdog_thread.start()
+            heapq.heappush(self._heap, (time.monotonic() + self.threshold_sec, next(self._counter), trace))
+            if self._heap[0][2] is trace:
+                self._cond.notify()
+        return None
+
+    def finish(self, trace: Trace, profile: 'cProfile.Profile | None' = None) -> None:
+        """
+        Watch a call ending, its heap entry is skipped lazily
+
+        :param trace: the trace of the call
+        :param profile: the profiler returned by start
+        """
+        elapsed = trace.elapsed()
+        trace.finished = True
+        if profile is not None:
+            profile.disable()
+            self._profiling.active = False
+            if elapsed >= self.threshold_sec:
+                trace.profile = _format_profile(profile)
+        if elapsed < self.threshold_sec:
+            return
+
+        record = {
+            'trace_id': trace.trace_id,
+            'method': trace.method,
+            'started_at': trace.started_at.isoformat(),
+            'duration_ms': elapsed * 1e3,
+            'phases_ms': {phase: seconds * 1e3 for phase, seconds in trace.phases.items()},
+            'samples': list(trace.samples),
+            'profile': trace.profile,
+        }
+        self.log.add(record)
+        logger.warning(
+            'slow call %s trace_id=%s took %.0fms, phases %s',
+            trace.method, trace.trace_id, record['duration_ms'],
+            {phase: round(ms, 1) for phase, ms in record['phases_ms'].items()}
+        )
+
+    def _watch(self) -> None:
+        with self._cond:
+            while True:
+                while self._heap and self._heap[0][2].finished:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, _, trace = self._heap[0]
+                timeout = deadline - time.monotonic()
+                if timeout > 0:
+                    self._cond.wait(timeout)
+                    continue
+                heapq.heappop(self._heap)
+                sample = _sample_stack(trace)
+                if sample is not None and not trace.finished:
+                    trace.samples.append(sample)
+                if len(trace.samples) < self.max_samples:
+                    heapq.heappush(self._heap, (deadline + self.sample_interval_sec, next(self._counter), trace))
+
+
+def _sample_stack(trace: Trace) -> str | None:
+    if trace.awaitable is not None:
+        return ''.join(traceback.format_list(_coroutine_stack(trace.awaitable)))
+    frame = sys._current_frames().get(trace.thread_id)
+    if frame is None:
+        return None
+    return ''.join(traceback.format_stack(frame))
+
+
+def _coroutine_stack(awaitable: Any) -> traceback.StackSummary:
+    """
+    Extract the stack of the coroutines, async generators and generators an awaitable is suspended in
+    """
+    frames = []
+    while awaitable is not None:
+        frame = getattr(awaitable, 'cr_frame', None) or getattr(awaitable, 'ag_frame', None) \
+            or getattr(awaitable, 'gi_frame', None)
+        if frame is None:
+            break
+        frames.append((frame, frame.f_lineno))
+        awaitable = getattr(awaitable, 'cr_await', None) or getattr(awaitable, 'ag_await', None) \
+            or getattr(awaitable, 'gi_yieldfrom', None)
+    return traceback.StackSummary.extract(frames)
+
+
+def _format_profile(profile: 'cProfile.Profile', limit: int = 30) -> str:
+    import io
+    import pstats
+
+    output = io.StringIO()
+    pstats.Stats(profile, stream=output).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return output.getvalue()
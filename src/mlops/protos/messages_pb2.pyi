@@ -1,8 +1,9 @@
 from google.protobuf import timestamp_pb2 as _timestamp_pb2
 from google.protobuf import struct_pb2 as _struct_pb2
+from google.protobuf.internal import containers as _containers
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
-from typing import ClassVar as _ClassVar, Mapping as _Mapping, Optional as _Optional, Union as _Union
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
@@ -21,7 +22,7 @@ class TrainingStatus(_message.Message):
     def __init__(self, name: _Optional[str] = ..., phase: _Optional[str] = ..., progress: _Optional[float] = ..., description: _Optional[str] = ..., is_completed: bool = ...) -> None: ...
 
 class WorkerStatus(_message.Message):
-    __slots__ = ("id", "task_type", "version", "healthy", "has_task", "joined_at", "created_at")
+    __slots__ = ("id", "task_type", "version", "healthy", "has_task", "joined_at", "created_at", "slots", "running_tasks", "datasets")
     ID_FIELD_NUMBER: _ClassVar[int]
     TASK_TYPE_FIELD_NUMBER: _ClassVar[int]
     VERSION_FIELD_NUMBER: _ClassVar[int]
@@ -29,6 +30,9 @@ class WorkerStatus(_message.Message):
     HAS_TASK_FIELD_NUMBER: _ClassVar[int]
     JOINED_AT_FIELD_NUMBER: _ClassVar[int]
     CREATED_AT_FIELD_NUMBER: _ClassVar[int]
+    SLOTS_FIELD_NUMBER: _ClassVar[int]
+    RUNNING_TASKS_FIELD_NUMBER: _ClassVar[int]
+    DATASETS_FIELD_NUMBER: _ClassVar[int]
     id: str
     task_type: str
     version: str
@@ -36,7 +40,10 @@ class WorkerStatus(_message.Message):
     has_task: bool
     joined_at: _timestamp_pb2.Timestamp
     created_at: _timestamp_pb2.Timestamp
-    def __init__(self, id: _Optional[str] = ..., task_type: _Optional[str] = ..., version: _Optional[str] = ..., healthy: bool = ..., has_task: bool = ..., joined_at: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., created_at: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ...) -> None: ...
+    slots: int
+    running_tasks: int
+    datasets: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, id: _Optional[str] = ..., task_type: _Optional[str] = ..., version: _Optional[str] = ..., healthy: bool = ..., has_task: bool = ..., joined_at: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., created_at: _Optional[_Union[_timestamp_pb2.Timestamp, _Mapping]] = ..., slots: _Optional[int] = ..., running_tasks: _Optional[int] = ..., datasets: _Optional[_Iterable[str]] = ...) -> None: ...
 
 class WorkerData(_message.Message):
     __slots__ = ("host", "port", "task_type", "version", "options")
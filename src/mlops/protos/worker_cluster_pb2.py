@@ -26,27 +26,45 @@ import messages_pb2 as messages__pb2
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14worker_cluster.proto\x12\x0eworker_cluster\x1a\x0emessages.proto\x1a\x1bgoogle/protobuf/empty.proto\"D\n\x18GetWorkersStatusResponse\x12(\n\x08statuses\x18\x01 \x03(\x0b\x32\x16.messages.WorkerStatus\"+\n\x16GetWorkerStatusRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\"\x1e\n\x0bTaskRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\x04\"\x1f\n\x0f\x43heckInResponse\x12\x0c\n\x04uuid\x18\x01 \x01(\t\"=\n\x13ReportStatusRequest\x12&\n\x06status\x18\x02 \x01(\x0b\x32\x16.messages.WorkerStatus\"j\n\x1bReportTrainingStatusRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12-\n\x06status\x18\x02 \x01(\x0b\x32\x18.messages.TrainingStatusH\x00\x88\x01\x01\x42\t\n\x07_status2\xa1\x03\n\x15WorkerClusterTraining\x12T\n\x10GetWorkersStatus\x12\x16.google.protobuf.Empty\x1a(.worker_cluster.GetWorkersStatusResponse\x12Q\n\x0fGetWorkerStatus\x12&.worker_cluster.GetWorkerStatusRequest\x1a\x16.messages.WorkerStatus\x12I\n\x12\x41ssignTrainingTask\x12\x1b.worker_cluster.TaskRequest\x1a\x16.messages.WorkerStatus\x12J\n\x11GetTrainingStatus\x12\x1b.worker_cluster.TaskRequest\x1a\x18.messages.TrainingStatus\x12H\n\x11PauseTrainingTask\x12\x1b.worker_cluster.TaskRequest\x1a\x16.google.protobuf.Empty2\x81\x02\n\x13WorkerClusterWorker\x12@\n\x07\x43heckIn\x12\x14.messages.WorkerData\x1a\x1f.worker_cluster.CheckInResponse\x12K\n\x0cReportStatus\x12#.worker_cluster.ReportStatusRequest\x1a\x16.google.protobuf.Empty\x12[\n\x14ReportTrainingStatus\x12+.worker_cluster.ReportTrainingStatusRequest\x1a\x16.google.protobuf.Emptyb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14worker_cluster.proto\x12\x0eworker_cluster\x1a\x0emessages.proto\x1a\x1bgoogle/protobuf/empty.proto\"D\n\x18GetWorkersStatusResponse\x12(\n\x08statuses\x18\x01 \x03(\x0b\x32\x16.messages.WorkerStatus\"+\n\x16GetWorkerStatusRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\"\x1e\n\x0bTaskRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\x04\".\n\x1a\x41ssignTrainingTasksRequest\x12\x10\n\x08task_ids\x18\x01 \x03(\x04\"\xac\x01\n\x0eTaskAssignment\x12\x0f\n\x07task_id\x18\x01 \x01(\x04\x12\x34\n\x06result\x18\x02 \x01(\x0e\x32$.worker_cluster.TaskAssignmentResult\x12\x32\n\rworker_status\x18\x03 \x01(\x0b\x32\x16.messages.WorkerStatusH\x00\x88\x01\x01\x12\r\n\x05\x65rror\x18\x04 \x01(\tB\x10\n\x0e_worker_status\"R\n\x1b\x41ssignTrainingTasksResponse\x12\x33\n\x0b\x61ssignments\x18\x01 \x03(\x0b\x32\x1e.worker_cluster.TaskAssignment\"?\n\x1a\x45nqueueTrainingTaskRequest\x12\x0f\n\x07task_id\x18\x01 \x01(\x04\x12\x10\n\x08priority\x18\x02 \x01(\x05\"4\n\x1b\x45nqueueTrainingTaskResponse\x12\x15\n\rpending_tasks\x18\x01 \x01(\r\"\x81\x02\n\x11WorkerStatusEvent\x12\x33\n\x04type\x18\x01 \x01(\x0e\x32%.worker_cluster.WorkerStatusEventType\x12\x11\n\tworker_id\x18\x02 \x01(\t\x12+\n\x06status\x18\x03 \x01(\x0b\x32\x16.messages.WorkerStatusH\x00\x88\x01\x01\x12\x36\n\x0ftraining_status\x18\x04 \x01(\x0b\x32\x18.messages.TrainingStatusH\x01\x88\x01\x01\x12\x14\n\x07task_id\x18\x05 \x01(\x04H\x02\x88\x01\x01\x42\t\n\x07_statusB\x12\n\x10_training_statusB\n\n\x08_task_id\"\x1f\n\x0f\x43heckInResponse\x12\x0c\n\x04uuid\x18\x01 \x01(\t\"=\n\x13ReportStatusRequest\x12&\n\x06status\x18\x02 \x01(\x0b\x32\x16.messages.WorkerStatus\"\x8c\x01\n\x1bReportTrainingStatusRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12-\n\x06status\x18\x02 \x01(\x0b\x32\x18.messages.TrainingStatusH\x00\x88\x01\x01\x12\x14\n\x07task_id\x18\x03 \x01(\x04H\x01\x88\x01\x01\x42\t\n\x07_statusB\n\n\x08_task_id\"\x97\x01\n\x0cStatusReport\x12\x35\n\x06status\x18\x01 \x01(\x0b\x32#.worker_cluster.ReportStatusRequestH\x00\x12\x46\n\x0ftraining_status\x18\x02 \x01(\x0b\x32+.worker_cluster.ReportTrainingStatusRequestH\x00\x42\x08\n\x06report*c\n\x14TaskAssignmentResult\x12\x0c\n\x08\x41SSIGNED\x10\x00\x12\x17\n\x13NO_WORKER_AVAILABLE\x10\x01\x12\x12\n\x0eTASK_NOT_FOUND\x10\x02\x12\x10\n\x0cSTART_FAILED\x10\x03*|\n\x15WorkerStatusEventType\x12\x0c\n\x08SNAPSHOT\x10\x00\x12\x10\n\x0cSNAPSHOT_END\x10\x01\x12\x12\n\x0eSTATUS_CHANGED\x10\x02\x12\x1b\n\x17TRAINING_STATUS_CHANGED\x10\x03\x12\x12\n\x0eWORKER_REMOVED\x10\x04\x32\xb6\x06\n\x15WorkerClusterTraining\x12T\n\x10GetWorkersStatus\x12\x16.google.protobuf.Empty\x1a(.worker_cluster.GetWorkersStatusResponse\x12Q\n\x0fGetWorkerStatus\x12&.worker_cluster.GetWorkerStatusRequest\x1a\x16.messages.WorkerStatus\x12Q\n\x12WatchWorkersStatus\x12\x16.google.protobuf.Empty\x1a!.worker_cluster.WorkerStatusEvent0\x01\x12`\n\x11WatchWorkerStatus\x12&.worker_cluster.GetWorkerStatusRequest\x1a!.worker_cluster.WorkerStatusEvent0\x01\x12I\n\x12\x41ssignTrainingTask\x12\x1b.worker_cluster.TaskRequest\x1a\x16.messages.WorkerStatus\x12n\n\x13\x41ssignTrainingTasks\x12*.worker_cluster.AssignTrainingTasksRequest\x1a+.worker_cluster.AssignTrainingTasksResponse\x12n\n\x13\x45nqueueTrainingTask\x12*.worker_cluster.EnqueueTrainingTaskRequest\x1a+.worker_cluster.EnqueueTrainingTaskResponse\x12J\n\x11GetTrainingStatus\x12\x1b.worker_cluster.TaskRequest\x1a\x18.messages.TrainingStatus\x12H\n\x11PauseTrainingTask\x12\x1b.worker_cluster.TaskRequest\x1a\x16.google.protobuf.Empty2\xcf\x02\n\x13WorkerClusterWorker\x12@\n\x07\x43heckIn\x12\x14.messages.WorkerData\x1a\x1f.worker_cluster.CheckInResponse\x12K\n\x0cReportStatus\x12#.worker_cluster.ReportStatusRequest\x1a\x16.google.protobuf.Empty\x12[\n\x14ReportTrainingStatus\x12+.worker_cluster.ReportTrainingStatusRequest\x1a\x16.google.protobuf.Empty\x12L\n\x12ReportStatusStream\x12\x1c.worker_cluster.StatusReport\x1a\x16.google.protobuf.Empty(\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'worker_cluster_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_TASKASSIGNMENTRESULT']._serialized_start=1311
+  _globals['_TASKASSIGNMENTRESULT']._serialized_end=1410
+  _globals['_WORKERSTATUSEVENTTYPE']._serialized_start=1412
+  _globals['_WORKERSTATUSEVENTTYPE']._serialized_end=1536
   _globals['_GETWORKERSSTATUSRESPONSE']._serialized_start=85
   _globals['_GETWORKERSSTATUSRESPONSE']._serialized_end=153
   _globals['_GETWORKERSTATUSREQUEST']._serialized_start=155
   _globals['_GETWORKERSTATUSREQUEST']._serialized_end=198
   _globals['_TASKREQUEST']._serialized_start=200
   _globals['_TASKREQUEST']._serialized_end=230
-  _globals['_CHECKINRESPONSE']._serialized_start=232
-  _globals['_CHECKINRESPONSE']._serialized_end=263
-  _globals['_REPORTSTATUSREQUEST']._serialized_start=265
-  _globals['_REPORTSTATUSREQUEST']._serialized_end=326
-  _globals['_REPORTTRAININGSTATUSREQUEST']._serialized_start=328
-  _globals['_REPORTTRAININGSTATUSREQUEST']._serialized_end=434
-  _globals['_WORKERCLUSTERTRAINING']._serialized_start=437
-  _globals['_WORKERCLUSTERTRAINING']._serialized_end=854
-  _globals['_WORKERCLUSTERWORKER']._serialized_start=857
-  _globals['_WORKERCLUSTERWORKER']._serialized_end=1114
+  _globals['_ASSIGNTRAININGTASKSREQUEST']._serialized_start=232
+  _globals['_ASSIGNTRAININGTASKSREQUEST']._serialized_end=278
+  _globals['_TASKASSIGNMENT']._serialized_start=281
+  _globals['_TASKASSIGNMENT']._serialized_end=453
+  _globals['_ASSIGNTRAININGTASKSRESPONSE']._serialized_start=455
+  _globals['_ASSIGNTRAININGTASKSRESPONSE']._serialized_end=537
+  _globals['_ENQUEUETRAININGTASKREQUEST']._serialized_start=539
+  _globals['_ENQUEUETRAININGTASKREQUEST']._serialized_end=602
+  _globals['_ENQUEUETRAININGTASKRESPONSE']._serialized_start=604
+  _globals['_ENQUEUETRAININGTASKRESPONSE']._serialized_end=656
+  _globals['_WORKERSTATUSEVENT']._serialized_start=659
+  _globals['_WORKERSTATUSEVENT']._serialized_end=916
+  _globals['_CHECKINRESPONSE']._serialized_start=918
+  _globals['_CHECKINRESPONSE']._serialized_end=949
+  _globals['_REPORTSTATUSREQUEST']._serialized_start=951
+  _globals['_REPORTSTATUSREQUEST']._serialized_end=1012
+  _globals['_REPORTTRAININGSTATUSREQUEST']._serialized_start=1015
+  _globals['_REPORTTRAININGSTATUSREQUEST']._serialized_end=1155
+  _globals['_STATUSREPORT']._serialized_start=1158
+  _globals['_STATUSREPORT']._serialized_end=1309
+  _globals['_WORKERCLUSTERTRAINING']._serialized_start=1539
+  _globals['_WORKERCLUSTERTRAINING']._serialized_end=2361
+  _globals['_WORKERCLUSTERWORKER']._serialized_start=2364
+  _globals['_WORKERCLUSTERWORKER']._serialized_end=2699
 # @@protoc_insertion_point(module_scope)
@@ -1,12 +1,37 @@
 import messages_pb2 as _messages_pb2
 from google.protobuf import empty_pb2 as _empty_pb2
 from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
 from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
+class TaskAssignmentResult(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    ASSIGNED: _ClassVar[TaskAssignmentResult]
+    NO_WORKER_AVAILABLE: _ClassVar[TaskAssignmentResult]
+    TASK_NOT_FOUND: _ClassVar[TaskAssignmentResult]
+    START_FAILED: _ClassVar[TaskAssignmentResult]
+
+class WorkerStatusEventType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    SNAPSHOT: _ClassVar[WorkerStatusEventType]
+    SNAPSHOT_END: _ClassVar[WorkerStatusEventType]
+    STATUS_CHANGED: _ClassVar[WorkerStatusEventType]
+    TRAINING_STATUS_CHANGED: _ClassVar[WorkerStatusEventType]
+    WORKER_REMOVED: _ClassVar[WorkerStatusEventType]
+ASSIGNED: TaskAssignmentResult
+NO_WORKER_AVAILABLE: TaskAssignmentResult
+TASK_NOT_FOUND: TaskAssignmentResult
+START_FAILED: TaskAssignmentResult
+SNAPSHOT: WorkerStatusEventType
+SNAPSHOT_END: WorkerStatusEventType
+STATUS_CHANGED: WorkerStatusEventType
+TRAINING_STATUS_CHANGED: WorkerStatusEventType
+WORKER_REMOVED: WorkerStatusEventType
+
 class GetWorkersStatusResponse(_message.Message):
     __slots__ = ("statuses",)
     STATUSES_FIELD_NUMBER: _ClassVar[int]
@@ -25,6 +50,58 @@ class TaskRequest(_message.Message):
     task_id: int
     def __init__(self, task_id: _Optional[int] = ...) -> None: ...
 
+class AssignTrainingTasksRequest(_message.Message):
+    __slots__ = ("task_ids",)
+    TASK_IDS_FIELD_NUMBER: _ClassVar[int]
+    task_ids: _containers.RepeatedScalarFieldContainer[int]
+    def __init__(self, task_ids: _Optional[_Iterable[int]] = ...) -> None: ...
+
+class TaskAssignment(_message.Message):
+    __slots__ = ("task_id", "result", "worker_status", "error")
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
+    RESULT_FIELD_NUMBER: _ClassVar[int]
+    WORKER_STATUS_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    task_id: int
+    result: TaskAssignmentResult
+    worker_status: _messages_pb2.WorkerStatus
+    error: str
+    def __init__(self, task_id: _Optional[int] = ..., result: _Optional[_Union[TaskAssignmentResult, str]] = ..., worker_status: _Optional[_Union[_messages_pb2.WorkerStatus, _Mapping]] = ..., error: _Optional[str] = ...) -> None: ...
+
+class AssignTrainingTasksResponse(_message.Message):
+    __slots__ = ("assignments",)
+    ASSIGNMENTS_FIELD_NUMBER: _ClassVar[int]
+    assignments: _containers.RepeatedCompositeFieldContainer[TaskAssignment]
+    def __init__(self, assignments: _Optional[_Iterable[_Union[TaskAssignment, _Mapping]]] = ...) -> None: ...
+
+class EnqueueTrainingTaskRequest(_message.Message):
+    __slots__ = ("task_id", "priority")
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
+    PRIORITY_FIELD_NUMBER: _ClassVar[int]
+    task_id: int
+    priority: int
+    def __init__(self, task_id: _Optional[int] = ..., priority: _Optional[int] = ...) -> None: ...
+
+class EnqueueTrainingTaskResponse(_message.Message):
+    __slots__ = ("pending_tasks",)
+    PENDING_TASKS_FIELD_NUMBER: _ClassVar[int]
+    pending_tasks: int
+    def __init__(self, pending_tasks: _Optional[int] = ...) -> None: ...
+
+class WorkerStatusEvent(_message.Message):
+    __slots__ = ("type", "worker_id", "status", "training_status", "task_id")
+    TYPE_FIELD_NUMBER: _ClassVar[int]
+    WORKER_ID_FIELD_NUMBER: _ClassVar[int]
+    STATUS_FIELD_NUMBER: _ClassVar[int]
+    TRAINING_STATUS_FIELD_NUMBER: _ClassVar[int]
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
+    type: WorkerStatusEventType
+    worker_id: str
+    status: _messages_pb2.WorkerStatus
+    training_status: _messages_pb2.TrainingStatus
+    task_id: int
+    def __init__(self, type: _Optional[_Union[WorkerStatusEventType, str]] = ..., worker_id: _Optional[str] = ..., status: _Optional[_Union[_messages_pb2.WorkerStatus, _Mapping]] = ..., training_status: _Optional[_Union[_messages_pb2.TrainingStatus, _Mapping]] = ..., task_id: _Optional[int] = ...) -> None: ...
+
 class CheckInResponse(_message.Message):
     __slots__ = ("uuid",)
     UUID_FIELD_NUMBER: _ClassVar[int]
@@ -38,9 +115,19 @@ class ReportStatusRequest(_message.Message):
     def __init__(self, status: _Optional[_Union[_messages_pb2.WorkerStatus, _Mapping]] = ...) -> None: ...
 
 class ReportTrainingStatusRequest(_message.Message):
-    __slots__ = ("worker_id", "status")
+    __slots__ = ("worker_id", "status", "task_id")
     WORKER_ID_FIELD_NUMBER: _ClassVar[int]
     STATUS_FIELD_NUMBER: _ClassVar[int]
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
     worker_id: str
     status: _messages_pb2.TrainingStatus
-    def __init__(self, worker_id: _Optional[str] = ..., status: _Optional[_Union[_messages_pb2.TrainingStatus, _Mapping]] = ...) -> None: ...
+    task_id: int
+    def __init__(self, worker_id: _Optional[str] = ..., status: _Optional[_Union[_messages_pb2.TrainingStatus, _Mapping]] = ..., task_id: _Optional[int] = ...) -> None: ...
+
+class StatusReport(_message.Message):
+    __slots__ = ("status", "training_status")
+    STATUS_FIELD_NUMBER: _ClassVar[int]
+    TRAINING_STATUS_FIELD_NUMBER: _ClassVar[int]
+    status: ReportStatusRequest
+    training_status: ReportTrainingStatusRequest
+    def __init__(self, status: _Optional[_Union[ReportStatusRequest, _Mapping]] = ..., training_status: _Optional[_Union[ReportTrainingStatusRequest, _Mapping]] = ...) -> None: ...
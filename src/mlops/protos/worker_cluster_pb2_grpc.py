@@ -46,11 +46,31 @@ class WorkerClusterTrainingStub(object):
                 request_serializer=worker__cluster__pb2.GetWorkerStatusRequest.SerializeToString,
                 response_deserializer=messages__pb2.WorkerStatus.FromString,
                 _registered_method=True)
+        self.WatchWorkersStatus = channel.unary_stream(
+                '/worker_cluster.WorkerClusterTraining/WatchWorkersStatus',
+                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                response_deserializer=worker__cluster__pb2.WorkerStatusEvent.FromString,
+                _registered_method=True)
+        self.WatchWorkerStatus = channel.unary_stream(
+                '/worker_cluster.WorkerClusterTraining/WatchWorkerStatus',
+                request_serializer=worker__cluster__pb2.GetWorkerStatusRequest.SerializeToString,
+                response_deserializer=worker__cluster__pb2.WorkerStatusEvent.FromString,
+                _registered_method=True)
         self.AssignTrainingTask = channel.unary_unary(
                 '/worker_cluster.WorkerClusterTraining/AssignTrainingTask',
                 request_serializer=worker__cluster__pb2.TaskRequest.SerializeToString,
                 response_deserializer=messages__pb2.WorkerStatus.FromString,
                 _registered_method=True)
+        self.AssignTrainingTasks = channel.unary_unary(
+                '/worker_cluster.WorkerClusterTraining/AssignTrainingTasks',
+                request_serializer=worker__cluster__pb2.AssignTrainingTasksRequest.SerializeToString,
+                response_deserializer=worker__cluster__pb2.AssignTrainingTasksResponse.FromString,
+                _registered_method=True)
+        self.EnqueueTrainingTask = channel.unary_unary(
+                '/worker_cluster.WorkerClusterTraining/EnqueueTrainingTask',
+                request_serializer=worker__cluster__pb2.EnqueueTrainingTaskRequest.SerializeToString,
+                response_deserializer=worker__cluster__pb2.EnqueueTrainingTaskResponse.FromString,
+                _registered_method=True)
         self.GetTrainingStatus = channel.unary_unary(
                 '/worker_cluster.WorkerClusterTraining/GetTrainingStatus',
                 request_serializer=worker__cluster__pb2.TaskRequest.SerializeToString,
@@ -78,12 +98,38 @@ class WorkerClusterTrainingServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def WatchWorkersStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchWorkerStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def AssignTrainingTask(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AssignTrainingTasks(self, request, context):
+        """Assign many tasks at once, the workers are started concurrently
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EnqueueTrainingTask(self, request, context):
+        """Queue a task, it's assigned as soon as a worker of its type is idle
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetTrainingStatus(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -109,11 +155,31 @@ def add_WorkerClusterTrainingServicer_to_server(servicer, server):
                     request_deserializer=worker__cluster__pb2.GetWorkerStatusRequest.FromString,
                     response_serializer=messages__pb2.WorkerStatus.SerializeToString,
             ),
+            'WatchWorkersStatus': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchWorkersStatus,
+                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    response_serializer=worker__cluster__pb2.WorkerStatusEvent.SerializeToString,
+            ),
+            'WatchWorkerStatus': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchWorkerStatus,
+                    request_deserializer=worker__cluster__pb2.GetWorkerStatusRequest.FromString,
+                    response_serializer=worker__cluster__pb2.WorkerStatusEvent.SerializeToString,
+            ),
             'AssignTrainingTask': grpc.unary_unary_rpc_method_handler(
                     servicer.AssignTrainingTask,
                     request_deserializer=worker__cluster__pb2.TaskRequest.FromString,
                     response_serializer=messages__pb2.WorkerStatus.SerializeToString,
             ),
+            'AssignTrainingTasks': grpc.unary_unary_rpc_method_handler(
+                    servicer.AssignTrainingTasks,
+                    request_deserializer=worker__cluster__pb2.AssignTrainingTasksRequest.FromString,
+                    response_serializer=worker__cluster__pb2.AssignTrainingTasksResponse.SerializeToString,
+            ),
+            'EnqueueTrainingTask': grpc.unary_unary_rpc_method_handler(
+                    servicer.EnqueueTrainingTask,
+                    request_deserializer=worker__cluster__pb2.EnqueueTrainingTaskRequest.FromString,
+                    response_serializer=worker__cluster__pb2.EnqueueTrainingTaskResponse.SerializeToString,
+            ),
             'GetTrainingStatus': grpc.unary_unary_rpc_method_handler(
                     servicer.GetTrainingStatus,
                     request_deserializer=worker__cluster__pb2.TaskRequest.FromString,
@@ -189,6 +255,60 @@ class WorkerClusterTraining(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def WatchWorkersStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/worker_cluster.WorkerClusterTraining/WatchWorkersStatus',
+            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            worker__cluster__pb2.WorkerStatusEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchWorkerStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/worker_cluster.WorkerClusterTraining/WatchWorkerStatus',
+            worker__cluster__pb2.GetWorkerStatusRequest.SerializeToString,
+            worker__cluster__pb2.WorkerStatusEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def AssignTrainingTask(request,
             target,
@@ -216,6 +336,60 @@ class WorkerClusterTraining(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def AssignTrainingTasks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/worker_cluster.WorkerClusterTraining/AssignTrainingTasks',
+            worker__cluster__pb2.AssignTrainingTasksRequest.SerializeToString,
+            worker__cluster__pb2.AssignTrainingTasksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def EnqueueTrainingTask(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/worker_cluster.WorkerClusterTraining/EnqueueTrainingTask',
+            worker__cluster__pb2.EnqueueTrainingTaskRequest.SerializeToString,
+            worker__cluster__pb2.EnqueueTrainingTaskResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetTrainingStatus(request,
             target,
@@ -295,6 +469,11 @@ class WorkerClusterWorkerStub(object):
                 request_serializer=worker__cluster__pb2.ReportTrainingStatusRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.ReportStatusStream = channel.stream_unary(
+                '/worker_cluster.WorkerClusterWorker/ReportStatusStream',
+                request_serializer=worker__cluster__pb2.StatusReport.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
 
 
 class WorkerClusterWorkerServicer(object):
@@ -318,6 +497,13 @@ class WorkerClusterWorkerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReportStatusStream(self, request_iterator, context):
+        """Long-lived stream of status reports, equivalent to calling ReportStatus and ReportTrainingStatus in order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_WorkerClusterWorkerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -336,6 +522,11 @@ def add_WorkerClusterWorkerServicer_to_server(servicer, server):
                     request_deserializer=worker__cluster__pb2.ReportTrainingStatusRequest.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'ReportStatusStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.ReportStatusStream,
+                    request_deserializer=worker__cluster__pb2.StatusReport.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'worker_cluster.WorkerClusterWorker', rpc_method_handlers)
@@ -427,3 +618,30 @@ class WorkerClusterWorker(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ReportStatusStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/worker_cluster.WorkerClusterWorker/ReportStatusStream',
+            worker__cluster__pb2.StatusReport.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -26,15 +26,35 @@ from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 import messages_pb2 as messages__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0cworker.proto\x12\x06worker\x1a\x1bgoogle/protobuf/empty.proto\x1a\x0emessages.proto\"\'\n\x12StartWorkerRequest\x12\x11\n\ttask_path\x18\x01 \x01(\t2\xc6\x01\n\x06Worker\x12;\n\tGetStatus\x12\x16.google.protobuf.Empty\x1a\x16.messages.WorkerStatus\x12\x41\n\x0bStartWorker\x12\x1a.worker.StartWorkerRequest\x1a\x16.google.protobuf.Empty\x12<\n\nStopWorker\x12\x16.google.protobuf.Empty\x1a\x16.google.protobuf.Emptyb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0cworker.proto\x12\x06worker\x1a\x1bgoogle/protobuf/empty.proto\x1a\x0emessages.proto\"I\n\x12StartWorkerRequest\x12\x11\n\ttask_path\x18\x01 \x01(\t\x12\x14\n\x07task_id\x18\x02 \x01(\x04H\x00\x88\x01\x01\x42\n\n\x08_task_id\"5\n\x11StopWorkerRequest\x12\x14\n\x07task_id\x18\x01 \x01(\x04H\x00\x88\x01\x01\x42\n\n\x08_task_id\"\x8f\x01\n\rArtifactChunk\x12\x10\n\x08\x61rtifact\x18\x01 \x01(\t\x12\x0c\n\x04path\x18\x02 \x01(\t\x12\x0e\n\x06offset\x18\x03 \x01(\x04\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\x0c\x12-\n\x0b\x63ompression\x18\x05 \x01(\x0e\x32\x18.worker.ChunkCompression\x12\x11\n\tfile_size\x18\x06 \x01(\x04\"*\n\x0c\x41rtifactFile\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x04\"#\n\x0f\x41rtifactRequest\x12\x10\n\x08\x61rtifact\x18\x01 \x01(\t\"E\n\x0c\x41rtifactInfo\x12\x10\n\x08\x61rtifact\x18\x01 \x01(\t\x12#\n\x05\x66iles\x18\x02 \x03(\x0b\x32\x14.worker.ArtifactFile\"\x93\x01\n\x17\x44ownloadArtifactRequest\x12\x10\n\x08\x61rtifact\x18\x01 \x01(\t\x12#\n\x05\x66iles\x18\x02 \x03(\x0b\x32\x14.worker.ArtifactFile\x12-\n\x0b\x63ompression\x18\x03 \x01(\x0e\x32\x18.worker.ChunkCompression\x12\x12\n\nchunk_size\x18\x04 \x01(\r\"9\n\x0b\x44\x61tasetFile\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0e\n\x06\x64igest\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\x04\"[\n\x13StageDatasetRequest\x12\x10\n\x08\x61rtifact\x18\x01 \x01(\t\x12\x0e\n\x06\x64igest\x18\x02 \x01(\t\x12\"\n\x05\x66iles\x18\x03 \x03(\x0b\x32\x13.worker.DatasetFile\"-\n\x14StageDatasetResponse\x12\x15\n\rmissing_paths\x18\x01 \x03(\t*J\n\x10\x43hunkCompression\x12\x1a\n\x16\x43HUNK_COMPRESSION_NONE\x10\x00\x12\x1a\n\x16\x43HUNK_COMPRESSION_ZLIB\x10\x01\x32\xe5\x03\n\x06Worker\x12;\n\tGetStatus\x12\x16.google.protobuf.Empty\x1a\x16.messages.WorkerStatus\x12\x41\n\x0bStartWorker\x12\x1a.worker.StartWorkerRequest\x1a\x16.google.protobuf.Empty\x12?\n\nStopWorker\x12\x19.worker.StopWorkerRequest\x1a\x16.google.protobuf.Empty\x12@\n\x0fGetArtifactInfo\x12\x17.worker.ArtifactRequest\x1a\x14.worker.ArtifactInfo\x12?\n\x0eUploadArtifact\x12\x15.worker.ArtifactChunk\x1a\x14.worker.ArtifactInfo(\x01\x12L\n\x10\x44ownloadArtifact\x12\x1f.worker.DownloadArtifactRequest\x1a\x15.worker.ArtifactChunk0\x01\x12I\n\x0cStageDataset\x12\x1b.worker.StageDatasetRequest\x1a\x1c.worker.StageDatasetResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'worker_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_CHUNKCOMPRESSION']._serialized_start=846
+  _globals['_CHUNKCOMPRESSION']._serialized_end=920
   _globals['_STARTWORKERREQUEST']._serialized_start=69
-  _globals['_STARTWORKERREQUEST']._serialized_end=108
-  _globals['_WORKER']._serialized_start=111
-  _globals['_WORKER']._serialized_end=309
+  _globals['_STARTWORKERREQUEST']._serialized_end=142
+  _globals['_STOPWORKERREQUEST']._serialized_start=144
+  _globals['_STOPWORKERREQUEST']._serialized_end=197
+  _globals['_ARTIFACTCHUNK']._serialized_start=200
+  _globals['_ARTIFACTCHUNK']._serialized_end=343
+  _globals['_ARTIFACTFILE']._serialized_start=345
+  _globals['_ARTIFACTFILE']._serialized_end=387
+  _globals['_ARTIFACTREQUEST']._serialized_start=389
+  _globals['_ARTIFACTREQUEST']._serialized_end=424
+  _globals['_ARTIFACTINFO']._serialized_start=426
+  _globals['_ARTIFACTINFO']._serialized_end=495
+  _globals['_DOWNLOADARTIFACTREQUEST']._serialized_start=498
+  _globals['_DOWNLOADARTIFACTREQUEST']._serialized_end=645
+  _globals['_DATASETFILE']._serialized_start=647
+  _globals['_DATASETFILE']._serialized_end=704
+  _globals['_STAGEDATASETREQUEST']._serialized_start=706
+  _globals['_STAGEDATASETREQUEST']._serialized_end=797
+  _globals['_STAGEDATASETRESPONSE']._serialized_start=799
+  _globals['_STAGEDATASETRESPONSE']._serialized_end=844
+  _globals['_WORKER']._serialized_start=923
+  _globals['_WORKER']._serialized_end=1408
 # @@protoc_insertion_point(module_scope)
@@ -1,13 +1,106 @@
 from google.protobuf import empty_pb2 as _empty_pb2
 import messages_pb2 as _messages_pb2
+from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
-from typing import ClassVar as _ClassVar, Optional as _Optional
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
+class ChunkCompression(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    CHUNK_COMPRESSION_NONE: _ClassVar[ChunkCompression]
+    CHUNK_COMPRESSION_ZLIB: _ClassVar[ChunkCompression]
+CHUNK_COMPRESSION_NONE: ChunkCompression
+CHUNK_COMPRESSION_ZLIB: ChunkCompression
+
 class StartWorkerRequest(_message.Message):
-    __slots__ = ("task_path",)
+    __slots__ = ("task_path", "task_id")
     TASK_PATH_FIELD_NUMBER: _ClassVar[int]
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
     task_path: str
-    def __init__(self, task_path: _Optional[str] = ...) -> None: ...
+    task_id: int
+    def __init__(self, task_path: _Optional[str] = ..., task_id: _Optional[int] = ...) -> None: ...
+
+class StopWorkerRequest(_message.Message):
+    __slots__ = ("task_id",)
+    TASK_ID_FIELD_NUMBER: _ClassVar[int]
+    task_id: int
+    def __init__(self, task_id: _Optional[int] = ...) -> None: ...
+
+class ArtifactChunk(_message.Message):
+    __slots__ = ("artifact", "path", "offset", "data", "compression", "file_size")
+    ARTIFACT_FIELD_NUMBER: _ClassVar[int]
+    PATH_FIELD_NUMBER: _ClassVar[int]
+    OFFSET_FIELD_NUMBER: _ClassVar[int]
+    DATA_FIELD_NUMBER: _ClassVar[int]
+    COMPRESSION_FIELD_NUMBER: _ClassVar[int]
+    FILE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    artifact: str
+    path: str
+    offset: int
+    data: bytes
+    compression: ChunkCompression
+    file_size: int
+    def __init__(self, artifact: _Optional[str] = ..., path: _Optional[str] = ..., offset: _Optional[int] = ..., data: _Optional[bytes] = ..., compression: _Optional[_Union[ChunkCompression, str]] = ..., file_size: _Optional[int] = ...) -> None: ...
+
+class ArtifactFile(_message.Message):
+    __slots__ = ("path", "size")
+    PATH_FIELD_NUMBER: _ClassVar[int]
+    SIZE_FIELD_NUMBER: _ClassVar[int]
+    path: str
+    size: int
+    def __init__(self, path: _Optional[str] = ..., size: _Optional[int] = ...) -> None: ...
+
+class ArtifactRequest(_message.Message):
+    __slots__ = ("artifact",)
+    ARTIFACT_FIELD_NUMBER: _ClassVar[int]
+    artifact: str
+    def __init__(self, artifact: _Optional[str] = ...) -> None: ...
+
+class ArtifactInfo(_message.Message):
+    __slots__ = ("artifact", "files")
+    ARTIFACT_FIELD_NUMBER: _ClassVar[int]
+    FILES_FIELD_NUMBER: _ClassVar[int]
+    artifact: str
+    files: _containers.RepeatedCompositeFieldContainer[ArtifactFile]
+    def __init__(self, artifact: _Optional[str] = ..., files: _Optional[_Iterable[_Union[ArtifactFile, _Mapping]]] = ...) -> None: ...
+
+class DownloadArtifactRequest(_message.Message):
+    __slots__ = ("artifact", "files", "compression", "chunk_size")
+    ARTIFACT_FIELD_NUMBER: _ClassVar[int]
+    FILES_FIELD_NUMBER: _ClassVar[int]
+    COMPRESSION_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_SIZE_FIELD_NUMBER: _ClassVar[int]
+    artifact: str
+    files: _containers.RepeatedCompositeFieldContainer[ArtifactFile]
+    compression: ChunkCompression
+    chunk_size: int
+    def __init__(self, artifact: _Optional[str] = ..., files: _Optional[_Iterable[_Union[ArtifactFile, _Mapping]]] = ..., compression: _Optional[_Union[ChunkCompression, str]] = ..., chunk_size: _Optional[int] = ...) -> None: ...
+
+class DatasetFile(_message.Message):
+    __slots__ = ("path", "digest", "size")
+    PATH_FIELD_NUMBER: _ClassVar[int]
+    DIGEST_FIELD_NUMBER: _ClassVar[int]
+    SIZE_FIELD_NUMBER: _ClassVar[int]
+    path: str
+    digest: str
+    size: int
+    def __init__(self, path: _Optional[str] = ..., digest: _Optional[str] = ..., size: _Optional[int] = ...) -> None: ...
+
+class StageDatasetRequest(_message.Message):
+    __slots__ = ("artifact", "digest", "files")
+    ARTIFACT_FIELD_NUMBER: _ClassVar[int]
+    DIGEST_FIELD_NUMBER: _ClassVar[int]
+    FILES_FIELD_NUMBER: _ClassVar[int]
+    artifact: str
+    digest: str
+    files: _containers.RepeatedCompositeFieldContainer[DatasetFile]
+    def __init__(self, artifact: _Optional[str] = ..., digest: _Optional[str] = ..., files: _Optional[_Iterable[_Union[DatasetFile, _Mapping]]] = ...) -> None: ...
+
+class StageDatasetResponse(_message.Message):
+    __slots__ = ("missing_paths",)
+    MISSING_PATHS_FIELD_NUMBER: _ClassVar[int]
+    missing_paths: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, missing_paths: _Optional[_Iterable[str]] = ...) -> None: ...
@@ -48,9 +48,29 @@ class WorkerStub(object):
                 _registered_method=True)
         self.StopWorker = channel.unary_unary(
                 '/worker.Worker/StopWorker',
-                request_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+                request_serializer=worker__pb2.StopWorkerRequest.SerializeToString,
                 response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
                 _registered_method=True)
+        self.GetArtifactInfo = channel.unary_unary(
+                '/worker.Worker/GetArtifactInfo',
+                request_serializer=worker__pb2.ArtifactRequest.SerializeToString,
+                response_deserializer=worker__pb2.ArtifactInfo.FromString,
+                _registered_method=True)
+        self.UploadArtifact = channel.stream_unary(
+                '/worker.Worker/UploadArtifact',
+                request_serializer=worker__pb2.ArtifactChunk.SerializeToString,
+                response_deserializer=worker__pb2.ArtifactInfo.FromString,
+                _registered_method=True)
+        self.DownloadArtifact = channel.unary_stream(
+                '/worker.Worker/DownloadArtifact',
+                request_serializer=worker__pb2.DownloadArtifactRequest.SerializeToString,
+                response_deserializer=worker__pb2.ArtifactChunk.FromString,
+                _registered_method=True)
+        self.StageDataset = channel.unary_unary(
+                '/worker.Worker/StageDataset',
+                request_serializer=worker__pb2.StageDatasetRequest.SerializeToString,
+                response_deserializer=worker__pb2.StageDatasetResponse.FromString,
+                _registered_method=True)
 
 
 class WorkerServicer(object):
@@ -74,6 +94,32 @@ class WorkerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetArtifactInfo(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UploadArtifact(self, request_iterator, context):
+        """Chunks of a file are sent in order, a file can be resumed from the size reported by GetArtifactInfo
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DownloadArtifact(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StageDataset(self, request, context):
+        """Materialize the cached files of a dataset into an artifact, and cache the uploaded files once all are present
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_WorkerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -89,9 +135,29 @@ def add_WorkerServicer_to_server(servicer, server):
             ),
             'StopWorker': grpc.unary_unary_rpc_method_handler(
                     servicer.StopWorker,
-                    request_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                    request_deserializer=worker__pb2.StopWorkerRequest.FromString,
                     response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
             ),
+            'GetArtifactInfo': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetArtifactInfo,
+                    request_deserializer=worker__pb2.ArtifactRequest.FromString,
+                    response_serializer=worker__pb2.ArtifactInfo.SerializeToString,
+            ),
+            'UploadArtifact': grpc.stream_unary_rpc_method_handler(
+                    servicer.UploadArtifact,
+                    request_deserializer=worker__pb2.ArtifactChunk.FromString,
+                    response_serializer=worker__pb2.ArtifactInfo.SerializeToString,
+            ),
+            'DownloadArtifact': grpc.unary_stream_rpc_method_handler(
+                    servicer.DownloadArtifact,
+                    request_deserializer=worker__pb2.DownloadArtifactRequest.FromString,
+                    response_serializer=worker__pb2.ArtifactChunk.SerializeToString,
+            ),
+            'StageDataset': grpc.unary_unary_rpc_method_handler(
+                    servicer.StageDataset,
+                    request_deserializer=worker__pb2.StageDatasetRequest.FromString,
+                    response_serializer=worker__pb2.StageDatasetResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'worker.Worker', rpc_method_handlers)
@@ -172,7 +238,7 @@ class Worker(object):
             request,
             target,
             '/worker.Worker/StopWorker',
-            google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            worker__pb2.StopWorkerRequest.SerializeToString,
             google_dot_protobuf_dot_empty__pb2.Empty.FromString,
             options,
             channel_credentials,
@@ -183,3 +249,111 @@ class Worker(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetArtifactInfo(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/worker.Worker/GetArtifactInfo',
+            worker__pb2.ArtifactRequest.SerializeToString,
+            worker__pb2.ArtifactInfo.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UploadArtifact(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/worker.Worker/UploadArtifact',
+            worker__pb2.ArtifactChunk.SerializeToString,
+            worker__pb2.ArtifactInfo.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DownloadArtifact(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/worker.Worker/DownloadArtifact',
+            worker__pb2.DownloadArtifactRequest.SerializeToString,
+            worker__pb2.ArtifactChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StageDataset(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/worker.Worker/StageDataset',
+            worker__pb2.StageDatasetRequest.SerializeToString,
+            worker__pb2.StageDatasetResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
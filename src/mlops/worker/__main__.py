@@ -1,36 +1,181 @@
+"""
+Start a worker, or a zygote forking workers
+
+Only argparse and the worker factory are imported at module level: grpc, the generated protobuf modules and
+the worker implementations are imported when a worker runs, so launching through a zygote or printing the help
+stays fast.
+"""
 import argparse
+from typing import NamedTuple, TYPE_CHECKING
+
+from mlops.worker.factory import WORKER_TYPES, create_worker, get_default_worker_type
 
-import grpc
-from typing import NamedTuple
+if TYPE_CHECKING:
+    from mlops.worker.dataset_cache import DatasetCache
+    from mlops.worker.interfaces import WorkerBase
 
-from mlops.protos import worker_cluster_pb2_grpc
-from mlops.worker.cluster_bridge import ClusterBridge
-from mlops.worker.interfaces import WorkerInitOptions
-from mlops.worker.testing_worker import TestingWorker
+# Options of the zygote, not passed on to the workers it launches
+_ZYGOTE_OPTIONS = ('zygote', 'prefork', 'via_zygote')
+# Seconds the calls in flight are given to complete when the worker stops
+_STOP_GRACE_SEC = 5.
 
 
 def main(argv: list[str] | None = None):
-    args = Args(**vars(get_arg_parser().parse_args(argv)))
+    parser = get_arg_parser()
+    args = Args(**vars(parser.parse_args(argv)))
+
+    if args.zygote is not None:
+        serve_zygote(args)
+        return
+    if args.port is None:
+        parser.error('the following arguments are required: --port')
+    if args.cache_dir is not None and args.artifacts_dir is None:
+        parser.error('--cache-dir requires --artifacts-dir, the datasets are staged as artifacts')
+    if args.via_zygote is not None:
+        from mlops.worker.zygote import launch_worker
+        print(f'Worker launched: pid {launch_worker(args.via_zygote, to_worker_argv(args))}')
+        return
+    run_worker(args)
+
+
+def run_worker(args: 'Args'):
+    """
+    Serve a worker and check it in to the cluster, until the server is stopped by SIGTERM or Ctrl+C
+
+    The worker is then shut down, and its last status reported before the connection to the cluster is closed.
+    """
+    import signal
 
-    # TODO: use a worker factory to create the worker
-    worker = TestingWorker()
+    import grpc
+
+    from mlops.common.grpc_tracing import TracingClientInterceptor
+    from mlops.common.model import Resources, RESOURCES_OPTION
+    from mlops.protos import worker_cluster_pb2_grpc
+    from mlops.worker.cluster_bridge import CoalescingClusterBridge, DatasetAdvertisingClusterBridge
+    from mlops.worker.interfaces import WorkerInitOptions
+
+    worker = create_worker(args.worker_type or get_default_worker_type(args.slots), args.slots)
 
     print(f'Worker started: {worker}')
 
     with grpc.insecure_channel(args.cluster_bind) as channel:
-        stub = worker_cluster_pb2_grpc.WorkerClusterWorkerStub(channel)
-        cluster = ClusterBridge(stub)
+        stub = worker_cluster_pb2_grpc.WorkerClusterWorkerStub(
+            grpc.intercept_channel(channel, TracingClientInterceptor('cluster_call'))
+        )
+        cluster = CoalescingClusterBridge(stub, flush_interval=args.report_interval)
 
-        worker.init(cluster, WorkerInitOptions(
+        resources = {name: amount for name in Resources._fields if (amount := getattr(args, name)) is not None}
+        datasets = create_dataset_cache(args)
+        reporter = cluster
+        if datasets is not None:
+            reporter = DatasetAdvertisingClusterBridge(cluster, datasets.get_digests)
+            datasets.on_change = reporter.refresh
+        server = start_worker_server(worker, args, datasets)
+        signal.signal(signal.SIGTERM, lambda signum, frame: server.stop(_STOP_GRACE_SEC))
+        worker.init(reporter, WorkerInitOptions(
             host=args.host,
             port=args.port,
+            options={RESOURCES_OPTION: resources} if resources else {}
         ))
+        try:
+            server.wait_for_termination()
+        except KeyboardInterrupt:
+            server.stop(_STOP_GRACE_SEC).wait()
+        worker.shutdown()
+        cluster.close()
+
+
+def create_dataset_cache(args: 'Args') -> 'DatasetCache | None':
+    """
+    Load the dataset cache of the worker, None if it has no cache directory
+    """
+    if args.cache_dir is None:
+        return None
+    from pathlib import Path
+
+    from mlops.worker.dataset_cache import DatasetCache
+
+    datasets = DatasetCache(Path(args.cache_dir), int(args.cache_max_gb * (1 << 30)))
+    datasets.load()
+    return datasets
+
+
+def start_worker_server(worker: 'WorkerBase', args: 'Args', datasets: 'DatasetCache | None' = None):
+    """
+    Serve the worker on its host and port, with its artifacts in the artifact directory if set
+    and the datasets staged as artifacts cached in datasets
+
+    The calls are traced with the trace id sent by the cluster, and the slow ones captured if slow_call_ms is set.
+    """
+    from concurrent import futures
+    from pathlib import Path
+
+    import grpc
+
+    from mlops.common.channel_options import ChannelOptions
+    from mlops.common.grpc_tracing import TracingServerInterceptor
+    from mlops.common.tracing import SlowCallProfiler
+    from mlops.protos import worker_pb2_grpc
+    from mlops.worker.artifact_store import ArtifactStore
+    from mlops.worker.worker_servicer import WorkerServicer
+
+    profiler = SlowCallProfiler(args.slow_call_ms / 1e3, args.profile_mode) if args.slow_call_ms else None
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=args.server_threads),
+        interceptors=[TracingServerInterceptor(profiler)],
+        options=ChannelOptions().get_server_args()
+    )
+    artifacts = ArtifactStore(Path(args.artifacts_dir), datasets) if args.artifacts_dir is not None else None
+    servicer = WorkerServicer(worker, artifacts)
+    worker_pb2_grpc.add_WorkerServicer_to_server(servicer, server)
+    server.add_insecure_port(f'{args.host}:{args.port}')
+    server.start()
+    return server
+
+
+def serve_zygote(args: 'Args'):
+    from mlops.worker.zygote import WorkerZygote, ZygoteServer
+
+    zygote = WorkerZygote(main, prefork=args.prefork)
+    with ZygoteServer(args.zygote, zygote) as server:
+        zygote.start()
+        print(f'Zygote started: {args.zygote}, {args.prefork} workers preforked')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def to_worker_argv(args: 'Args') -> list[str]:
+    """
+    Command line arguments of the worker described by args, without the zygote options
+    """
+    argv = []
+    for name, value in args._asdict().items():
+        if name not in _ZYGOTE_OPTIONS and value is not None:
+            argv += [f'--{name.replace("_", "-")}', str(value)]
+    return argv
 
 
 class Args(NamedTuple):
     cluster_bind: str
     host: str
-    port: int
+    port: int | None
+    report_interval: float
+    slots: int
+    worker_type: str | None
+    cpus: float | None
+    memory_mb: float | None
+    disk_mb: float | None
+    artifacts_dir: str | None
+    server_threads: int
+    cache_dir: str | None
+    cache_max_gb: float
+    slow_call_ms: float | None
+    profile_mode: str
+    zygote: str | None
+    prefork: int
+    via_zygote: str | None
 
 
 def get_arg_parser() -> argparse.ArgumentParser:
@@ -38,7 +183,38 @@ def get_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument('--cluster-bind', type=str, default='cluster:50000',
                         help='The address of the cluster to connect to')
     parser.add_argument('--host', type=str, default='0.0.0.0', help='The host to bind to')
-    parser.add_argument('--port', type=int, required=True, help='The port to bind to')
+    parser.add_argument('--port', type=int, default=None, help='The port to bind to, required to start a worker')
+    parser.add_argument('--report-interval', type=float, default=0.5,
+                        help='Seconds between two flushes of the status reports to the cluster')
+    parser.add_argument('--slots', type=int, default=1,
+                        help='Number of tasks run at once, tasks run in a process pool if more than 1')
+    parser.add_argument('--worker-type', type=str, choices=list(WORKER_TYPES), default=None,
+                        help='The worker implementation, process-pool if more than 1 slot and testing otherwise')
+    parser.add_argument('--cpus', type=float, default=None, help='CPUs advertised to the cluster scheduler')
+    parser.add_argument('--memory-mb', type=float, default=None, help='Memory advertised to the cluster scheduler')
+    parser.add_argument('--disk-mb', type=float, default=None, help='Disk advertised to the cluster scheduler')
+    parser.add_argument('--artifacts-dir', type=str, default=None,
+                        help='Keep the artifacts transferred by the cluster in this directory, '
+                             'the artifact calls are not served if not set')
+    parser.add_argument('--server-threads', type=int, default=8,
+                        help='Threads of the worker server, each serves a call, e.g. the stream of an artifact')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Cache the datasets staged as artifacts in this directory, on the filesystem of '
+                             'the artifact directory so they are linked instead of copied, not cached if not set, '
+                             'requires --artifacts-dir')
+    parser.add_argument('--cache-max-gb', type=float, default=10.,
+                        help='Size of the dataset cache, the least recently staged datasets are evicted beyond it')
+    parser.add_argument('--slow-call-ms', type=float, default=None,
+                        help='Log the calls slower than this with their phases, not logged if not set')
+    parser.add_argument('--profile-mode', type=str, choices=['stack', 'cprofile'], default='stack',
+                        help='How slow calls are captured: stack samples taken while they run, '
+                             'or a cProfile profile of every call, kept for the slow ones')
+    parser.add_argument('--zygote', type=str, default=None,
+                        help='Serve a zygote on this Unix socket instead: it preloads the worker modules '
+                             'and forks a worker for each launch request')
+    parser.add_argument('--prefork', type=int, default=2, help='Workers the zygote forks ahead of the launches')
+    parser.add_argument('--via-zygote', type=str, default=None,
+                        help='Launch the worker from the zygote serving this Unix socket and print its pid')
 
     return parser
 
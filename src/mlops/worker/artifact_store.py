@@ -0,0 +1,105 @@
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from mlops.common.artifacts import ChunkWriter, list_files, read_chunks, resolve_path, DEFAULT_CHUNK_SIZE
+from mlops.common.datasets import DatasetManifest
+from mlops.protos import worker_pb2
+from mlops.worker.dataset_cache import DatasetCache
+
+
+class ArtifactStore:
+    """
+    The artifacts of a worker, each in a directory of the artifact directory
+
+    Artifacts are what the cluster uploads for a task and downloads after it, e.g. its input and output directories,
+    so the worker doesn't need to share a filesystem with the cluster.
+    """
+
+    def __init__(self, root: Path, datasets: DatasetCache | None = None):
+        """
+        :param root: the artifact directory
+        :param datasets: cache of the datasets staged as artifacts, datasets can't be staged if None
+        """
+        self.root = root
+        self.datasets = datasets
+
+    def get_path(self, artifact: str) -> Path:
+        """
+        :param artifact: name of the artifact, e.g. "task-1/input"
+        :return: directory of the artifact
+        :raises ValueError: if the name is not a path in the artifact directory
+        """
+        return resolve_path(self.root, artifact)
+
+    def get_info(self, artifact: str) -> worker_pb2.ArtifactInfo:
+        return worker_pb2.ArtifactInfo(
+            artifact=artifact,
+            files=[
+                worker_pb2.ArtifactFile(path=path, size=size)
+                for path, size in sorted(list_files(self.get_path(artifact)).items())
+            ]
+        )
+
+    def write(self, chunks: Iterator[worker_pb2.ArtifactChunk]) -> worker_pb2.ArtifactInfo:
+        """
+        Write the chunks of an artifact
+
+        :param chunks: chunks of a single artifact
+        :return: the artifact with the files written, their size is the end of the data written
+        :raises ValueError: if a chunk is invalid
+        """
+        artifact = None
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    artifact = chunk.artifact
+                    writer = ChunkWriter(self.get_path(artifact))
+                elif chunk.artifact != artifact:
+                    raise ValueError(f'chunk of artifact {chunk.artifact!r} in the upload of {artifact!r}')
+                writer.write(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        offsets = writer.get_offsets() if writer is not None else {}
+        return worker_pb2.ArtifactInfo(
+            artifact=artifact or '',
+            files=[worker_pb2.ArtifactFile(path=path, size=size) for path, size in sorted(offsets.items())]
+        )
+
+    def read(
+            self,
+            artifact: str,
+            offsets: Mapping[str, int] | None = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            compression: int = worker_pb2.CHUNK_COMPRESSION_ZLIB
+    ) -> Iterator[worker_pb2.ArtifactChunk]:
+        """
+        Read the files of an artifact as chunks, one file after another
+
+        :param artifact: name of the artifact
+        :param offsets: path -> offset of the files to read, all the files from the start if None
+        :param chunk_size: size of the uncompressed data of a chunk
+        :param compression: ChunkCompression of the chunks
+        :return: the chunks
+        :raises ValueError: if the artifact or a path is not in the artifact directory
+        """
+        path = self.get_path(artifact)
+        if offsets is None:
+            offsets = dict.fromkeys(list_files(path), 0)
+        for relative, offset in offsets.items():
+            yield from read_chunks(path, relative, artifact, offset, chunk_size, compression)
+
+    def stage_dataset(self, artifact: str, manifest: DatasetManifest) -> list[str]:
+        """
+        Stage a dataset as an artifact, see DatasetCache.stage
+
+        :param artifact: name of the artifact
+        :param manifest: manifest of the dataset
+        :return: paths of the files to upload before staging again, the dataset is staged if empty
+        :raises ValueError: if the store has no dataset cache,
+            or if the artifact or a path is not in the artifact directory
+        """
+        if self.datasets is None:
+            raise ValueError('no dataset cache')
+        return self.datasets.stage(manifest, self.get_path(artifact))
@@ -1,11 +1,13 @@
-from datetime import datetime
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import replace
 
-from google.protobuf import struct_pb2
-from google.protobuf import timestamp_pb2
+import grpc
 
 from mlops.cluster.interfaces import WorkerClusterWorkerControllerBase
-from mlops.common.model import TrainingStatus, WorkerStatus, WorkerData
-from mlops.protos import worker_cluster_pb2_grpc, messages_pb2, worker_cluster_pb2
+from mlops.common.codec import to_raw_worker_status, to_raw_training_status, to_raw_worker_data
+from mlops.common.model import TrainingStatus, WorkerStatus, WorkerData, DATASETS_OPTION
+from mlops.protos import worker_cluster_pb2_grpc, worker_cluster_pb2
 
 
 class ClusterBridge(WorkerClusterWorkerControllerBase):
@@ -13,40 +15,191 @@ class ClusterBridge(WorkerClusterWorkerControllerBase):
         self.stub = stub
 
     def check_in(self, worker_data: WorkerData) -> str:
-        options = struct_pb2.Struct()
-        options.update(worker_data.options)
-        return self.stub.CheckIn(messages_pb2.WorkerData(
-            host=worker_data.host,
-            port=worker_data.port,
-            task_type=worker_data.task_type,
-            options=options
-        )).uuid
+        return self.stub.CheckIn(to_raw_worker_data(worker_data)).uuid
 
     def report_status(self, worker_status: WorkerStatus) -> None:
-        self.stub.ReportStatus(messages_pb2.WorkerStatus(
-            id=worker_status.id,
-            task_type=worker_status.task_type,
-            healthy=worker_status.healthy,
-            has_task=worker_status.has_task,
-            joined_at=self._to_timestamp(worker_status.joined_at),
-            created_at=self._to_timestamp(worker_status.created_at),
-        ))
-
-    def report_training_status(self, worker_id: str, training_status: TrainingStatus | None) -> None:
-        self.stub.ReportTrainingStatus(worker_cluster_pb2.ReportTrainingStatusRequest(
+        self.stub.ReportStatus(self._to_report_status_request(worker_status))
+
+    def report_training_status(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> None:
+        self.stub.ReportTrainingStatus(self._to_report_training_status_request(worker_id, training_status, task_id))
+
+    def _to_report_status_request(self, worker_status: WorkerStatus) -> worker_cluster_pb2.ReportStatusRequest:
+        return worker_cluster_pb2.ReportStatusRequest(status=to_raw_worker_status(worker_status))
+
+    def _to_report_training_status_request(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> worker_cluster_pb2.ReportTrainingStatusRequest:
+        return worker_cluster_pb2.ReportTrainingStatusRequest(
             worker_id=worker_id,
-            status=messages_pb2.TrainingStatus(
-                name=training_status.name,
-                phase=training_status.phase,
-                progress=training_status.progress,
-                description=training_status.description,
-                is_completed=training_status.is_complete,
-            ) if training_status is not None else None
-        ))
-
-    def _to_timestamp(self, dt: datetime | None) -> timestamp_pb2:
-        if dt is None:
-            return None
-        ts = timestamp_pb2.Timestamp()
-        ts.FromDatetime(dt)
-        return ts
+            status=to_raw_training_status(training_status) if training_status is not None else None,
+            task_id=task_id
+        )
+
+
+class CoalescingClusterBridge(ClusterBridge):
+    """
+    Cluster bridge sending status reports asynchronously over a single ReportStatusStream call
+
+    Reports return immediately. Only the latest status of each worker and training status of each task are kept,
+    and they are flushed at most once per flush interval, so a chatty worker costs at most one message
+    per worker per interval. When the stream can not keep up, the reports keep being coalesced while
+    waiting, which bounds the memory used by pending reports.
+    The stream is reopened if it fails, resending the last reports that are not superseded.
+    The last status is also resent when nothing was reported for heartbeat_interval seconds,
+    which renews the lease of the worker on the cluster.
+    """
+
+    _pending_status: dict[str, WorkerStatus]
+    _pending_training_status: dict[tuple[str, int | None], TrainingStatus | None]  # (worker id, task id) -> status
+    _sent_status: dict[str, WorkerStatus]
+    _sent_training_status: dict[tuple[str, int | None], TrainingStatus | None]
+    _cond: threading.Condition
+    _closed: bool
+    _close_event: threading.Event
+    _stream_thread: threading.Thread
+
+    def __init__(
+            self,
+            stub: worker_cluster_pb2_grpc.WorkerClusterWorkerStub,
+            flush_interval: float = 0.5,
+            retry_interval: float = 5.,
+            heartbeat_interval: float = 10.
+    ):
+        super().__init__(stub)
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.heartbeat_interval = heartbeat_interval
+        self._pending_status = {}
+        self._pending_training_status = {}
+        self._sent_status = {}
+        self._sent_training_status = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._close_event = threading.Event()
+        self._stream_thread = threading.Thread(target=self._stream, daemon=True)
+        self._stream_thread.start()
+
+    def report_status(self, worker_status: WorkerStatus) -> None:
+        worker_status = replace(worker_status)  # The caller may keep mutating its status
+        with self._cond:
+            self._pending_status[worker_status.id] = worker_status
+            self._cond.notify()
+
+    def report_training_status(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> None:
+        if training_status is not None:
+            training_status = replace(training_status)
+        with self._cond:
+            self._pending_training_status[worker_id, task_id] = training_status
+            self._cond.notify()
+
+    def close(self) -> None:
+        """
+        Flush the pending reports and close the stream
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._close_event.set()
+        self._stream_thread.join()
+
+    def _stream(self) -> None:
+        while True:
+            try:
+                self.stub.ReportStatusStream(self._reports())
+                return  # Closed
+            except grpc.RpcError:
+                with self._cond:
+                    if self._closed:
+                        return
+                    # Resend what may have been lost, unless newer reports are pending
+                    self._pending_status = {**self._sent_status, **self._pending_status}
+                    self._pending_training_status = {**self._sent_training_status, **self._pending_training_status}
+                self._close_event.wait(self.retry_interval)
+
+    def _reports(self) -> Iterator[worker_cluster_pb2.StatusReport]:
+        while True:
+            with self._cond:
+                if not self._cond.wait_for(
+                        lambda: self._pending_status or self._pending_training_status or self._closed,
+                        self.heartbeat_interval
+                ):
+                    self._pending_status.update(self._sent_status)  # Heartbeat
+                statuses, self._pending_status = self._pending_status, {}
+                training_statuses, self._pending_training_status = self._pending_training_status, {}
+                closed = self._closed
+                self._sent_status.update(statuses)
+                # Complete training statuses are kept for a resend until the next flush only, tasks come and go
+                self._sent_training_status = {
+                    key: training_status for key, training_status in self._sent_training_status.items()
+                    if training_status is None or not training_status.is_complete
+                }
+                self._sent_training_status.update(training_statuses)
+
+            for worker_status in statuses.values():
+                yield worker_cluster_pb2.StatusReport(status=self._to_report_status_request(worker_status))
+            for (worker_id, task_id), training_status in training_statuses.items():
+                yield worker_cluster_pb2.StatusReport(
+                    training_status=self._to_report_training_status_request(worker_id, training_status, task_id)
+                )
+
+            if closed:
+                return
+            self._close_event.wait(self.flush_interval)
+
+
+class DatasetAdvertisingClusterBridge(WorkerClusterWorkerControllerBase):
+    """
+    Cluster bridge advertising the datasets cached by a worker, in its check-in options and in its status reports
+
+    Call refresh when the cached datasets change, the last status is reported again with the current datasets.
+    """
+
+    _last_status: WorkerStatus | None
+    _lock: threading.Lock
+
+    def __init__(self, cluster: WorkerClusterWorkerControllerBase, get_datasets: Callable[[], Iterable[str]]):
+        """
+        :param cluster: the bridge to report through
+        :param get_datasets: returns the digests of the cached datasets, e.g. DatasetCache.get_digests
+        """
+        self.cluster = cluster
+        self.get_datasets = get_datasets
+        self._last_status = None
+        self._lock = threading.Lock()
+
+    def check_in(self, worker_data: WorkerData) -> str:
+        return self.cluster.check_in(
+            replace(worker_data, options={**worker_data.options, DATASETS_OPTION: list(self.get_datasets())})
+        )
+
+    def report_status(self, worker_status: WorkerStatus) -> None:
+        with self._lock:
+            self._last_status = replace(worker_status, datasets=tuple(self.get_datasets()))
+            self.cluster.report_status(self._last_status)
+
+    def report_training_status(
+            self,
+            worker_id: str,
+            training_status: TrainingStatus | None,
+            task_id: int | None = None
+    ) -> None:
+        self.cluster.report_training_status(worker_id, training_status, task_id)
+
+    def refresh(self) -> None:
+        with self._lock:
+            if self._last_status is not None:
+                self._last_status = replace(self._last_status, datasets=tuple(self.get_datasets()))
+                self.cluster.report_status(self._last_status)
@@ -0,0 +1,234 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from mlops.common.artifacts import resolve_path
+from mlops.common.datasets import DatasetFile, DatasetManifest, hash_file
+
+__ALL__ = ['DatasetCache']
+
+logger = logging.getLogger(__name__)
+
+# ioctl cloning a file on filesystems with copy-on-write, e.g. Btrfs and XFS
+_FICLONE = 0x40049409
+
+
+class DatasetCache:
+    """
+    Content-addressed store of the datasets staged on a worker
+
+    Each distinct file is stored once as a blob named by its digest, and a dataset is its manifest.
+    Staging a cached dataset materializes its blobs into the task directory without copying data: as reflinks where
+    the filesystem supports them, otherwise as hardlinks to read-only blobs, and only copied as a last resort.
+    The cache and the task directories must be on the same filesystem to link.
+    An uploaded file is added to the cache as a reflink or a copy, never as a hardlink of the file itself,
+    then materialized from its blob.
+
+    The least recently staged datasets are evicted when the blobs exceed max_bytes, a blob is deleted with the last
+    dataset using it. Files already materialized keep their data, they are links to the blob or copies.
+    It's thread-safe.
+    """
+
+    _datasets: OrderedDict[str, DatasetManifest]  # digest -> manifest, least recently staged first
+    _refs: dict[str, int]  # blob digest -> number of cached datasets using it
+    _blob_sizes: dict[str, int]
+    _total_bytes: int
+    _lock: threading.RLock
+
+    def __init__(self, root: Path, max_bytes: int, on_change: Callable[[], None] | None = None):
+        """
+        :param root: directory of the cache
+        :param max_bytes: maximum size of the blobs, the last dataset staged is kept even if it's larger
+        :param on_change: called when a dataset is added or evicted, e.g. to advertise the datasets again
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.on_change = on_change
+        self._blobs_dir = root / 'blobs'
+        self._datasets_dir = root / 'datasets'
+        self._datasets = OrderedDict()
+        self._refs = {}
+        self._blob_sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+
+    def load(self) -> None:
+        """
+        Load the datasets cached by a previous run, delete the blobs no dataset uses
+        """
+        self._blobs_dir.mkdir(parents=True, exist_ok=True)
+        self._datasets_dir.mkdir(parents=True, exist_ok=True)
+        manifest_paths = sorted(self._datasets_dir.glob('*.json'), key=lambda path: path.stat().st_mtime_ns)
+        with self._lock:
+            for path in manifest_paths:
+                files = {
+                    relative: DatasetFile(digest, size)
+                    for relative, (digest, size) in json.loads(path.read_text())['files'].items()
+                }
+                manifest = DatasetManifest.from_files(files)
+                blobs = [self._get_blob_path(file.digest) for file in files.values()]
+                if manifest.digest != path.stem or not all(blob.exists() for blob in blobs):
+                    logger.warning('dropping the incomplete cached dataset %s', path.stem)
+                    path.unlink()
+                    continue
+                self._add(manifest)
+            for blob in self._blobs_dir.glob('*/*'):
+                if blob.name not in self._refs:
+                    blob.unlink()
+            self._evict()
+
+    def get_digests(self) -> list[str]:
+        """
+        :return: digests of the cached datasets, most recently staged first
+        """
+        with self._lock:
+            return list(reversed(self._datasets))
+
+    def get_size(self) -> int:
+        with self._lock:
+            return self._total_bytes
+
+    def stage(self, manifest: DatasetManifest, target: Path) -> list[str]:
+        """
+        Stage a dataset into a directory
+
+        The files whose content is cached are materialized from their blobs. The other files must be written to
+        the directory, e.g. uploaded, before staging again: they are then verified against the manifest and added
+        to the cache with the dataset.
+
+        :param manifest: manifest of the dataset
+        :param target: the directory to stage into
+        :return: paths of the files still missing in the directory, the dataset is staged if empty
+        """
+        with self._lock:
+            if manifest.digest in self._datasets:
+                self._datasets.move_to_end(manifest.digest)
+                os.utime(self._get_manifest_path(manifest.digest))
+
+        missing = []
+        uploaded: dict[str, Path] = {}  # blob digest -> uploaded file to add to the cache
+        for relative, file in manifest.files.items():
+            path = resolve_path(target, relative)
+            blob = self._get_blob_path(file.digest)
+            if file.digest in uploaded:
+                _materialize(uploaded[file.digest], path)  # A file with the same content was uploaded
+            elif _materialize(blob, path):
+                pass
+            elif path.is_file() and path.stat().st_size == file.size and hash_file(path) == file.digest:
+                uploaded[file.digest] = path
+            else:
+                path.unlink(missing_ok=True)  # A partial or different file, to upload again
+                missing.append(relative)
+        if missing:
+            return missing
+
+        with self._lock:
+            for digest, path in uploaded.items():
+                _store_blob(path, self._get_blob_path(digest))
+            if manifest.digest not in self._datasets:
+                self._get_manifest_path(manifest.digest).write_text(json.dumps({
+                    'files': {relative: [file.digest, file.size] for relative, file in manifest.files.items()}
+                }))
+                self._add(manifest)
+                self._evict()
+                changed = True
+            else:
+                changed = False
+        if changed and self.on_change is not None:
+            self.on_change()
+        return []
+
+    def _add(self, manifest: DatasetManifest) -> None:
+        self._datasets[manifest.digest] = manifest
+        for file in manifest.files.values():
+            refs = self._refs.get(file.digest, 0)
+            if refs == 0:
+                self._blob_sizes[file.digest] = file.size
+                self._total_bytes += file.size
+            self._refs[file.digest] = refs + 1
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._datasets) > 1:
+            digest, manifest = self._datasets.popitem(last=False)
+            self._get_manifest_path(digest).unlink(missing_ok=True)
+            for file in manifest.files.values():
+                self._refs[file.digest] -= 1
+                if self._refs[file.digest] == 0:
+                    del self._refs[file.digest]
+                    self._total_bytes -= self._blob_sizes.pop(file.digest)
+                    self._get_blob_path(file.digest).unlink(missing_ok=True)
+            logger.info('evicted the cached dataset %s', digest)
+
+    def _get_blob_path(self, digest: str) -> Path:
+        return self._blobs_dir / digest[:2] / digest
+
+    def _get_manifest_path(self, digest: str) -> Path:
+        return self._datasets_dir / f'{digest}.json'
+
+
+def _materialize(source: Path, path: Path) -> bool:
+    """
+    Materialize a file at a path: reflink it, or hardlink it, or copy it
+
+    :return: False if the source doesn't exist
+    """
+    try:
+        if path.exists() and os.path.samefile(source, path):
+            return True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'.{path.name}.{uuid.uuid4().hex}')
+        try:
+            _link(source, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _store_blob(path: Path, blob: Path) -> None:
+    """
+    Add an uploaded file to the blobs as an independent copy, then materialize the file from its blob
+    """
+    if not blob.exists():
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_blob = blob.with_name(f'.{blob.name}.{uuid.uuid4().hex}')
+        try:
+            if not _reflink(path, tmp_blob):
+                shutil.copyfile(path, tmp_blob)
+            os.chmod(tmp_blob, 0o444)  # Blobs are hardlinked into the task directories
+            os.replace(tmp_blob, blob)
+        finally:
+            tmp_blob.unlink(missing_ok=True)
+    _materialize(blob, path)
+
+
+def _link(source: Path, path: Path) -> None:
+    """
+    Create path with the content of source
+    """
+    if _reflink(source, path):
+        return
+    try:
+        os.link(source, path)
+    except OSError:  # e.g. another filesystem
+        shutil.copyfile(source, path)
+
+
+def _reflink(source: Path, path: Path) -> bool:
+    with open(source, 'rb') as source_file, open(path, 'wb') as file:
+        try:
+            fcntl.ioctl(file.fileno(), _FICLONE, source_file.fileno())
+            return True
+        except OSError:
+            pass
+    path.unlink()
+    return False
@@ -0,0 +1,45 @@
+"""
+Worker implementations by name, each imported only when a worker of its type is created
+"""
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mlops.worker.interfaces import WorkerBase
+
+__ALL__ = ['WORKER_TYPES', 'create_worker', 'get_default_worker_type']
+
+
+def _create_testing_worker(slots: int) -> 'WorkerBase':
+    from mlops.worker.testing_worker import TestingWorker
+    return TestingWorker()
+
+
+def _create_process_pool_worker(slots: int) -> 'WorkerBase':
+    from mlops.worker.process_pool_worker import ProcessPoolWorker
+    return ProcessPoolWorker(slots)
+
+
+# Worker type -> (module of the implementation, factory taking the number of slots)
+WORKER_TYPES: dict[str, tuple[str, Callable[[int], 'WorkerBase']]] = {
+    'testing': ('mlops.worker.testing_worker', _create_testing_worker),
+    'process-pool': ('mlops.worker.process_pool_worker', _create_process_pool_worker),
+}
+
+
+def get_default_worker_type(slots: int) -> str:
+    return 'process-pool' if slots > 1 else 'testing'
+
+
+def create_worker(worker_type: str, slots: int) -> 'WorkerBase':
+    """
+    Create a worker, importing its implementation
+
+    :param worker_type: a key of WORKER_TYPES
+    :param slots: number of tasks run at once, ignored by single-slot workers
+    :return: the worker, not initialized yet
+    """
+    if worker_type not in WORKER_TYPES:
+        raise ValueError(f'unknown worker type: {worker_type}')
+    _, factory = WORKER_TYPES[worker_type]
+    return factory(slots)
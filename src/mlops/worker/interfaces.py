@@ -9,6 +9,7 @@ from mlops.common.model import WorkerStatus
 @dataclass
 class WorkerStartOptions:
     task_path: str  # TODO sep input and output path
+    task_id: int | None = None
 
 
 @dataclass
@@ -40,9 +41,11 @@ class WorkerControllerBase(ABC):
         """
 
     @abstractmethod
-    def stop(self) -> None:
+    def stop(self, task_id: int | None = None) -> None:
         """
         Stop the worker
+
+        :param task_id: stop only this task, or all the tasks of the worker if None
         """
 
 
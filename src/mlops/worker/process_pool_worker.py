@@ -0,0 +1,160 @@
+import functools
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+from mlops.cluster.interfaces import WorkerClusterWorkerControllerBase
+from mlops.common.model import WorkerStatus, WorkerData, TrainingStatus, SLOTS_OPTION
+from mlops.worker.interfaces import WorkerBase, WorkerStartOptions, WorkerInitOptions
+from mlops.worker.testing_worker import run_testing_task
+
+# Phases of the training status reported when a task ends
+SUCCEEDED_PHASE = 'succeeded'
+FAILED_PHASE = 'failed'
+STOPPED_PHASE = 'stopped'
+
+
+class ProcessPoolWorker(WorkerBase):
+    """
+    A worker running tasks in a process pool, one task per slot
+
+    The number of slots is advertised to the cluster on check in, see SLOTS_OPTION.
+    The end of each task is reported as a complete training status of its task id, which frees its slot on the cluster.
+    A task already running in a process can not be interrupted, stopping it only discards its outcome
+    and its slot stays in use until the process is done.
+    """
+
+    _status_lock: threading.Lock
+    _status: WorkerStatus
+    _tasks: dict[int | str, Future]  # task id, or task path if the task has no id -> future of the running task
+    _stopped: set[int | str]  # tasks stopped while running
+    _executor: ProcessPoolExecutor
+    _cluster: WorkerClusterWorkerControllerBase | None = None
+
+    __TYPE__ = 'testing'
+    __VERSION__ = '0.1.0'
+
+    def __init__(self, slots: int | None = None, task_fn: Callable[[Path], bool] = run_testing_task):
+        """
+        :param slots: number of tasks run at once, the number of CPUs if None
+        :param task_fn: function running a task from its path and returning if it succeeded,
+            it must be picklable
+        """
+        self.slots = slots if slots is not None else os.cpu_count() or 1
+        self.task_fn = task_fn
+        self._status = WorkerStatus(
+            id='',
+            task_type=self.__TYPE__,
+            version=self.__VERSION__,
+            healthy=False,
+            has_task=False,
+            joined_at=None,
+            created_at=datetime.now(),
+            slots=self.slots
+        )
+        self._tasks = {}
+        self._stopped = set()
+        self._status_lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=self.slots)
+
+    def get_status(self) -> WorkerStatus:
+        with self._status_lock:
+            return replace(self._status)
+
+    def start(self, options: WorkerStartOptions) -> None:
+        key = options.task_id if options.task_id is not None else options.task_path
+        with self._status_lock:
+            if key in self._tasks:
+                raise RuntimeError(f'task {key} is already running')
+            if len(self._tasks) >= self.slots:
+                raise RuntimeError('no free slot')
+            future = self._executor.submit(self.task_fn, Path(options.task_path))
+            self._tasks[key] = future
+            status = self._update_status()
+        # Outside the lock, the callback runs immediately if the task is already done
+        future.add_done_callback(functools.partial(self._on_done, key, options.task_id))
+        self._report_status(status)
+
+    def stop(self, task_id: int | None = None) -> None:
+        with self._status_lock:
+            if task_id is None:
+                futures = list(self._tasks.items())
+            else:
+                futures = [(task_id, self._tasks[task_id])] if task_id in self._tasks else []
+            self._stopped.update(key for key, _ in futures)
+        for _, future in futures:
+            future.cancel()  # Frees the slot at once if the task is not running yet
+
+    def init(self, cluster: WorkerClusterWorkerControllerBase, options: WorkerInitOptions) -> None:
+        self._cluster = cluster
+        worker_id = cluster.check_in(WorkerData(
+            host=options.host,
+            port=options.port,
+            task_type=self.__TYPE__,
+            version=self.__VERSION__,
+            options={**options.options, SLOTS_OPTION: self.slots}
+        ))
+
+        with self._status_lock:
+            self._status.id = worker_id
+            self._status.joined_at = datetime.now()
+            self._status.healthy = True
+            status = replace(self._status)
+
+        cluster.report_status(status)
+
+    def shutdown(self) -> None:
+        with self._status_lock:
+            # Prevent the cluster from assigning tasks to this worker
+            self._status.healthy = False
+            status = replace(self._status)
+        self._report_status(status)
+        self._executor.shutdown(cancel_futures=True)
+
+    def _on_done(self, key: int | str, task_id: int | None, future: Future) -> None:
+        with self._status_lock:
+            if self._tasks.get(key) is not future:
+                return
+            del self._tasks[key]
+            stopped = key in self._stopped
+            self._stopped.discard(key)
+            status = self._update_status()
+
+        if stopped or future.cancelled():
+            phase, description = STOPPED_PHASE, 'stopped'
+        elif future.exception() is not None:
+            phase, description = FAILED_PHASE, repr(future.exception())
+        elif not future.result():
+            phase, description = FAILED_PHASE, 'the task failed'
+        else:
+            phase, description = SUCCEEDED_PHASE, ''
+        if self._cluster is not None:
+            self._cluster.report_training_status(status.id, TrainingStatus(
+                name=str(key),
+                phase=phase,
+                progress=1. if phase == SUCCEEDED_PHASE else 0.,
+                description=description,
+                is_complete=True
+            ), task_id)
+        self._report_status(status)
+
+    def _update_status(self) -> WorkerStatus:
+        """
+        Update the task counts of the status, the caller must hold the status lock
+
+        :return: a copy of the status
+        """
+        self._status.running_tasks = len(self._tasks)
+        self._status.has_task = bool(self._tasks)
+        return replace(self._status)
+
+    def _report_status(self, status: WorkerStatus) -> None:
+        if self._cluster is not None:
+            self._cluster.report_status(status)
+
+    def __repr__(self):
+        return f'<ProcessPoolWorker version={self.__VERSION__} slots={self.slots} status={self.get_status()}>'
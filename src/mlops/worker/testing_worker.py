@@ -1,8 +1,8 @@
 import json
 import threading
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from time import sleep
 
 from mlops.cluster.interfaces import WorkerClusterWorkerControllerBase
 from mlops.common.model import WorkerStatus, WorkerData
@@ -12,12 +12,17 @@ from mlops.worker.interfaces import WorkerBase, WorkerStartOptions, WorkerInitOp
 class TestingWorker(WorkerBase):
     """
     A testing worker that writes a simple file to the filesystem.
+
+    The task thread waits on the status condition, which is notified by every status change,
+    so an assigned task is picked up immediately and status calls never wait behind an idle task thread.
+    Statuses are reported to the cluster as copies, after releasing the lock.
     """
 
-    _status_lock: threading.RLock
+    _status_lock: threading.Condition
     _close: threading.Event
     _status: WorkerStatus
     _current_task_path: Path | None = None
+    _task_serial: int = 0  # incremented by each start, so the task thread only clears the task it ran
     _task_thread: threading.Thread
     _cluster: WorkerClusterWorkerControllerBase = None
 
@@ -34,31 +39,35 @@ class TestingWorker(WorkerBase):
             joined_at=None,
             created_at=datetime.now()
         )
-        self._status_lock = threading.RLock()
+        self._status_lock = threading.Condition(threading.RLock())
         self._close = threading.Event()
 
         self._task_thread = threading.Thread(target=self._loop)
         self._task_thread.start()
 
-    def _report_status(self):
+    def _report_status(self, status: WorkerStatus) -> None:
         if self._cluster is not None:
-            self._cluster.report_status(self.get_status())
+            self._cluster.report_status(status)
 
     def get_status(self) -> WorkerStatus:
         with self._status_lock:
-            return self._status
+            return replace(self._status)
 
     def start(self, options: WorkerStartOptions) -> None:
         with self._status_lock:
             self._status.has_task = True
+            self._status.running_tasks = 1
             self._current_task_path = Path(options.task_path)
-            self._report_status()
+            self._task_serial += 1
+            self._status_lock.notify_all()
+            status = replace(self._status)
+        self._report_status(status)
 
-    def stop(self) -> None:
+    def stop(self, task_id: int | None = None) -> None:
         with self._status_lock:
-            self._status.has_task = False
-            self._current_task_path = None
-            self._report_status()
+            self._clear_task()
+            status = replace(self._status)
+        self._report_status(status)
 
     def init(self, cluster: WorkerClusterWorkerControllerBase, options: WorkerInitOptions) -> None:
         self._cluster = cluster
@@ -67,65 +76,98 @@ class TestingWorker(WorkerBase):
             port=options.port,
             task_type=self.__TYPE__,
             version=self.__VERSION__,
-            options={}
+            options=options.options
         ))
 
         with self._status_lock:
             self._status.id = worker_id
             self._status.joined_at = datetime.now()
             self._status.healthy = True
-            _status = self._status
+            self._status_lock.notify_all()
+            status = replace(self._status)
 
-        cluster.report_status(_status)
+        cluster.report_status(status)
 
     def shutdown(self) -> None:
         with self._status_lock:
             # This is a workaround to prevent cluster assigning tasks to this worker
             # currently, the cluster does not have a way to remove a worker from the list
             self._status.healthy = False
-            self._report_status()
-
-        self._close.set()
+            self._close.set()
+            self._status_lock.notify_all()
+            status = replace(self._status)
+        self._report_status(status)
         self._task_thread.join()
 
     def _loop(self) -> None:
-        while not self._close.wait(0):
+        while True:
             with self._status_lock:
-                if not self._status.has_task or self._status.joined_at is None or not self._status.healthy:
-                    sleep(10)
-                    continue
-
+                self._status_lock.wait_for(self._is_ready)
+                if self._close.is_set():
+                    return
                 task_path = self._current_task_path
-            if not (task_path / 'config.json').is_file():
-                self._end_task(task_path, False)
-                continue
+                task_serial = self._task_serial
+            run_testing_task(task_path)
+            with self._status_lock:
+                if self._task_serial != task_serial or not self._status.has_task:
+                    continue  # Stopped, or replaced by a new task, while running
+                self._clear_task()
+                status = replace(self._status)
+            self._report_status(status)
+
+    def _clear_task(self) -> None:
+        """
+        Free the worker, the caller must hold the status lock
+        """
+        self._status.has_task = False
+        self._status.running_tasks = 0
+        self._current_task_path = None
+        self._status_lock.notify_all()
+
+    def _is_ready(self) -> bool:
+        """
+        Check if the task thread has work to do, the caller must hold the status lock
+        """
+        if self._close.is_set():
+            return True
+        return self._status.has_task and self._status.joined_at is not None and self._status.healthy
+
+    def __repr__(self):
+        return f'<TestingWorker version={self.__VERSION__} status={self.get_status()}>'
 
-            try:
-                cfg = json.load((task_path / 'config.json').open())
-            except json.JSONDecodeError:
-                self._end_task(task_path, False)
-                continue
 
-            if not isinstance(cfg, dict):
-                self._end_task(task_path, False)
-                continue
+def run_testing_task(task_path: Path) -> bool:
+    """
+    Run a testing task, add the num of its config.json to its record.txt and write the outcome to its status.txt
 
-            num = cfg.get('num', 5)
+    It's a module level function, so it can also run in a child process.
 
-            record_file = task_path / 'record.txt'
-            cur_text = record_file.read_text() if record_file.exists() else ""
-            cur = int(cur_text) if cur_text != "" else 0
-            new_val = cur + num
-            record_file.write_text(str(new_val))
+    :param task_path: directory of the task
+    :return: True if the task succeeded, False otherwise
+    """
+    success = _add_record(task_path)
+    (task_path / 'status.txt').write_text('success' if success else 'failure')
+    return success
 
-            if new_val >= num:
-                self._end_task(task_path, True)
 
-    def _end_task(self, task_path: Path, success: bool) -> None:
-        status_file = task_path / 'status.txt'
-        with status_file.open('w') as f:
-            f.write('success' if success else 'failure')
-        self.stop()
+def _add_record(task_path: Path) -> bool:
+    config_file = task_path / 'config.json'
+    if not config_file.is_file():
+        return False
 
-    def __repr__(self):
-        return f'<TestingWorker version={self.__VERSION__} status={self.get_status()}>'
+    try:
+        cfg = json.loads(config_file.read_text())
+    except json.JSONDecodeError:
+        return False
+
+    if not isinstance(cfg, dict):
+        return False
+
+    num = cfg.get('num', 5)
+
+    record_file = task_path / 'record.txt'
+    cur_text = record_file.read_text() if record_file.exists() else ""
+    cur = int(cur_text) if cur_text != "" else 0
+    new_val = cur + num
+    record_file.write_text(str(new_val))
+    return new_val >= num
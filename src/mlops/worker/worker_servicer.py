@@ -1,28 +1,114 @@
+from collections.abc import Iterator
+
+import grpc
+from google.protobuf import empty_pb2
+
+from mlops.common.artifacts import DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE
+from mlops.common.codec import to_raw_worker_status
+from mlops.common.datasets import DatasetFile, DatasetManifest
+from mlops.common.grpc_metrics import instrument_servicer
 from mlops.protos import worker_pb2, worker_pb2_grpc, messages_pb2
-from mlops.worker.interfaces import WorkerBase
+from mlops.worker.artifact_store import ArtifactStore
+from mlops.worker.interfaces import WorkerBase, WorkerStartOptions
 
 
+@instrument_servicer('Worker')
 class WorkerServicer(worker_pb2_grpc.WorkerServicer):
-    def __init__(self, worker: WorkerBase):
+    def __init__(self, worker: WorkerBase, artifacts: ArtifactStore | None = None):
+        """
+        :param worker: the worker to serve
+        :param artifacts: the artifacts of the worker, the artifact RPCs are not implemented if None
+        """
         self.worker = worker
+        self.artifacts = artifacts
 
     def GetStatus(
             self,
-            request: None,
-            context
+            request: empty_pb2.Empty,
+            context: grpc.ServicerContext
     ) -> messages_pb2.WorkerStatus:
-        return super().GetStatus(request, context)
+        return to_raw_worker_status(self.worker.get_status())
 
     def StartWorker(
             self,
             request: worker_pb2.StartWorkerRequest,
-            context
-    ) -> None:
-        return super().StartWorker(request, context)
+            context: grpc.ServicerContext
+    ) -> empty_pb2.Empty:
+        self.worker.start(WorkerStartOptions(
+            task_path=request.task_path,
+            task_id=request.task_id if request.HasField('task_id') else None
+        ))
+        return empty_pb2.Empty()
 
     def StopWorker(
             self,
-            request: None,
-            context
-    ) -> None:
-        return super().StopWorker(request, context)
\ No newline at end of file
+            request: worker_pb2.StopWorkerRequest,
+            context: grpc.ServicerContext
+    ) -> empty_pb2.Empty:
+        self.worker.stop(request.task_id if request.HasField('task_id') else None)
+        return empty_pb2.Empty()
+
+    def GetArtifactInfo(
+            self,
+            request: worker_pb2.ArtifactRequest,
+            context: grpc.ServicerContext
+    ) -> worker_pb2.ArtifactInfo:
+        if self.artifacts is None:
+            return super().GetArtifactInfo(request, context)
+        try:
+            return self.artifacts.get_info(request.artifact)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+    def UploadArtifact(
+            self,
+            request_iterator: Iterator[worker_pb2.ArtifactChunk],
+            context: grpc.ServicerContext
+    ) -> worker_pb2.ArtifactInfo:
+        if self.artifacts is None:
+            return super().UploadArtifact(request_iterator, context)
+        try:
+            return self.artifacts.write(request_iterator)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+    def DownloadArtifact(
+            self,
+            request: worker_pb2.DownloadArtifactRequest,
+            context: grpc.ServicerContext
+    ) -> Iterator[worker_pb2.ArtifactChunk]:
+        if self.artifacts is None:
+            return super().DownloadArtifact(request, context)
+        return self._download_artifact(request, context)
+
+    def StageDataset(
+            self,
+            request: worker_pb2.StageDatasetRequest,
+            context: grpc.ServicerContext
+    ) -> worker_pb2.StageDatasetResponse:
+        if self.artifacts is None or self.artifacts.datasets is None:
+            return super().StageDataset(request, context)
+        manifest = DatasetManifest.from_files({
+            file.path: DatasetFile(file.digest, file.size) for file in request.files
+        })
+        if manifest.digest != request.digest:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f'the files are not the dataset {request.digest}')
+        try:
+            missing_paths = self.artifacts.stage_dataset(request.artifact, manifest)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return worker_pb2.StageDatasetResponse(missing_paths=missing_paths)
+
+    def _download_artifact(
+            self,
+            request: worker_pb2.DownloadArtifactRequest,
+            context: grpc.ServicerContext
+    ) -> Iterator[worker_pb2.ArtifactChunk]:
+        offsets = {file.path: file.size for file in request.files} if request.files else None
+        chunk_size = min(request.chunk_size or DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE)
+        try:
+            yield from self.artifacts.read(request.artifact, offsets, chunk_size, request.compression)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except FileNotFoundError as e:
+            context.abort(grpc.StatusCode.NOT_FOUND, str(e))
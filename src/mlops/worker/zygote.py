@@ -0,0 +1,232 @@
+"""
+Zygote launcher: a warm parent process forking ready-to-run workers
+
+Starting a worker from scratch spends most of its time importing grpc, the generated protobuf modules and the worker
+implementations. The zygote imports them once, then forks the workers, which start with everything loaded.
+Workers are launched by sending their command line arguments to the zygote socket, see launch_worker.
+"""
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from collections.abc import Callable, Iterable, Sequence
+
+__ALL__ = ['PRELOAD_MODULES', 'WorkerZygote', 'ZygoteServer', 'launch_worker']
+
+# Modules imported by the zygote before forking
+PRELOAD_MODULES = (
+    'grpc',
+    'mlops.protos.worker_cluster_pb2_grpc',
+    'mlops.common.grpc_tracing',
+    'mlops.worker.cluster_bridge',
+    'mlops.worker.testing_worker',
+    'mlops.worker.process_pool_worker',
+    'mlops.worker.worker_servicer',
+)
+
+
+class WorkerZygote:
+    """
+    Fork workers from a parent that already imported their modules
+
+    prefork children are forked ahead of time and wait for their arguments on a pipe, so launching a worker only
+    writes to a pipe, and replenish forks the replacements afterwards. A child runs the worker by calling run with
+    its arguments and exits when the non-daemon threads of the worker are done.
+    Forking is only safe from a single-threaded process: the zygote must not start threads or create gRPC channels.
+    """
+
+    _idle: list[tuple[int, int]]  # (pid, write end of the argument pipe) of the preforked children
+    _running: set[int]  # pids of the launched workers
+    _parent_fds: list[int]  # file descriptors of the parent closed by the children, e.g. a listening socket
+
+    def __init__(
+            self,
+            run: Callable[[list[str]], None],
+            prefork: int = 2,
+            preload: Iterable[str] = PRELOAD_MODULES
+    ):
+        """
+        :param run: runs a worker from its command line arguments, e.g. mlops.worker.__main__.main
+        :param prefork: number of children kept ready
+        :param preload: modules imported by start
+        """
+        self.run = run
+        self.prefork = prefork
+        self.preload = tuple(preload)
+        self._idle = []
+        self._running = set()
+        self._parent_fds = []
+
+    def add_parent_fd(self, fd: int) -> None:
+        """
+        Close a file descriptor of the parent in the children forked from now on
+        """
+        self._parent_fds.append(fd)
+
+    def start(self) -> None:
+        """
+        Import the preloaded modules and fork the first children
+        """
+        for module in self.preload:
+            importlib.import_module(module)
+        self.replenish()
+
+    def launch(self, argv: Sequence[str], close_fds: Sequence[int] = ()) -> int:
+        """
+        Launch a worker in a preforked child, or in a new one if none is ready
+
+        :param argv: command line arguments of the worker
+        :param close_fds: file descriptors of the parent a child forked now must close, e.g. a client connection
+        :return: the pid of the worker
+        """
+        pid, pipe_fd = self._idle.pop(0) if self._idle else self._fork(close_fds)
+        with os.fdopen(pipe_fd, 'wb') as pipe:
+            pipe.write(json.dumps(list(argv)).encode() + b'\n')
+        self._running.add(pid)
+        return pid
+
+    def replenish(self) -> None:
+        """
+        Fork children until prefork children are ready
+        """
+        while len(self._idle) < self.prefork:
+            self._idle.append(self._fork())
+
+    def reap(self) -> dict[int, int]:
+        """
+        Collect the exited children without blocking
+
+        :return: pid -> exit code of the exited workers, negative if killed by a signal
+        """
+        exited = {}
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:  # No child
+                break
+            if pid == 0:
+                break
+            self._idle = [(idle_pid, fd) for idle_pid, fd in self._idle if idle_pid != pid]
+            if pid in self._running:
+                self._running.discard(pid)
+                exited[pid] = os.waitstatus_to_exitcode(status)
+        return exited
+
+    def get_running(self) -> set[int]:
+        return set(self._running)
+
+    def close(self) -> None:
+        """
+        Stop the preforked children, the launched workers keep running
+        """
+        idle, self._idle = self._idle, []
+        for pid, pipe_fd in idle:
+            os.close(pipe_fd)  # The child reads the end of the pipe and exits
+        for pid, _ in idle:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+    def _fork(self, close_fds: Sequence[int] = ()) -> tuple[int, int]:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(write_fd)
+            for fd in (*(fd for _, fd in self._idle), *self._parent_fds, *close_fds):
+                os.close(fd)
+            self._run_child(read_fd)  # Never returns
+        os.close(read_fd)
+        return pid, write_fd
+
+    def _run_child(self, read_fd: int) -> None:
+        code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            with os.fdopen(read_fd, 'rb') as pipe:
+                line = pipe.readline()
+            if line:
+                self.run(json.loads(line))
+                _join_threads()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)  # Don't run the code of the parent after the fork
+
+
+def _join_threads() -> None:
+    # The worker runs in its threads, the child exits like an interpreter would when they are done
+    for thread in threading.enumerate():
+        if thread is not threading.current_thread() and not thread.daemon:
+            thread.join()
+
+
+class _LaunchHandler(socketserver.StreamRequestHandler):
+    """
+    Read the JSON list of arguments of a worker and reply with {"pid": ...} or {"error": ...}
+    """
+
+    server: 'ZygoteServer'
+
+    def handle(self) -> None:
+        try:
+            argv = json.loads(self.rfile.readline())
+            if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+                raise ValueError('expected a list of arguments')
+            reply = {'pid': self.server.zygote.launch(argv, close_fds=(self.connection.fileno(),))}
+        except ValueError as e:
+            reply = {'error': str(e)}
+        self.wfile.write(json.dumps(reply).encode() + b'\n')
+
+
+class ZygoteServer(socketserver.UnixStreamServer):
+    """
+    Serve the launches of a zygote on a Unix socket, one at a time from the main thread
+
+    Exited workers are reaped and the preforked children replenished between requests.
+    """
+
+    def __init__(self, socket_path: str, zygote: WorkerZygote):
+        self.zygote = zygote
+        super().__init__(socket_path, _LaunchHandler)
+        zygote.add_parent_fd(self.fileno())
+
+    def service_actions(self) -> None:
+        for pid, code in self.zygote.reap().items():
+            print(f'Worker {pid} exited with {code}')
+        self.zygote.replenish()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.zygote.close()
+
+
+def launch_worker(socket_path: str, argv: Sequence[str], timeout: float | None = 10.) -> int:
+    """
+    Launch a worker from the zygote listening on a socket
+
+    :param socket_path: the socket of the ZygoteServer
+    :param argv: command line arguments of the worker
+    :param timeout: seconds to wait for the zygote, wait forever if None
+    :return: the pid of the worker
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(list(argv)).encode() + b'\n')
+        with sock.makefile('rb') as reply_file:
+            reply = json.loads(reply_file.readline())
+    if 'error' in reply:
+        raise RuntimeError(f'zygote failed to launch the worker: {reply["error"]}')
+    return reply['pid']